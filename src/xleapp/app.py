@@ -1,33 +1,51 @@
 from __future__ import annotations
 
 import collections
+import dataclasses
 import datetime
 import functools
 import importlib
 import importlib.metadata
+import itertools
 import logging
 import pathlib
+import shutil
 import typing as t
 
-import jinja2
-import jinja2.ext
 import xleapp.artifact.service as artifact_service
 
 from xleapp import artifact, plugins, report, templating
 from xleapp._version import __project__, __version__
+from xleapp.artifact import metrics
+from xleapp.artifact.budget import BudgetOptions
+from xleapp.artifact.cache import ResultCache
+from xleapp.artifact.manifest import LazyArtifact
+from xleapp.artifact.profiling import ProfileOptions
+from xleapp.artifact.sink import SPILL_THRESHOLD
 from xleapp.helpers.descriptors import Validator
-from xleapp.helpers.search import FileSeekerBase, search_providers
+from xleapp.helpers.search import (
+    FileSeekerBase,
+    FileSeekerTar,
+    FileSeekerZip,
+    search_providers,
+)
 from xleapp.helpers.strings import split_camel_case
 from xleapp.helpers.utils import is_list
 from xleapp.report import db
-from xleapp.templating.ext import IncludeLogFileExtension
 
 
 __ARTIFACT_PLUGINS__ = artifact_service.Artifacts()
+KML_HEADERS = {"timestamp", "latitude", "longitude"}
+# Exports generated again from the case database when a run is resumed
+RESUMED_EXPORT_FOLDERS = ("_KML_Exports", "_TSV Exports", "_Timeline")
+REPORT_FORMATS = ("html", "tsv", "kml", "timeline")
+# Seekers extracting files to the temporary folder on every run
+ARCHIVE_SEEKERS = (FileSeekerTar, FileSeekerZip)
 
 logger_log = logging.getLogger("xleapp.logfile")
 
 if t.TYPE_CHECKING:
+    import jinja2
     import PySimpleGUI as PySG
 
     from xleapp.gui.utils import ProcessThread
@@ -75,6 +93,13 @@ def validator(self, value: t.Union[str, pathlib.Path]) -> None:
             raise FileNotFoundError(f"{repr(value)} must already exists!")
 
 
+@dataclasses.dataclass(frozen=True)
+class SavedFile:
+    """File found by an earlier run, restored without opening the extraction"""
+
+    path: pathlib.Path
+
+
 class Application:
     """Main application
 
@@ -89,30 +114,53 @@ class Application:
         report_folder (pathlib.Path): Location of the report.
         log_folder (pathlib.Path): Location of the log files. Resides in side the report folder.
         seeker (FileSeekerBase): Seeker to location find from the extraction.
-        jinja_environment (jinja2.Environment): Jinja2 environment for processing and outputting
-            HTML reports.
+        jinja_environment (jinja2.Environment): Jinja2 environment class for processing
+            and outputting HTML reports. Defaults to :obj:`jinja2.Environment`,
+            imported when the first report is rendered.
+        bytecode_cache (jinja2.BytecodeCache): cache of compiled templates shared by
+            applications, such as the jobs of a batch. Defaults to None.
         processing_type (float): Total about of time to run application after initial
             setup.
         input_path (pathlib.Path): File or Folder of the extraction.
         output_path (pathlib.Path): Parent folder of the report where the report folder is
             created.
+        tsv_compression (str): Compression used for TSV exports ("gzip" or "zstd").
+            Default is None for uncompressed exports.
+        spill_threshold (int): Number of rows an artifact holds in memory before the
+            rows are spilled to disk. 0 disables spilling.
+        profile_options (ProfileOptions): Artifacts to profile while processing.
+            Nothing is profiled by default.
+        budget_options (BudgetOptions): Time and RSS limits of each artifact.
+            Artifacts over budget are cancelled.
+        checkpointed (set[str]): Names of the artifacts whose rows were saved to the
+            case database as soon as they were processed, or restored from the
+            checkpoint of an earlier run.
+        result_cache (ResultCache): Cache artifacts load unchanged results from.
+            Default is None for no cache.
 
     Raises:
         ArtifactError: Error if an artifacts fails for some reason
     """
 
+    budget_options: BudgetOptions = BudgetOptions()
+    checkpointed: t.AbstractSet[str] = frozenset()
     debug: bool = False
     default_configs: dict[str, t.Any]
-    device: Device = Device()
+    device: Device
     extraction_type: str
     input_path: pathlib.Path
-    jinja_environment = jinja2.Environment
+    bytecode_cache: t.Optional[jinja2.BytecodeCache] = None
+    jinja_environment: t.Optional[type[jinja2.Environment]] = None
     log_folder: pathlib.Path
     output_path = OutputFolder()
     processing_time: float
+    profile_options: ProfileOptions = ProfileOptions()
     project: str
     report_folder: pathlib.Path
+    result_cache: t.Optional[ResultCache] = None
     seeker: FileSeekerBase
+    spill_threshold: int = SPILL_THRESHOLD
+    tsv_compression: t.Optional[str] = None
     version: str
     dbservice: db.DBService
 
@@ -124,6 +172,7 @@ def __init__(self) -> None:
         }
         self.project = __project__
         self.version = __version__
+        self.device = Device()
 
     def __repr__(self) -> str:
         return f"<Application (project={repr(self.project)}, version={repr(self.version)}, device_type={repr(self.device['Type'])}, default_configs={repr(self.default_configs)})>"
@@ -136,7 +185,16 @@ def __call__(
         output_folder: pathlib.Path,
         input_path: pathlib.Path,
     ) -> Application:
-        self.dbservice = db.DBService(self.report_folder)
+        self.dbservice = db.DBService(
+            self.report_folder,
+            tsv_compression=self.tsv_compression,
+        )
+        self.checkpointed = set()
+        self._checkpoints = self.dbservice.checkpoints()
+
+        if self.dbservice.load_value("input_path") is None:
+            self.dbservice.save_value("input_path", str(input_path))
+        self.device.update(self.dbservice.load_value("device", {}))
 
         sorted_plugins = sorted(
             search_providers.data.items(),
@@ -152,6 +210,14 @@ def __call__(
                 self.seeker = provider
                 self.extraction_type = extraction_type
                 break
+
+        # Saved so the reports can be generated again without the extraction
+        for key, value in (
+            ("device_type", self.artifacts.processing_device_type),
+            ("extraction_type", getattr(self, "extraction_type", None)),
+            ("tsv_compression", self.tsv_compression),
+        ):
+            self.dbservice.save_value(key, value)
         return self
 
     @staticmethod
@@ -191,16 +257,155 @@ def create_output_folder(self, output_path: pathlib.Path) -> None:
         now = datetime.datetime.now()
         current_time = now.strftime("%Y-%m-%d_%A_%H%M%S")
 
-        rf = self.report_folder = (
-            pathlib.Path(self.output_path) / f"xLEAPP_Reports_{current_time}"
-        )
+        rf = pathlib.Path(self.output_path) / f"xLEAPP_Reports_{current_time}"
+        # Jobs of a batch can start in the same second with the same output path
+        for number in itertools.count(2):
+            try:
+                rf.mkdir(parents=True)
+                break
+            except FileExistsError:
+                rf = rf.with_name(f"xLEAPP_Reports_{current_time}_{number}")
+        self.report_folder = rf
 
         tf = self.temp_folder = rf / "temp"
         lf = self.log_folder = rf / "Script Logs"
         lf.mkdir(parents=True, exist_ok=True)
         tf.mkdir(parents=True, exist_ok=True)
 
+    def use_result_cache(
+        self,
+        folder: t.Optional[pathlib.Path] = None,
+        fingerprint: str = "auto",
+    ) -> None:
+        """Loads unchanged artifact results from a cache
+
+        Call after the extraction type is known.
+
+        Args:
+            folder: folder of the cache. Defaults to the folder in the user's cache.
+            fingerprint: "stat", "hash" or "auto" to fingerprint files by size and
+                modification time for file system extractions and by content for
+                archives, whose files are extracted again on every run. Zip and tar
+                extractions always use "hash". Defaults to "auto".
+        """
+        archive = isinstance(getattr(self, "seeker", None), ARCHIVE_SEEKERS)
+        if fingerprint == "stat" and archive:
+            logger_log.warning(
+                "Stat fingerprints are unsafe for archive extractions! Using 'hash'.",
+            )
+            fingerprint = "hash"
+        elif fingerprint == "auto":
+            extraction_type = getattr(self, "extraction_type", "")
+            if archive or extraction_type.upper() != "FS":
+                fingerprint = "hash"
+            else:
+                fingerprint = "stat"
+        self.result_cache = ResultCache(
+            folder,
+            fingerprint=fingerprint,
+            roots=(self.input_path, self.temp_folder),
+        )
+        logger_log.info(f"Using result cache {str(self.result_cache.folder)!r}")
+
+    def resume(self, report_folder: pathlib.Path, input_path: pathlib.Path) -> None:
+        """Continues the run of an existing report folder
+
+        Artifacts saved in the checkpoint of the report are restored instead of
+        being processed again. Exports are removed because they are generated
+        again with the reports.
+
+        Args:
+            report_folder: report folder of the run to resume
+            input_path: file or folder of the extraction
+
+        Raises:
+            FileNotFoundError: If the report folder has no checkpoint
+            ValueError: If the report is of another extraction
+        """
+        report_folder = pathlib.Path(report_folder)
+        if not (report_folder / db.CASE_DB).exists():
+            raise FileNotFoundError(
+                f"{str(report_folder)!r} has no checkpoint to resume! "
+                f"{db.CASE_DB!r} is missing.",
+            )
+
+        checkpoint_input = db.CaseDBManager(report_folder).load_value("input_path")
+        if checkpoint_input not in (None, str(input_path)):
+            raise ValueError(
+                f"{str(report_folder)!r} is a report of {checkpoint_input!r} "
+                f"and cannot be resumed with {str(input_path)!r}!",
+            )
+
+        self.output_path = report_folder.parent
+        self.report_folder = report_folder
+        self.temp_folder = report_folder / "temp"
+        self.log_folder = report_folder / "Script Logs"
+        self.log_folder.mkdir(parents=True, exist_ok=True)
+        self.temp_folder.mkdir(parents=True, exist_ok=True)
+
+        for folder in RESUMED_EXPORT_FOLDERS:
+            shutil.rmtree(report_folder / folder, ignore_errors=True)
+
+    def open_report(self, report_folder: pathlib.Path) -> None:
+        """Restores the artifacts of an existing report folder to report them again
+
+        The rows, headers and state of every artifact are read from the case
+        database of the report. The extraction is never opened.
+
+        Args:
+            report_folder: report folder of an earlier run
+
+        Raises:
+            FileNotFoundError: If the report folder has no saved artifacts
+        """
+        report_folder = pathlib.Path(report_folder)
+        if not (report_folder / db.CASE_DB).exists():
+            raise FileNotFoundError(
+                f"{str(report_folder)!r} has no saved artifacts! "
+                f"{db.CASE_DB!r} is missing.",
+            )
+
+        self.output_path = report_folder.parent
+        self.report_folder = report_folder
+        self.temp_folder = report_folder / "temp"
+        self.log_folder = report_folder / "Script Logs"
+        self.log_folder.mkdir(parents=True, exist_ok=True)
+
+        case_db = db.CaseDBManager(report_folder)
+        if self.tsv_compression is None:
+            self.tsv_compression = case_db.load_value("tsv_compression")
+        self.dbservice = db.DBService(report_folder, tsv_compression=self.tsv_compression)
+        self.checkpointed = set()
+        self._checkpoints = self.dbservice.checkpoints()
+        if not self._checkpoints:
+            raise FileNotFoundError(f"{str(report_folder)!r} has no saved artifacts!")
+
+        self.input_path = pathlib.Path(self.dbservice.load_value("input_path", ""))
+        self.extraction_type = self.dbservice.load_value("extraction_type", "")
+        self.processing_time = self.dbservice.load_value("processing_time", 0.0)
+        self.device.update(self.dbservice.load_value("device", {}))
+
+        for selected_artifact in self.artifacts.selected():
+            selected_artifact.select = False
+        self.set_device_type(self.dbservice.load_value("device_type"))
+        for name in self._checkpoints:
+            try:
+                saved_artifact = self.artifacts[name]
+            except ValueError:
+                logger_log.warning(f"Artifact {name!r} of the report is not installed!")
+                continue
+            saved_artifact.select = True
+            if isinstance(saved_artifact, LazyArtifact):
+                saved_artifact = saved_artifact.load()
+            self.restore_artifact(saved_artifact)
+
     def create_jinja_environment(self) -> jinja2.Environment:
+        # jinja2 is only imported once a report is rendered to keep startup fast
+        import jinja2
+        import jinja2.ext
+
+        from xleapp.templating.ext import IncludeLogFileExtension
+
         template_loader = jinja2.PackageLoader("xleapp.templating", "templates")
         log_file_loader = jinja2.FileSystemLoader(self.log_folder)
 
@@ -211,7 +416,9 @@ def create_jinja_environment(self) -> jinja2.Environment:
             "trim_blocks": True,
             "lstrip_blocks": True,
         }
-        rv = self.jinja_environment(**options)
+        if self.bytecode_cache is not None:
+            options["bytecode_cache"] = self.bytecode_cache
+        rv = (self.jinja_environment or jinja2.Environment)(**options)
         rv.filters.update(
             {
                 "is_list": is_list,
@@ -230,8 +437,77 @@ def run(
         window: t.Optional[PySG.Window] = None,
         thread: t.Optional[ProcessThread] = None,
     ) -> None:
-        self.artifacts.create_queue()
-        self.artifacts.run_queue(window=window, thread=thread)
+        self.artifacts.create_queue(restore=self.restore_artifact)
+        self.artifacts.run_queue(
+            window=window,
+            thread=thread,
+            completed=self.checkpoint_artifact,
+        )
+
+    def checkpoint_artifact(self, processed_artifact: artifact.Artifact) -> None:
+        """Saves an artifact to the case database as soon as it is processed
+
+        The rows, processed flag and metrics are saved in one transaction so a
+        resumed run either restores the whole artifact or processes it again.
+
+        Args:
+            processed_artifact: artifact that finished processing
+        """
+        state = {
+            "cls_name": processed_artifact.cls_name,
+            "processed": processed_artifact.processed,
+            "process_time": processed_artifact.process_time,
+            "metrics": dataclasses.asdict(processed_artifact.metrics),
+            "report_title": processed_artifact.report_title,
+            "cancel_reason": processed_artifact.cancel_reason,
+            "found": sorted(
+                str(getattr(found_file, "path", found_file))
+                for found_file in processed_artifact.found
+            ),
+        }
+        self.dbservice.checkpoint(
+            name=processed_artifact.name,
+            data_list=processed_artifact.data if processed_artifact.processed else [],
+            data_headers=processed_artifact.report_headers,
+            state=state,
+        )
+        self.dbservice.save_value("device", dict(self.device))
+        self.checkpointed.add(processed_artifact.name)
+        if processed_artifact.processed:
+            self.save_case_data(processed_artifact)
+
+    def restore_artifact(self, selected_artifact: artifact.Artifact) -> bool:
+        """Restores an artifact from the checkpoint of the run being resumed
+
+        Args:
+            selected_artifact: artifact about to be queued
+
+        Returns:
+            True if the artifact was restored and does not need processing
+        """
+        state = self._checkpoints.get(selected_artifact.name)
+        if state is None or state["cls_name"] != selected_artifact.cls_name:
+            return False
+        # Cancelled artifacts are processed again, for example with a larger budget
+        if state.get("cancel_reason"):
+            return False
+
+        selected_artifact.processed = state["processed"]
+        selected_artifact.process_time = state["process_time"]
+        selected_artifact.metrics = metrics.ArtifactMetrics(**state["metrics"])
+        selected_artifact.report_title = state.get("report_title", "")
+        selected_artifact.found = {
+            SavedFile(pathlib.Path(path)) for path in state.get("found", ())
+        }
+        self.checkpointed.add(selected_artifact.name)
+        if selected_artifact.processed:
+            self.save_case_data(selected_artifact)
+
+        logger_log.info(
+            f"{selected_artifact.category} [{selected_artifact.cls_name}] "
+            "artifact restored from checkpoint",
+        )
+        return True
 
     def generate_artifact_table(self) -> None:
         artifact.generate_artifact_table(self.artifacts)
@@ -239,7 +515,20 @@ def generate_artifact_table(self) -> None:
     def generate_artifact_path_list(self) -> None:
         artifact.generate_artifact_path_list(self.artifacts)
 
-    def generate_reports(self) -> None:
+    def generate_reports(
+        self,
+        formats: t.Collection[str] = REPORT_FORMATS,
+        names: t.Optional[t.Collection[str]] = None,
+    ) -> None:
+        """Writes the report files of the selected artifacts
+
+        Args:
+            formats: report files to write, any of :const:`REPORT_FORMATS`.
+                Defaults to all of them.
+            names: artifacts to write report files for. The navigation and the
+                timeline still include every selected artifact. Defaults to every
+                selected artifact.
+        """
         logger_log.info("\nGenerating artifact report files...")
         report.copy_static_files(self.report_folder)
         nav = templating.generate_nav(
@@ -248,57 +537,130 @@ def generate_reports(self) -> None:
         )
 
         for selected_artifact in self.artifacts.selected():
-            msg_artifact = (
-                f"-> {selected_artifact.category} [{selected_artifact.cls_name}]"
+            if names is None or selected_artifact.name in names:
+                with selected_artifact.metrics.timer("report"):
+                    self.generate_report(selected_artifact, formats)
+
+        if "timeline" in formats:
+            if names is not None:
+                self.dbservice.load_timeline(exclude=names)
+            num_of_events, events = self.dbservice.merge_timeline()
+            timeline_nav = templating.generate_timeline(
+                report_folder=self.report_folder,
+                log_folder=self.log_folder,
+                events=events,
+                num_of_events=num_of_events,
             )
+            if timeline_nav:
+                logger_log.info(f"-> Timeline [{num_of_events} events]")
+        else:
+            timeline_nav = templating.timeline_navigation(self.report_folder)
+        if timeline_nav:
+            nav["Timeline"].add(timeline_nav)
+
+        templating.generate_nav_script(
+            report_folder=self.report_folder,
+            log_folder=self.log_folder,
+            navigation=nav,
+        )
+        metrics.save_metrics(self.artifacts.selected(), self.log_folder)
+        if getattr(self, "processing_time", None) is not None:
+            self.dbservice.save_value("processing_time", self.processing_time)
+        logger_log.info("Report files generated!")
+        logger_log.info(f"Report location: {self.output_path}")
 
-            if selected_artifact.report and selected_artifact.select:
-                html_report = templating.ArtifactHtmlReport(
-                    report_folder=self.report_folder,
-                    log_folder=self.log_folder,
-                    extraction_type=self.extraction_type,
-                    navigation=nav,
-                )
+    def generate_report(
+        self,
+        selected_artifact: artifact.Artifact,
+        formats: t.Collection[str] = REPORT_FORMATS,
+    ) -> None:
+        """Saves the rows of an artifact and writes its report files
 
-                if html_report(selected_artifact).report:
-                    logger_log.info(f"{msg_artifact}")
-            else:
-                logger_log.warning(
-                    f"{msg_artifact}: "
-                    "Report not generated! Artifact "
-                    "marked for no report generation. Check "
-                    "artifact's 'report' attribute.",
-                )
+        Args:
+            selected_artifact: artifact to report
+            formats: report files to write, any of :const:`REPORT_FORMATS`.
+                Defaults to all of them.
+        """
+        msg_artifact = f"-> {selected_artifact.category} [{selected_artifact.cls_name}]"
+        has_data = selected_artifact.processed and hasattr(selected_artifact, "data")
 
-            if selected_artifact.processed and hasattr(selected_artifact, "data"):
-                artifact_name = selected_artifact.name
-                data_list = selected_artifact.data
-                data_headers = selected_artifact.report_headers
+        if has_data:
+            self.save_case_data(selected_artifact)
 
-                self.dbservice.save(
-                    db_type="tsv",
-                    name=artifact_name,
-                    data_list=data_list,
-                    data_headers=data_headers,
-                )
+        if "html" in formats and selected_artifact.report and selected_artifact.select:
+            html_report = templating.ArtifactHtmlReport(
+                report_folder=self.report_folder,
+                log_folder=self.log_folder,
+                extraction_type=self.extraction_type,
+            )
+
+            if html_report(selected_artifact).report:
+                logger_log.info(f"{msg_artifact}")
+        elif "html" in formats:
+            logger_log.warning(
+                f"{msg_artifact}: "
+                "Report not generated! Artifact "
+                "marked for no report generation. Check "
+                "artifact's 'report' attribute.",
+            )
+
+        if has_data:
+            artifact_name = selected_artifact.name
+
+            for table in self.dbservice.tables(artifact_name):
+                if "tsv" in formats:
+                    self.dbservice.save(
+                        db_type="tsv",
+                        name=artifact_name,
+                        data_list=table,
+                        data_headers=table.headers,
+                    )
 
-                if selected_artifact.kml:
+                headers = {header.lower() for header in table.headers}
+                if "kml" in formats and selected_artifact.kml and KML_HEADERS <= headers:
                     self.dbservice.save(
                         db_type="kml",
                         name=artifact_name,
-                        data_list=data_list,
-                        data_headers=data_headers,
+                        data_list=table,
+                        data_headers=table.headers,
                     )
 
-                if selected_artifact.timeline:
+                if "timeline" in formats and selected_artifact.timeline:
                     self.dbservice.save(
                         db_type="timeline",
                         name=artifact_name,
-                        data_list=data_list,
-                        data_headers=data_headers,
+                        data_list=table,
+                        data_headers=table.headers,
                     )
-        logger_log.info("Report files generated!")
-        logger_log.info(f"Report location: {self.output_path}")
+
+    def save_case_data(self, selected_artifact: artifact.Artifact) -> None:
+        """Saves the rows of an artifact to the case database
+
+        Rows are written once and every report format is generated from the case
+        database. The artifact's `data` is replaced by a view of the saved rows so
+        the rows are no longer held in memory. Rows of checkpointed artifacts are
+        already saved.
+
+        Args:
+            selected_artifact: processed artifact to save
+        """
+        if selected_artifact.name not in self.checkpointed:
+            self.dbservice.save(
+                db_type="case",
+                name=selected_artifact.name,
+                data_list=selected_artifact.data,
+                data_headers=selected_artifact.report_headers,
+            )
+
+        if isinstance(selected_artifact.data, artifact.RowSink):
+            selected_artifact.data.close()
+
+        tables = self.dbservice.tables(selected_artifact.name)
+        selected_artifact.metrics.rows = sum(len(table) for table in tables)
+        if isinstance(selected_artifact.report_headers, list):
+            selected_artifact.data = tables
+        else:
+            selected_artifact.data = tables[0]
 
     @property
     def num_to_process(self) -> int:
@@ -306,9 +668,7 @@ def num_to_process(self) -> int:
 
     @property
     def num_of_categories(self) -> int:
-        return len(
-            {artifact.category for artifact in self.artifacts if artifact.select},
-        )
+        return len(self.artifacts.selected_categories())
 
     def set_device_type(self, device_type: str):
         self.artifacts.processing_device_type = device_type
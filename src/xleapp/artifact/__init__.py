@@ -12,14 +12,13 @@
 from xleapp.helpers import utils
 
 from .abstract import AbstractBase as AbstractBase
+from .abstract import Artifact as Artifact
+from .columns import ColumnStore as ColumnStore
 from .decorators import Search as Search
 from .decorators import core_artifact as core_artifact
 from .decorators import long_running_process as long_running_process
 from .service import Artifacts as Artifacts
-from typing import TYPE_CHECKING
-
-if TYPE_CHECKING:
-    from .abstract import Artifact as Artifact
+from .sink import RowSink as RowSink
 
 
 logger_log = logging.getLogger("xleapp.logfile")
@@ -39,10 +38,10 @@ def generate_artifact_path_list(artifacts) -> None:
 
     with open("path_list.txt", "w") as paths:
         regex_list: set[str] = set()
-        for artifact in artifacts.data:
-            regex_list = regex_list | artifact.regex
+        for artifact in artifacts:
+            regex_list = regex_list | {str(regex) for regex in artifact.regex}
         # Create a single list removing duplications
-        ordered_regex_list = "\n".join(regex_list)
+        ordered_regex_list = "\n".join(sorted(regex_list))
         logger_log.info(ordered_regex_list)
         paths.write(ordered_regex_list)
 
@@ -52,6 +51,9 @@ def generate_artifact_path_list(artifacts) -> None:
 def generate_artifact_table(artifacts) -> None:
     """Generates artifact list table.
 
+    Search regexes are read from the artifact's metadata. Artifacts are not
+    processed or imported.
+
     Args:
         artifacts: List of artifacts to get regex from.
     """
@@ -66,7 +68,6 @@ def generate_artifact_table(artifacts) -> None:
     with open(output_file, "w") as paths:
         artifact: Artifact
         for artifact in artifacts:
-            artifact.process()
             device = artifact.device_type
             category = artifact.category
             short_name: str = artifact.cls_name
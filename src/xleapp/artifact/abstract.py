@@ -24,6 +24,7 @@
 import inspect
 import logging
 import pathlib
+import threading
 import typing as t
 
 from dataclasses import dataclass, field
@@ -32,7 +33,10 @@
 
 from xleapp import app, artifact
 
-from .descriptors import FoundFiles, Icon, ReportHeaders, SearchRegex
+from .budget import ArtifactCancelled
+from .descriptors import FoundFiles, Icon, ReportHeaders, SearchRegex, Selected
+from .metrics import ArtifactMetrics
+from .sink import RowSink
 
 
 if t.TYPE_CHECKING:
@@ -52,7 +56,6 @@ class AbstractBase:
         default=SearchRegex(),
     )
     device_type: str = field(init=False)
-    device: app.Device = field(init=False)
     _log: logging.Logger = field(init=False, repr=False, compare=False)
 
 
@@ -64,25 +67,54 @@ class AbstractArtifactDefaults:
 
     Attributes core, long_running_process, and selected are used
     to track artifacts internally for certain actions.
+
+    Attribute data is a :obj:`RowSink` that spills rows to disk once the
+    application's `spill_threshold` is reached.
+
+    Attribute metrics records where the time of the artifact is spent.
+
+    Attributes version and cacheable control the result cache. Change version when
+    the output of an artifact changes without its module changing.
+
+    Attributes time_limit and rss_limit override the application's budget of the
+    artifact. Attribute cancelled is set once the artifact goes over budget and
+    cancel_reason tells why.
     """
 
+    cacheable: bool = field(init=False, default=True, compare=False)
+    cancel_reason: t.Optional[str] = field(init=False, default=None, compare=False)
+    cancelled: threading.Event = field(
+        init=False,
+        repr=False,
+        compare=False,
+        default_factory=threading.Event,
+    )
     category: str = field(init=False, default="Unknown")
     core: bool = field(init=False, default=False)
-    data: list[t.Any] = field(
+    data: RowSink | list[t.Any] = field(
         init=False,
         repr=False,
         compare=False,
-        default_factory=list,
+        default_factory=RowSink,
     )
     found: FoundFiles = field(init=False, default=FoundFiles(), compare=False)
     long_running_process: bool = field(init=False, default=False, compare=False)
+    metrics: ArtifactMetrics = field(
+        init=False,
+        repr=False,
+        compare=False,
+        default_factory=ArtifactMetrics,
+    )
     processed: bool = field(init=False, default=False, compare=False)
     process_time: float = field(init=False, default=float(), compare=False)
     report: bool = field(init=False, default=True, compare=False)
     report_title: str = field(init=False, default="")
     report_headers: ReportHeaders = field(init=False, default=ReportHeaders())
-    select: bool = field(init=False, default=False, compare=False)
+    rss_limit: t.Optional[int] = field(init=False, default=None, compare=False)
+    select: bool = field(init=False, default=Selected(), compare=False)
+    time_limit: t.Optional[float] = field(init=False, default=None, compare=False)
     timeline: bool = field(init=False, default=False, compare=False)
+    version: str = field(init=False, default="1", compare=False)
     web_icon: Icon = field(init=False, default=Icon(), compare=False)
 
 
@@ -100,13 +132,9 @@ def process(self) -> None:
     def __init_subclass__(cls, *, category, label):
         super().__init_subclass__()
         if not inspect.isabstract(cls):
-            if label in app.__ARTIFACT_PLUGINS__:
-                raise ValueError(f"Name {repr(label)} already registered!")
-
             cls.device_type = cls.__module__.split(".")[1]
             cls.name = label
             cls.category = category
-            cls.device = g.app.device
 
             artifact = dataclass(cls, eq=False)()
             app.__ARTIFACT_PLUGINS__[label] = artifact
@@ -161,15 +189,21 @@ def context(self) -> t.Iterator[Artifact]:
                     handles = files[regex]
                 else:
                     try:
-                        if artifact_regex.return_on_first_hit:
-                            results = {next(seeker.search(regex))}
-                        else:
-                            results = set(seeker.search(regex))
+                        with self.metrics.timer("search"):
+                            if artifact_regex.return_on_first_hit:
+                                results = {next(seeker.search(regex))}
+                            else:
+                                results = set(seeker.search(regex))
                     except StopIteration:
                         results = None
 
                     if results:
-                        files.add(artifact_regex, results, artifact_regex.file_names_only)
+                        with self.metrics.timer("open"):
+                            files.add(
+                                artifact_regex,
+                                results,
+                                artifact_regex.file_names_only,
+                            )
 
                     artifact_regex.processed = True
 
@@ -179,6 +213,8 @@ def context(self) -> t.Iterator[Artifact]:
                     else:
                         self.found = self.found | files[artifact_regex]
 
+            self.metrics.count_files(self.found)
+
         yield self
 
     @property
@@ -190,6 +226,15 @@ def cls_name(self) -> str:
         """
         return type(self).__name__
 
+    @property
+    def device(self) -> app.Device:
+        """Information about the device of the running application
+
+        Returns:
+            Device of :data:`xleapp.globals.app`
+        """
+        return g.app.device
+
     @property
     def data_save_folder(self) -> pathlib.Path:
         """Locate to save files from this artifact
@@ -216,6 +261,17 @@ def kml(self) -> bool:
                     return True
         return False
 
+    def check_cancelled(self) -> None:
+        """Stops the artifact if it was cancelled
+
+        Call it in long loops of :meth:`process` so an artifact over budget stops.
+
+        Raises:
+            ArtifactCancelled: the artifact was cancelled
+        """
+        if self.cancelled.is_set():
+            raise ArtifactCancelled(self.cls_name)
+
     def copyfile(
         self, input_file: pathlib.Path | bytes, output_file: str
     ) -> pathlib.Path:
@@ -0,0 +1,235 @@
+"""Wall time and memory budgets of artifacts
+
+A corrupted database or a gigantic cache can keep one artifact running long
+enough to stall the whole run. While an artifact is processed a watchdog thread
+checks how long it has run and how much the resident memory (RSS) of the process
+grew since it started. When the artifact goes over budget, or the GUI stops
+processing, it is cancelled:
+
+* the `cancelled` event of the artifact is set
+* running SQLite queries on the files found for the artifact are interrupted
+
+Cancelling is cooperative. Artifacts run in the process of the application, so
+they cannot be killed. Long loops should call
+:meth:`~xleapp.artifact.abstract.Artifact.check_cancelled`, which raises
+:exc:`ArtifactCancelled` once the artifact is cancelled. An interrupted query
+raises :exc:`sqlite3.OperationalError`. Either error ends the artifact, which is
+marked unprocessed with the reason in `cancel_reason`, and the run continues
+with the next artifact.
+
+Limits come from the application's :class:`BudgetOptions`. No limit is set by
+default. Artifacts marked `long_running_process` have their own limits, and
+artifacts can set `time_limit` and `rss_limit` to override both. A limit of 0 or
+None disables it.
+"""
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+import typing as t
+
+from dataclasses import dataclass
+
+import xleapp.globals as g
+
+from .metrics import current_rss
+
+
+if t.TYPE_CHECKING:
+    from .abstract import Artifact
+
+
+logger_log = logging.getLogger("xleapp.logfile")
+
+# Seconds between checks of the watchdog
+WATCH_INTERVAL = 0.5
+
+
+class ArtifactCancelled(BaseException):
+    """Raised by an artifact that was cancelled
+
+    Like :exc:`KeyboardInterrupt` it is not an :exc:`Exception`, so artifacts
+    catching every error do not swallow it.
+    """
+
+
+@dataclass(frozen=True)
+class BudgetOptions:
+    """Limits of the artifacts of a run
+
+    Attributes:
+        time_limit (float): seconds an artifact runs before it is cancelled.
+            Default is None for no limit.
+        rss_limit (int): bytes the RSS can grow while an artifact runs. Default is
+            None for no limit.
+        long_running_time_limit (float): `time_limit` of artifacts marked
+            `long_running_process`. Default is None for no limit.
+        long_running_rss_limit (int): `rss_limit` of artifacts marked
+            `long_running_process`. Default is None for no limit.
+        interval (float): seconds between checks. Defaults to
+            :const:`WATCH_INTERVAL`.
+    """
+
+    time_limit: t.Optional[float] = None
+    rss_limit: t.Optional[int] = None
+    long_running_time_limit: t.Optional[float] = None
+    long_running_rss_limit: t.Optional[int] = None
+    interval: float = WATCH_INTERVAL
+
+    def limits(self, artifact: Artifact) -> tuple[t.Optional[float], t.Optional[int]]:
+        """Returns the time and RSS limits of an artifact
+
+        Args:
+            artifact: artifact about to be processed
+
+        Returns:
+            Seconds and bytes. None for no limit.
+        """
+        if artifact.long_running_process:
+            time_limit = self.long_running_time_limit
+            rss_limit = self.long_running_rss_limit
+        else:
+            time_limit, rss_limit = self.time_limit, self.rss_limit
+
+        if artifact.time_limit is not None:
+            time_limit = artifact.time_limit
+        if artifact.rss_limit is not None:
+            rss_limit = artifact.rss_limit
+        return time_limit or None, rss_limit or None
+
+
+class Watchdog:
+    """Cancels an artifact that goes over budget while the `with` block runs
+
+    The block must run in the thread processing the artifact. If that thread has
+    a `stopped` property, like the GUI's processing thread, the artifact is also
+    cancelled once it is stopped. The errors of a cancelled artifact,
+    :exc:`ArtifactCancelled` and interrupted queries, end the block.
+
+    Args:
+        artifact: artifact being processed
+        time_limit: seconds before the artifact is cancelled. Defaults to None.
+        rss_limit: bytes the RSS can grow before the artifact is cancelled.
+            Defaults to None.
+        interval: seconds between checks. Defaults to :const:`WATCH_INTERVAL`.
+
+    Attributes:
+        reason (str): why the artifact was cancelled. None if it was not.
+        elapsed (float): seconds the block ran
+    """
+
+    def __init__(
+        self,
+        artifact: Artifact,
+        time_limit: t.Optional[float] = None,
+        rss_limit: t.Optional[int] = None,
+        interval: float = WATCH_INTERVAL,
+    ) -> None:
+        self.artifact = artifact
+        self.time_limit = time_limit
+        self.rss_limit = rss_limit
+        self.interval = interval
+        self.reason: t.Optional[str] = None
+        self.elapsed = 0.0
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._watcher: t.Optional[threading.Thread] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<Watchdog artifact={self.artifact.cls_name!r}, "
+            f"time_limit={self.time_limit!r}, rss_limit={self.rss_limit!r}>"
+        )
+
+    def __enter__(self) -> Watchdog:
+        self.artifact.cancelled.clear()
+        self._thread = threading.current_thread()
+        self._start_time = time.perf_counter()
+        self._start_rss = current_rss() if self.rss_limit else None
+        if self.rss_limit and self._start_rss is None:
+            logger_log.warning("-> RSS limit ignored! RSS cannot be measured.")
+
+        if self.time_limit or self._start_rss is not None or self._stoppable:
+            self._watcher = threading.Thread(
+                target=self._watch,
+                name=f"Watchdog-{self.artifact.cls_name}",
+                daemon=True,
+            )
+            self._watcher.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        with self._lock:
+            self._done.set()
+        self.elapsed = time.perf_counter() - self._start_time
+        if self._watcher is not None:
+            self._watcher.join()
+
+        return (
+            self.reason is not None
+            and exc_type is not None
+            and issubclass(exc_type, (ArtifactCancelled, sqlite3.OperationalError))
+        )
+
+    @property
+    def _stoppable(self) -> bool:
+        return hasattr(self._thread, "stopped")
+
+    def over_budget(self) -> t.Optional[str]:
+        """Checks the artifact against its budget
+
+        Returns:
+            Why the artifact should be cancelled or None if it is within budget
+        """
+        if self._stoppable and self._thread.stopped:
+            return "processing was stopped"
+
+        elapsed = time.perf_counter() - self._start_time
+        if self.time_limit and elapsed > self.time_limit:
+            return f"ran longer than {self.time_limit:g}s"
+
+        if self._start_rss is not None:
+            rss = current_rss()
+            if rss is not None and rss - self._start_rss > self.rss_limit:
+                return f"RSS grew more than {self.rss_limit / 1024**2:.0f} MiB"
+        return None
+
+    def cancel(self, reason: str) -> None:
+        """Cancels the artifact unless it already finished
+
+        Args:
+            reason: why the artifact is cancelled
+        """
+        with self._lock:
+            if self._done.is_set() or self.reason is not None:
+                return
+            self.reason = reason
+            self.artifact.cancelled.set()
+
+            for found_file in self.artifact.found:
+                connection = getattr(found_file, "file_handle", None)
+                if isinstance(connection, sqlite3.Connection):
+                    connection.interrupt()
+
+    def _watch(self) -> None:
+        while not self._done.wait(self.interval):
+            reason = self.over_budget()
+            if reason:
+                self.cancel(reason)
+                return
+
+
+def watchdog(artifact: Artifact) -> Watchdog:
+    """Creates a watchdog with the limits the application sets for an artifact
+
+    Args:
+        artifact: artifact about to be processed
+
+    Returns:
+        Watchdog: watchdog to process the artifact in
+    """
+    options: BudgetOptions = getattr(g.app, "budget_options", None) or BudgetOptions()
+    time_limit, rss_limit = options.limits(artifact)
+    return Watchdog(artifact, time_limit, rss_limit, options.interval)
@@ -0,0 +1,319 @@
+"""Content addressed cache of artifact results
+
+The rows of an artifact only depend on its code and the files it found. Results
+are saved under a key built from:
+
+* the version of xleapp and a digest of the source of :mod:`xleapp.helpers`
+* the module, class name and `version` of the artifact
+* a digest of the source of the artifact's module
+* a fingerprint of every file in :attr:`Artifact.found`
+
+When the same version of an artifact finds the same files again, its rows are
+loaded from the cache instead of being parsed. Anything else runs as before and
+its results are saved for the next run.
+
+Files are fingerprinted by size and modification time ("stat") or by a digest
+of their contents ("hash"). Stat fingerprints are unsafe for archive extractions:
+files extracted from a zip or tar file get a new modification time on every run,
+and a file changed without changing its size or time would load stale results.
+:meth:`xleapp.app.Application.use_result_cache` always uses hash fingerprints
+for archives.
+
+Artifacts that export files to the report folder are not cached because the
+files would be missing from the next report. Set `cacheable` to False to never
+cache an artifact.
+"""
+from __future__ import annotations
+
+import contextlib
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import pathlib
+import pickle
+import tempfile
+import typing as t
+
+from xleapp._version import __version__
+
+from .manifest import default_manifest_folder
+from .sink import RowSink
+
+
+if t.TYPE_CHECKING:
+    from .abstract import Artifact
+
+
+logger_log = logging.getLogger("xleapp.logfile")
+
+CACHE_VERSION = 1
+FINGERPRINTS = ("stat", "hash")
+# Rows pickled together in a cache file
+CHUNK_SIZE = 10_000
+HASH_BUFFER_SIZE = 1024 * 1024
+
+
+def default_cache_folder() -> pathlib.Path:
+    """Returns the folder results are cached in by default
+
+    Returns:
+        Path: `results` in the folder manifests are cached in
+    """
+    return default_manifest_folder() / "results"
+
+
+@functools.cache
+def source_digest(cls: type) -> t.Optional[str]:
+    """Digests the source of the module defining an artifact class
+
+    Args:
+        cls: artifact class
+
+    Returns:
+        Hex digest of the module or None if its source cannot be read
+    """
+    try:
+        source = pathlib.Path(inspect.getsourcefile(cls)).read_bytes()
+    except (OSError, TypeError):
+        return None
+    return hashlib.sha1(source).hexdigest()
+
+
+@functools.cache
+def helpers_digest() -> str:
+    """Digests the source of :mod:`xleapp.helpers` used by every artifact
+
+    Returns:
+        Hex digest of the modules of the package
+    """
+    import xleapp.helpers
+
+    digest = hashlib.sha1()
+    for module in sorted(pathlib.Path(xleapp.helpers.__file__).parent.glob("*.py")):
+        digest.update(module.name.encode())
+        digest.update(module.read_bytes())
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: pathlib.Path, fingerprint: str = "stat") -> str:
+    """Fingerprints a file
+
+    Args:
+        path: file to fingerprint
+        fingerprint: "stat" for size and modification time or "hash" for a digest
+            of the contents. Defaults to "stat".
+
+    Returns:
+        str: fingerprint that changes whenever the file changes
+    """
+    if path.is_dir():
+        return "dir"
+
+    if fingerprint == "stat":
+        stat = path.stat()
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as file:
+        while chunk := file.read(HASH_BUFFER_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _chunks(rows: t.Iterable[t.Any]) -> t.Iterator[list[t.Any]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ResultCache:
+    """Saves and loads artifact results keyed by artifact version and input files
+
+    Args:
+        folder: folder of the cache. Defaults to :func:`default_cache_folder`.
+        fingerprint: how found files are fingerprinted, one of
+            :const:`FINGERPRINTS`. Defaults to "stat".
+        roots: folders found files are made relative to, such as the input path
+            and the temporary folder, so keys do not depend on where they are.
+            Defaults to no folders.
+
+    Raises:
+        ValueError: If the fingerprint is not supported
+    """
+
+    def __init__(
+        self,
+        folder: t.Optional[pathlib.Path] = None,
+        fingerprint: str = "stat",
+        roots: t.Iterable[pathlib.Path] = (),
+    ) -> None:
+        if fingerprint not in FINGERPRINTS:
+            raise ValueError(
+                f"Fingerprint {repr(fingerprint)} is not one of: "
+                f"{', '.join(FINGERPRINTS)}!",
+            )
+        self.folder = pathlib.Path(folder or default_cache_folder())
+        self.fingerprint = fingerprint
+        self.roots = [pathlib.Path(root).resolve() for root in roots]
+
+    def __repr__(self) -> str:
+        return (
+            f"<ResultCache folder={repr(self.folder)}, "
+            f"fingerprint={repr(self.fingerprint)}>"
+        )
+
+    def _relative(self, path: pathlib.Path) -> str:
+        path = path.resolve()
+        for root in self.roots:
+            with contextlib.suppress(ValueError):
+                return path.relative_to(root).as_posix()
+        return path.as_posix()
+
+    def key(self, artifact: Artifact) -> t.Optional[str]:
+        """Builds the cache key of an artifact from the files it found
+
+        Args:
+            artifact: artifact after its files were found
+
+        Returns:
+            Hex digest or None if the artifact cannot be cached
+        """
+        cls = type(artifact)
+        module_digest = source_digest(cls)
+        if module_digest is None or not artifact.cacheable:
+            return None
+
+        digest = hashlib.sha1(
+            f"{CACHE_VERSION}:{__version__}:{helpers_digest()}:"
+            f"{cls.__module__}.{cls.__qualname__}:"
+            f"{artifact.version}:{module_digest};".encode(),
+        )
+        files = []
+        for found_file in artifact.found:
+            path = getattr(found_file, "path", found_file)
+            try:
+                path = pathlib.Path(path)
+                files.append(
+                    f"{self._relative(path)}:{file_fingerprint(path, self.fingerprint)}",
+                )
+            except (OSError, TypeError):
+                return None
+
+        for entry in sorted(files):
+            digest.update(f"{entry};".encode())
+        return digest.hexdigest()
+
+    def _file(self, key: str) -> pathlib.Path:
+        return self.folder / key[:2] / f"{key}.pickle"
+
+    def load(self, artifact: Artifact, key: str) -> bool:
+        """Loads the results of an artifact
+
+        Args:
+            artifact: artifact to load `data`, `report_headers` and device
+                information into
+            key: key from :meth:`key`
+
+        Returns:
+            True if the results were in the cache
+        """
+        cache_file = self._file(key)
+        try:
+            with open(cache_file, "rb") as file:
+                state = pickle.load(file)
+                tables = []
+                for _ in range(state["num_of_tables"]):
+                    table = RowSink()
+                    while (chunk := pickle.load(file)) is not None:
+                        table.extend(chunk)
+                    tables.append(table)
+        except FileNotFoundError:
+            return False
+        except (OSError, EOFError, pickle.UnpicklingError, KeyError) as err:
+            logger_log.warning(f"-> Cached results {str(cache_file)!r} unreadable: {err}")
+            return False
+
+        artifact.report_headers = state["report_headers"]
+        artifact.report_title = state["report_title"]
+        artifact.device.update(state["device"])
+        if isinstance(artifact.report_headers, list):
+            artifact.data = tables
+        else:
+            artifact.data = tables[0]
+        return True
+
+    def save(
+        self,
+        artifact: Artifact,
+        key: str,
+        device: t.Mapping[str, t.Any],
+    ) -> None:
+        """Saves the results of an artifact
+
+        Args:
+            artifact: processed artifact
+            key: key from :meth:`key`
+            device: device information before the artifact was processed. Only
+                what the artifact added or changed is saved.
+        """
+        if artifact.data_save_folder.exists():
+            logger_log.debug(f"-> {artifact.cls_name} exported files and is not cached")
+            return
+
+        if isinstance(artifact.report_headers, list):
+            tables = list(artifact.data)
+        else:
+            tables = [artifact.data]
+        state = {
+            "report_headers": artifact.report_headers,
+            "report_title": artifact.report_title,
+            "device": {
+                name: value
+                for name, value in artifact.device.items()
+                if name not in device or device[name] != value
+            },
+            "num_of_tables": len(tables),
+        }
+
+        cache_file = self._file(key)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Written to a temporary file first so readers never see a partial result
+        fd, temp_name = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+                for table in tables:
+                    for chunk in _chunks(table):
+                        pickle.dump(chunk, file, protocol=pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(None, file)
+            os.replace(temp_name, cache_file)
+        except Exception as err:
+            pathlib.Path(temp_name).unlink(missing_ok=True)
+            logger_log.warning(f"-> Results of {artifact.cls_name} not cached: {err}")
+
+    def process(self, artifact: Artifact, func: t.Callable[[Artifact], t.Any]) -> None:
+        """Loads the results of an artifact or runs it and caches its results
+
+        Args:
+            artifact: artifact after its files were found
+            func: parses the files of the artifact
+        """
+        key = self.key(artifact)
+        if key is None:
+            func(artifact)
+            return
+
+        if self.load(artifact, key):
+            logger_log.info("-> Results loaded from cache")
+            return
+
+        device = dict(artifact.device)
+        func(artifact)
+        self.save(artifact, key, device)
@@ -0,0 +1,276 @@
+"""Compact column storage for artifact rows
+
+:class:`ColumnStore` keeps the rows of an artifact as one column per report header
+instead of a list of tuples. Integer and float columns are stored in
+:mod:`array` buffers and every other column is dictionary encoded while it has
+few distinct values, such as bundle IDs or categories. Rows are rebuilt as tuples
+when the store is iterated or indexed so report writers can use it like a list.
+
+Example:
+    Opt in by replacing `data` while setting up the artifact::
+
+    >>> def __post_init__(self):
+            self.report_headers = ("Timestamp", "Bundle ID", "Duration")
+            self.data = ColumnStore(self.report_headers)
+"""
+from __future__ import annotations
+
+import array
+import sys
+import typing as t
+
+
+DICTIONARY_MIN_VALUES = 1_000
+DICTIONARY_MAX_RATIO = 0.5
+
+_INT_MIN = -(2**63)
+_INT_MAX = 2**63 - 1
+
+
+class Column:
+    """Single column of a :class:`ColumnStore`
+
+    A column starts out typed by its first value and is widened as needed:
+
+    * `int` and `float` values are held in an :class:`array.array`. Missing values
+      are tracked in a separate mask.
+    * Any other value switches the column to a dictionary of distinct values plus
+      an :class:`array.array` of codes.
+    * Once the dictionary holds more than :const:`DICTIONARY_MIN_VALUES` values and
+      more than :const:`DICTIONARY_MAX_RATIO` of the rows, the column becomes a
+      plain list with interned strings.
+    """
+
+    __slots__ = ["kind", "_codes", "_index", "_nulls", "_values"]
+
+    def __init__(self) -> None:
+        self.kind: t.Optional[str] = None
+        self._values: t.Any = None
+        self._codes: t.Optional[array.array] = None
+        self._index: dict[t.Any, int] = {}
+        self._nulls: t.Optional[bytearray] = None
+
+    def __len__(self) -> int:
+        if self.kind == "dictionary":
+            return len(self._codes)
+        return len(self._values) if self._values is not None else 0
+
+    def __getitem__(self, idx: int) -> t.Any:
+        if self.kind == "dictionary":
+            return self._values[self._codes[idx]]
+        if self._nulls is not None and self._nulls[idx]:
+            return None
+        return self._values[idx]
+
+    def __iter__(self) -> t.Iterator[t.Any]:
+        if self.kind == "dictionary":
+            values = self._values
+            return (values[code] for code in self._codes)
+        if self._nulls is not None:
+            return (
+                None if null else value for value, null in zip(self._values, self._nulls)
+            )
+        return iter(self._values or ())
+
+    def __repr__(self) -> str:
+        return f"<Column kind={repr(self.kind)}, rows={len(self)}>"
+
+    @staticmethod
+    def _kind_of(value: t.Any) -> str:
+        if type(value) is int and _INT_MIN <= value <= _INT_MAX:
+            return "int"
+        if type(value) is float:
+            return "float"
+        return "dictionary"
+
+    def append(self, value: t.Any) -> None:
+        if self.kind is None:
+            self._start(value)
+        elif self._only_nulls and self._kind_of(value) in ("int", "float"):
+            num_of_nulls = len(self._codes)
+            self._start(value)
+            self._values.extend([0] * num_of_nulls)
+            self._nulls = bytearray(b"\x01" * num_of_nulls)
+
+        if self.kind in ("int", "float"):
+            if value is None:
+                if self._nulls is None:
+                    self._nulls = bytearray(len(self._values))
+                self._values.append(0)
+                self._nulls.append(1)
+                return
+
+            kind = self._kind_of(value)
+            if kind == self.kind:
+                self._values.append(value)
+                if self._nulls is not None:
+                    self._nulls.append(0)
+                return
+
+            self._to_dictionary()
+
+        if self.kind == "dictionary":
+            # Keyed by type too so 1, 1.0 and True keep their own entries
+            try:
+                code = self._index.setdefault((type(value), value), len(self._values))
+            except TypeError:
+                self._to_list()
+                self._values.append(value)
+                return
+
+            if code == len(self._values):
+                self._values.append(_intern(value))
+                if (
+                    len(self._values) > DICTIONARY_MIN_VALUES
+                    and len(self._values) > len(self._codes) * DICTIONARY_MAX_RATIO
+                ):
+                    self._codes.append(code)
+                    self._to_list()
+                    return
+            self._codes.append(code)
+            return
+
+        self._values.append(_intern(value))
+
+    @property
+    def _only_nulls(self) -> bool:
+        return self.kind == "dictionary" and self._values == [None]
+
+    def _start(self, value: t.Any) -> None:
+        kind = "dictionary" if value is None else self._kind_of(value)
+        if kind == "int":
+            self._values = array.array("q")
+        elif kind == "float":
+            self._values = array.array("d")
+        else:
+            self._values = []
+            self._codes = array.array("I")
+            self._index = {}
+        self._nulls = None
+        self.kind = kind
+
+    def _to_dictionary(self) -> None:
+        values = list(self)
+        self.kind = "dictionary"
+        self._values = []
+        self._codes = array.array("I")
+        self._index = {}
+        self._nulls = None
+        # Encoded here as append would turn a column of only nulls back into numbers
+        for value in values:
+            code = self._index.setdefault((type(value), value), len(self._values))
+            if code == len(self._values):
+                self._values.append(value)
+            self._codes.append(code)
+
+    def _to_list(self) -> None:
+        self._values = list(self)
+        self.kind = "list"
+        self._codes = None
+        self._index = {}
+
+
+class ColumnStore:
+    """List compatible container holding artifact rows as typed columns
+
+    Args:
+        headers: report headers of the artifact. One column is created per header.
+            Rows wider than the headers get extra columns.
+    """
+
+    __slots__ = ["headers", "_columns", "_num_of_rows", "_widths"]
+
+    def __init__(self, headers: t.Sequence[str]) -> None:
+        self.headers = tuple(headers)
+        self._columns: list[Column] = [Column() for _ in self.headers]
+        self._num_of_rows = 0
+        self._widths: t.Optional[array.array] = None
+
+    def __len__(self) -> int:
+        return self._num_of_rows
+
+    def __getitem__(self, idx: int | slice) -> tuple[t.Any, ...] | list[tuple]:
+        if isinstance(idx, slice):
+            return [self[row] for row in range(*idx.indices(self._num_of_rows))]
+
+        if idx < 0:
+            idx += self._num_of_rows
+        if not 0 <= idx < self._num_of_rows:
+            raise IndexError(f"{repr(self)} index out of range")
+
+        return tuple(column[idx] for column in self._columns[: self._width(idx)])
+
+    def __iter__(self) -> t.Iterator[tuple[t.Any, ...]]:
+        if self._columns:
+            rows = zip(*self._columns)
+        else:
+            rows = (() for _ in range(self._num_of_rows))
+        if self._widths is None:
+            return rows
+        return (row[:width] for row, width in zip(rows, self._widths))
+
+    def __eq__(self, __o: object) -> bool:
+        if isinstance(__o, (list, ColumnStore)):
+            return len(self) == len(__o) and all(
+                row == tuple(other) for row, other in zip(self, __o)
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"<ColumnStore headers={repr(self.headers)}, rows={len(self)}>"
+
+    @property
+    def columns(self) -> dict[str, Column]:
+        """Columns keyed by report header"""
+        return dict(zip(self.headers, self._columns))
+
+    def append(self, row: t.Sequence[t.Any]) -> None:
+        """Adds a row to the end of the store
+
+        Args:
+            row: row to add
+        """
+        row = tuple(row)
+        width = len(row)
+        num_of_columns = len(self._columns)
+
+        if width > num_of_columns:
+            for _ in range(width - num_of_columns):
+                column = Column()
+                for _ in range(self._num_of_rows):
+                    column.append(None)
+                self._columns.append(column)
+            if self._widths is None:
+                self._widths = array.array("I", [num_of_columns] * self._num_of_rows)
+            num_of_columns = width
+        elif width < num_of_columns:
+            row = row + (None,) * (num_of_columns - width)
+
+        if self._widths is None and width != num_of_columns:
+            self._widths = array.array("I", [num_of_columns] * self._num_of_rows)
+        if self._widths is not None:
+            self._widths.append(width)
+
+        for column, value in zip(self._columns, row):
+            column.append(value)
+        self._num_of_rows += 1
+
+    def extend(self, rows: t.Iterable[t.Sequence[t.Any]]) -> None:
+        """Adds rows to the end of the store
+
+        Args:
+            rows: rows to add
+        """
+        for row in rows:
+            self.append(row)
+
+    def _width(self, idx: int) -> int:
+        if self._widths is None:
+            return len(self._columns)
+        return self._widths[idx]
+
+
+def _intern(value: t.Any) -> t.Any:
+    if type(value) is str:
+        return sys.intern(value)
+    return value
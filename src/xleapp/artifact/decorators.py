@@ -5,6 +5,8 @@
 import sqlite3
 import typing as t
 
+import xleapp.globals as g
+
 from xleapp.helpers.types import DecoratedFunc
 
 from .abstract import Artifact
@@ -81,10 +83,16 @@ def process_wrapper(cls) -> None:
 class Search:
     """Decorator for searching files for an artifact.
 
+    The search is recorded on the decorated function as `searches` when the class
+    is defined so :attr:`Artifact.regex` can be read without running `process`.
+
     Args:
        file_names_only: Returns only file names (:obj:`Path` objects).
            Defaults to False.
        return_on_first_hit: Returns only the first found file. Defaults to True.
+
+    When the application has a `result_cache`, the innermost search loads the
+    results of the artifact from it or saves them to it once every file is found.
     """
 
     def __init__(
@@ -97,18 +105,25 @@ def __init__(
         self.search = (search, file_names_only, return_on_first_hit)
 
     def __call__(self, func):
+        innermost = not hasattr(func, "searches")
+
         def search_wrapper(cls: Artifact) -> bool:
             try:
                 cls.regex = self.search
                 with cls.context() as artifact:
                     if artifact.found:
-                        func(artifact)
+                        cache = getattr(g.app, "result_cache", None)
+                        if innermost and cache is not None:
+                            cache.process(artifact, func)
+                        else:
+                            func(artifact)
                     cls.processed = True
             except sqlite3.OperationalError as ex:
                 logger_log.error(f"-> Error {ex}")
             return cls.processed
 
         functools.update_wrapper(search_wrapper, func)
+        search_wrapper.searches = getattr(func, "searches", ()) + (self.search,)
         return search_wrapper
 
     def __get__(self, obj, objtype):
@@ -87,11 +87,46 @@ def _check_list_of_tuples(values: list, *, bool_list: list[bool] = None) -> bool
             return ReportHeaders._check_list_of_tuples(values, bool_list=bool_list)
 
 
+class Selected(descriptors.Validator):
+    """Descriptor for 'select' that keeps the artifact service up to date"""
+
+    default_value: bool = False
+
+    def validator(self, value) -> None:
+        pass
+
+    def __set__(self, obj, value) -> None:
+        setattr(obj, self.private_name, bool(value))
+
+        service = getattr(obj, "_service", None)
+        if service is not None:
+            service.update_selection(obj)
+
+
 class SearchRegex(descriptors.Validator):
-    """Descriptor ensuring 'regex' type"""
+    """Descriptor ensuring 'regex' type
+
+    The searches declared with :class:`~xleapp.artifact.decorators.Search` on the
+    artifact's `process` are added the first time the regex is read so they are
+    known without running `process`.
+    """
 
     default_value: set = set()
 
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self.default_value
+
+        try:
+            return getattr(obj, self.private_name)
+        except AttributeError:
+            process = getattr(type(obj), "process", None)
+            searches = {
+                regex.Regex(*search) for search in getattr(process, "searches", ())
+            }
+            setattr(obj, self.private_name, searches)
+            return searches
+
     def validator(self, value) -> None:
         if not (
             isinstance(value, str)
@@ -107,14 +142,8 @@ def validator(self, value) -> None:
     def __set__(self, obj, value) -> None:
         # Some validators may return a value
         self.validator(value)
-        try:
-            searches = getattr(obj, self.private_name)
-        except AttributeError:
-            searches = set()
-        finally:
-            if isinstance(value, str):
-                searches.add(regex.Regex(value))
-            else:
-                searches.add(regex.Regex(*value))
-
-        setattr(obj, self.private_name, searches)
+        searches = self.__get__(obj)
+        if isinstance(value, str):
+            searches.add(regex.Regex(value))
+        else:
+            searches.add(regex.Regex(*value))
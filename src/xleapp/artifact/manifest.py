@@ -0,0 +1,319 @@
+"""Cached manifest of the artifacts installed by a plugin
+
+Importing every artifact module of every plugin just to list the artifacts is
+slow. The first time a plugin is loaded its modules are imported and the
+metadata of each artifact is saved to a JSON manifest. Later runs read the
+manifest instead and register a :class:`LazyArtifact` for each entry. The
+artifact's module is only imported when something other than its metadata is
+needed, for example when it is selected to run.
+
+The manifest is rebuilt whenever a module of the plugin changes.
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import importlib
+import json
+import logging
+import os
+import pathlib
+import typing as t
+
+from dataclasses import dataclass
+
+from xleapp._version import __version__
+
+from .regex import Regex
+
+
+if t.TYPE_CHECKING:
+    from .abstract import Artifact
+
+
+MANIFEST_VERSION = 2
+
+logger_log = logging.getLogger("xleapp.logfile")
+
+
+def default_manifest_folder() -> pathlib.Path:
+    """Returns the folder manifests are cached in
+
+    Uses `XLEAPP_CACHE_DIR` if set, otherwise `$XDG_CACHE_HOME/xleapp` or
+    `~/.cache/xleapp`.
+
+    Returns:
+        Path: folder for the manifests
+    """
+    if os.environ.get("XLEAPP_CACHE_DIR"):
+        return pathlib.Path(os.environ["XLEAPP_CACHE_DIR"])
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(cache_home) / "xleapp"
+
+
+def fingerprint(modules: t.Iterable[pathlib.Path]) -> str:
+    """Fingerprints artifact modules by name, size and modification time
+
+    Args:
+        modules: module files of a plugin
+
+    Returns:
+        str: hex digest that changes whenever a module changes
+    """
+    digest = hashlib.sha1(__version__.encode())
+    for module in sorted(modules):
+        stat = module.stat()
+        digest.update(f"{module.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """Metadata of an artifact that can be read without importing it"""
+
+    name: str
+    cls_name: str
+    category: str
+    device_type: str
+    module: str
+    regex: tuple[tuple[str, bool, bool], ...] = ()
+    core: bool = False
+    long_running_process: bool = False
+
+    @classmethod
+    def from_artifact(cls, artifact: Artifact) -> ManifestEntry:
+        return cls(
+            name=artifact.name,
+            cls_name=artifact.cls_name,
+            category=artifact.category,
+            device_type=artifact.device_type,
+            module=type(artifact).__module__,
+            regex=tuple(
+                sorted(
+                    (str(regex), regex.file_names_only, regex.return_on_first_hit)
+                    for regex in artifact.regex
+                ),
+            ),
+            core=artifact.core,
+            long_running_process=artifact.long_running_process,
+        )
+
+    @classmethod
+    def from_dict(cls, entry: dict[str, t.Any]) -> ManifestEntry:
+        entry["regex"] = tuple(tuple(regex) for regex in entry.get("regex", ()))
+        return cls(**entry)
+
+
+class Manifest:
+    """Manifest of the artifacts of a single plugin
+
+    Args:
+        manifest_file: location of the cached manifest
+        fingerprint: fingerprint of the plugin's modules
+        entries: artifacts of the plugin
+    """
+
+    def __init__(
+        self,
+        manifest_file: pathlib.Path,
+        fingerprint: str,
+        entries: t.Iterable[ManifestEntry] = (),
+    ) -> None:
+        self.manifest_file = manifest_file
+        self.fingerprint = fingerprint
+        self.entries = list(entries)
+
+    def __iter__(self) -> t.Iterator[ManifestEntry]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"<Manifest manifest_file={repr(self.manifest_file)}, "
+            f"entries={len(self)}>"
+        )
+
+    @classmethod
+    def load(cls, manifest_file: pathlib.Path, fingerprint: str) -> Manifest | None:
+        """Loads a cached manifest
+
+        Args:
+            manifest_file: location of the cached manifest
+            fingerprint: current fingerprint of the plugin's modules
+
+        Returns:
+            The manifest or None if it is missing, unreadable or out of date.
+        """
+        try:
+            manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+            if (
+                manifest["version"] != MANIFEST_VERSION
+                or manifest["fingerprint"] != fingerprint
+            ):
+                return None
+            entries = [ManifestEntry.from_dict(entry) for entry in manifest["artifacts"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        return cls(manifest_file, fingerprint, entries)
+
+    def save(self) -> None:
+        """Saves the manifest. Failures are logged and ignored."""
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "fingerprint": self.fingerprint,
+            "artifacts": [dataclasses.asdict(entry) for entry in self.entries],
+        }
+        try:
+            self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.manifest_file.with_suffix(".tmp")
+            temp_file.write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+            temp_file.replace(self.manifest_file)
+        except OSError as err:
+            logger_log.debug(f"Could not save manifest {self.manifest_file}: {err}")
+
+
+class LazyArtifact:
+    """Stand-in for an artifact that has not been imported yet
+
+    Metadata from the manifest and the `select` flag are available without
+    importing anything. Accessing any other attribute imports the artifact's
+    module, which registers the real artifact in place of this one, and
+    forwards to it.
+
+    Args:
+        entry: manifest entry of the artifact
+    """
+
+    __slots__ = ["entry", "_artifact", "_select", "_service", "_service_key"]
+
+    def __init__(self, entry: ManifestEntry) -> None:
+        self.entry = entry
+        self._artifact: t.Optional[Artifact] = None
+        self._select = False
+        self._service = None
+        self._service_key = None
+
+    def __getattr__(self, name: str) -> t.Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __setattr__(self, name: str, value: t.Any) -> None:
+        if name in LazyArtifact.__slots__ or name == "select":
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.load(), name, value)
+
+    def __eq__(self, __o: object) -> bool:
+        if isinstance(__o, str):
+            return self.name == __o
+        if hasattr(__o, "category") and hasattr(__o, "device_type"):
+            return (self.category, self.name, self.device_type) == (
+                __o.category,
+                __o.name,
+                __o.device_type,
+            )
+        return False
+
+    def __hash__(self) -> int:
+        return hash((self.category, self.name, self.device_type))
+
+    def __lt__(self, __o: t.Any) -> bool:
+        return (self.device_type, self.category, self.name) < (
+            __o.device_type,
+            __o.category,
+            __o.name,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"<LazyArtifact name={repr(self.name)}, cls_name={repr(self.cls_name)}, "
+            f"loaded={self.loaded}>"
+        )
+
+    @property
+    def name(self) -> str:
+        return self.entry.name
+
+    @property
+    def cls_name(self) -> str:
+        return self.entry.cls_name
+
+    @property
+    def category(self) -> str:
+        return self.entry.category
+
+    @property
+    def device_type(self) -> str:
+        return self.entry.device_type
+
+    @property
+    def core(self) -> bool:
+        return self.entry.core
+
+    @property
+    def long_running_process(self) -> bool:
+        return self.entry.long_running_process
+
+    @property
+    def regex(self) -> set[Regex]:
+        return {Regex(*regex) for regex in self.entry.regex}
+
+    @property
+    def loaded(self) -> bool:
+        return self._artifact is not None
+
+    @property
+    def processed(self) -> bool:
+        return self._artifact.processed if self._artifact else False
+
+    @property
+    def select(self) -> bool:
+        return self._artifact.select if self._artifact else self._select
+
+    @select.setter
+    def select(self, value: bool) -> None:
+        if self._artifact:
+            self._artifact.select = value
+        self._select = bool(value)
+
+        if self._service is not None:
+            self._service.update_selection(self)
+
+    def load(self) -> Artifact:
+        """Imports the artifact's module
+
+        Returns:
+            Artifact: the registered artifact
+
+        Raises:
+            ImportError: If the module does not define the artifact anymore
+        """
+        if self._artifact is None:
+            from xleapp import app
+
+            logger_log.debug(f"Importing {self.entry.module} for {self.cls_name}")
+            importlib.import_module(self.entry.module)
+
+            artifact = app.__ARTIFACT_PLUGINS__[self.cls_name]
+            if isinstance(artifact, LazyArtifact):
+                raise ImportError(
+                    f"Module {repr(self.entry.module)} did not register "
+                    f"{repr(self.cls_name)}! Delete {repr(default_manifest_folder())} "
+                    "to rebuild the artifact manifests.",
+                )
+            self._artifact = artifact
+        return self._artifact
+
+    def resolve(self, artifact: Artifact) -> None:
+        """Points this stand-in at the real artifact once it is registered
+
+        Args:
+            artifact: artifact imported for this entry
+        """
+        artifact.select = self._select
+        self._artifact = artifact
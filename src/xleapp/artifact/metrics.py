@@ -0,0 +1,258 @@
+"""Performance metrics recorded for each artifact
+
+While an artifact runs the time spent in each phase is recorded:
+
+* `search_time`: searching the extraction for the artifact's files
+* `open_time`: opening the files that were found
+* `parse_time`: the rest of `process`
+* `report_time`: saving the rows and writing the report files
+
+along with the rows produced, the number and size of the files matched and how
+far the resident memory (RSS) of the process peaked above its size when the
+artifact started. Once the reports are
+generated the metrics are saved to `Script Logs` as `run_metrics.json` and
+`run_metrics.csv` so runs can be compared across releases.
+"""
+from __future__ import annotations
+
+import contextlib
+import csv
+import dataclasses
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+import typing as t
+
+from dataclasses import dataclass
+
+from xleapp._version import __version__
+
+
+if t.TYPE_CHECKING:
+    from .abstract import Artifact
+
+
+METRICS_FILE = "run_metrics"
+PHASES = ("search", "open", "parse", "report")
+# Seconds between samples of the RSS while an artifact runs
+RSS_SAMPLE_INTERVAL = 0.05
+
+
+@dataclass
+class ArtifactMetrics:
+    """Performance metrics of a single artifact
+
+    Attributes:
+        search_time (float): seconds spent searching for files
+        open_time (float): seconds spent opening the files found
+        parse_time (float): seconds spent in `process` after the files were opened
+        report_time (float): seconds spent saving rows and writing reports
+        rows (int): number of rows produced
+        files_matched (int): number of files found for the artifact
+        bytes_read (int): total size of the files found for the artifact
+        peak_rss_delta (int): bytes the RSS peaked above its size when processing
+            started. None if it cannot be measured on this platform.
+    """
+
+    search_time: float = 0.0
+    open_time: float = 0.0
+    parse_time: float = 0.0
+    report_time: float = 0.0
+    rows: int = 0
+    files_matched: int = 0
+    bytes_read: int = 0
+    peak_rss_delta: t.Optional[int] = None
+
+    @property
+    def total_time(self) -> float:
+        return self.search_time + self.open_time + self.parse_time + self.report_time
+
+    @contextlib.contextmanager
+    def timer(self, phase: str) -> t.Iterator[None]:
+        """Adds the time spent in the `with` block to a phase
+
+        Args:
+            phase: one of :const:`PHASES`
+        """
+        if phase not in PHASES:
+            raise ValueError(f"Unknown phase {repr(phase)}! Choose from {PHASES}.")
+
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            attr = f"{phase}_time"
+            setattr(self, attr, getattr(self, attr) + time.perf_counter() - start_time)
+
+    @contextlib.contextmanager
+    def track_peak_rss(self) -> t.Iterator[None]:
+        """Records how far the RSS peaks above its size at the start of the block
+
+        The RSS is sampled every :const:`RSS_SAMPLE_INTERVAL` seconds, so memory
+        freed by earlier artifacts does not hide the peak of this one. Without
+        `/proc` the growth of the peak RSS of the process is recorded instead.
+        """
+        before = current_rss()
+        if before is None:
+            with self._track_process_peak_rss():
+                yield
+            return
+
+        peak = before
+        done = threading.Event()
+
+        def sample() -> None:
+            nonlocal peak
+            while not done.wait(RSS_SAMPLE_INTERVAL):
+                peak = max(peak, current_rss() or 0)
+
+        sampler = threading.Thread(target=sample, name="RSS-sampler", daemon=True)
+        sampler.start()
+        try:
+            yield
+        finally:
+            done.set()
+            sampler.join()
+            peak = max(peak, current_rss() or 0)
+            self.peak_rss_delta = max(self.peak_rss_delta or 0, peak - before)
+
+    @contextlib.contextmanager
+    def _track_process_peak_rss(self) -> t.Iterator[None]:
+        before = peak_rss()
+        try:
+            yield
+        finally:
+            after = peak_rss()
+            if before is not None and after is not None:
+                self.peak_rss_delta = (self.peak_rss_delta or 0) + after - before
+
+    def count_files(self, found: t.Iterable[t.Any]) -> None:
+        """Counts the files found for the artifact and their size
+
+        Args:
+            found: handles or paths of the files found
+        """
+        self.files_matched = 0
+        self.bytes_read = 0
+        for found_file in found:
+            self.files_matched += 1
+            path = getattr(found_file, "path", found_file)
+            with contextlib.suppress(OSError, TypeError):
+                path = pathlib.Path(path)
+                if path.is_file():
+                    self.bytes_read += path.stat().st_size
+
+
+def peak_rss() -> t.Optional[int]:
+    """Returns the peak resident memory of the process in bytes
+
+    Returns:
+        Peak RSS or None on platforms without :mod:`resource`
+    """
+    try:
+        import resource
+    except ImportError:  # pragma: no cover
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes and macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_rss() -> t.Optional[int]:
+    """Returns the resident memory of the process in bytes
+
+    Returns:
+        RSS or None on platforms without `/proc`
+    """
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def metrics_table(artifacts: t.Iterable[Artifact]) -> list[dict[str, t.Any]]:
+    """Returns one row of metrics per artifact
+
+    Args:
+        artifacts: artifacts that were run
+
+    Returns:
+        Rows keyed by metric, slowest artifact first
+    """
+    rows = []
+    for artifact in artifacts:
+        metrics: ArtifactMetrics = artifact.metrics
+        row = {
+            "category": artifact.category,
+            "name": artifact.name,
+            "cls_name": artifact.cls_name,
+            "processed": artifact.processed,
+            "total_time": round(metrics.total_time, 6),
+        }
+        for key, value in dataclasses.asdict(metrics).items():
+            row[key] = round(value, 6) if isinstance(value, float) else value
+        rows.append(row)
+    return sorted(rows, key=lambda row: row["total_time"], reverse=True)
+
+
+def save_metrics(
+    artifacts: t.Iterable[Artifact],
+    log_folder: pathlib.Path,
+) -> list[dict[str, t.Any]]:
+    """Saves the metrics of each artifact as JSON and CSV
+
+    Args:
+        artifacts: artifacts that were run
+        log_folder: folder to save `run_metrics.json` and `run_metrics.csv` to
+
+    Returns:
+        The saved rows
+    """
+    rows = metrics_table(artifacts)
+    write_metrics(rows, log_folder)
+    return rows
+
+
+def write_metrics(rows: list[dict[str, t.Any]], log_folder: pathlib.Path) -> None:
+    """Writes rows from :func:`metrics_table` as JSON and CSV
+
+    Args:
+        rows: metrics of each artifact
+        log_folder: folder to save `run_metrics.json` and `run_metrics.csv` to
+    """
+    log_folder = pathlib.Path(log_folder)
+
+    (log_folder / f"{METRICS_FILE}.json").write_text(
+        json.dumps({"version": __version__, "artifacts": rows}, indent=1),
+        encoding="utf-8",
+    )
+
+    fieldnames = ["category", "name", "cls_name", "processed", "total_time"] + [
+        metric.name for metric in dataclasses.fields(ArtifactMetrics)
+    ]
+    metrics_file = log_folder / f"{METRICS_FILE}.csv"
+    with metrics_file.open("w", newline="", encoding="utf-8") as fp:
+        writer = csv.DictWriter(fp, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def load_metrics(metrics_file: pathlib.Path) -> list[dict[str, t.Any]]:
+    """Loads the rows saved by :func:`save_metrics`
+
+    Args:
+        metrics_file: `run_metrics.json` of a run, or the folder holding it
+
+    Returns:
+        The metrics of each artifact
+    """
+    metrics_file = pathlib.Path(metrics_file)
+    if metrics_file.is_dir():
+        metrics_file = metrics_file / f"{METRICS_FILE}.json"
+    return json.loads(metrics_file.read_text(encoding="utf-8"))["artifacts"]
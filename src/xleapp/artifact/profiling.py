@@ -0,0 +1,156 @@
+"""Opt-in profiling of single artifacts during a run
+
+Artifacts chosen with `--profile-artifact` are always profiled. With
+`--profile-all-over` every artifact is profiled and the results are kept for the
+ones that ran longer than the given number of seconds. The :mod:`cProfile`
+results are saved to `Script Logs/profiles/<cls_name>.prof` and can be opened
+with :mod:`pstats` or tools like snakeviz. With `--profile-memory` allocations are
+traced with :mod:`tracemalloc` too and the largest are saved to
+`<cls_name>_allocations.txt`.
+"""
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import logging
+import pathlib
+import time
+import tracemalloc
+import typing as t
+
+from dataclasses import dataclass
+
+import xleapp.globals as g
+
+
+if t.TYPE_CHECKING:
+    from .abstract import Artifact
+
+
+PROFILES_FOLDER = "profiles"
+TOP_ALLOCATIONS = 25
+TRACEMALLOC_FRAMES = 10
+
+logger_log = logging.getLogger("xleapp.logfile")
+
+
+@dataclass(frozen=True)
+class ProfileOptions:
+    """Artifacts to profile
+
+    Attributes:
+        artifacts (frozenset[str]): names or class names of the artifacts to
+            always profile
+        over (float): profile every artifact and keep the results of the ones that
+            ran at least this many seconds. Default is None to only profile
+            `artifacts`.
+        memory (bool): trace allocations with :mod:`tracemalloc`. Default is False.
+    """
+
+    artifacts: frozenset[str] = frozenset()
+    over: t.Optional[float] = None
+    memory: bool = False
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "artifacts",
+            frozenset(name.lower() for name in self.artifacts),
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.artifacts) or self.over is not None
+
+    def selected(self, artifact: Artifact) -> bool:
+        """Checks if an artifact was chosen by name
+
+        Args:
+            artifact: artifact to check
+
+        Returns:
+            True if the name or class name of the artifact was given
+        """
+        return bool(
+            {artifact.name.lower(), artifact.cls_name.lower()} & self.artifacts,
+        )
+
+
+@contextlib.contextmanager
+def profile(artifact: Artifact) -> t.Iterator[None]:
+    """Profiles the `with` block if the application's profile options ask for it
+
+    Args:
+        artifact: artifact being processed
+    """
+    options: ProfileOptions = getattr(g.app, "profile_options", None) or ProfileOptions()
+    selected = options.selected(artifact)
+    if not (selected or options.over is not None):
+        yield
+        return
+
+    trace_memory = options.memory and not tracemalloc.is_tracing()
+    if trace_memory:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+
+    profiler = cProfile.Profile()
+    start_time = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        run_time = time.perf_counter() - start_time
+
+        snapshot = None
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+        if selected or run_time >= options.over:
+            save_profile(artifact, profiler, snapshot)
+
+
+def save_profile(
+    artifact: Artifact,
+    profiler: cProfile.Profile,
+    snapshot: t.Optional[tracemalloc.Snapshot] = None,
+) -> pathlib.Path:
+    """Saves the profile of an artifact to `Script Logs/profiles`
+
+    Args:
+        artifact: profiled artifact
+        profiler: profiler that ran while the artifact was processed
+        snapshot: allocations traced while the artifact was processed. Defaults
+            to None.
+
+    Returns:
+        Path: location of the `.prof` file
+    """
+    profiles_folder = pathlib.Path(g.app.log_folder) / PROFILES_FOLDER
+    profiles_folder.mkdir(parents=True, exist_ok=True)
+
+    profile_file = profiles_folder / f"{artifact.cls_name}.prof"
+    profiler.dump_stats(profile_file)
+    logger_log.info(f"-> Profile saved to {profile_file}")
+
+    if snapshot:
+        snapshot = snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ),
+        )
+        statistics = snapshot.statistics("lineno")
+        lines = [
+            f"Top {TOP_ALLOCATIONS} allocations of {artifact.category} "
+            f"[{artifact.cls_name}]",
+            f"Total: {sum(stat.size for stat in statistics) / 1024:.1f} KiB",
+            "",
+        ]
+        lines.extend(str(stat) for stat in statistics[:TOP_ALLOCATIONS])
+
+        allocations_file = profiles_folder / f"{artifact.cls_name}_allocations.txt"
+        allocations_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        logger_log.info(f"-> Allocations saved to {allocations_file}")
+
+    return profile_file
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import collections
+import contextlib
 import functools
+import itertools
 import logging
 import queue
+import time
 import typing as t
 
 from plistlib import InvalidFileException
@@ -10,6 +14,10 @@
 from xleapp.helpers.decorators import timed
 from xleapp.helpers.types import DecoratedFunc
 
+from . import budget, profiling
+from .manifest import LazyArtifact
+from .sink import RowSink
+
 
 if t.TYPE_CHECKING:
     import PySimpleGUI as PySG
@@ -20,18 +28,40 @@
 
 logger_log = logging.getLogger("xleapp.logfile")
 
+# Least seconds between progress updates sent to the GUI
+PROGRESS_INTERVAL = 0.1
+
 
 def artifact_process(cls: DecoratedFunc) -> DecoratedFunc:
     @functools.wraps(cls)
     def process_wrapper() -> None:
         msg_artifact = f"{cls.category} [{cls.cls_name}] artifact"
         logger_log.info(f"\n{msg_artifact} processing...")
+        metrics = cls.metrics
+        watchdog = budget.watchdog(cls)
+        cls.cancel_reason = None
         try:
-            cls.process_time, _ = process_wrapper.orig_func()
+            with watchdog, metrics.track_peak_rss(), profiling.profile(cls):
+                cls.process_time, _ = process_wrapper.orig_func()
         except InvalidFileException as err:
             logger_log.warning(f"-> {err}")
             cls.processed = False
 
+        if watchdog.reason is not None:
+            logger_log.warning(f"-> Cancelled: {watchdog.reason}")
+            cls.processed = False
+            cls.cancel_reason = watchdog.reason
+            cls.process_time = watchdog.elapsed
+            if isinstance(cls.data, RowSink):
+                cls.data.clear()
+
+        metrics.parse_time = max(
+            cls.process_time - metrics.search_time - metrics.open_time,
+            0.0,
+        )
+        with contextlib.suppress(TypeError):
+            metrics.rows = len(cls.data)
+
         if not cls.processed:
             logger_log.warning("-> Failed to processed!")
         logger_log.info(f"{msg_artifact} finished in {cls.process_time:.2f}s")
@@ -45,46 +75,119 @@ class ArtifactError(Exception):
 
 
 class Artifacts:
-    __slots__ = ("_store", "process_queue", "_processing_device_type")
+    """Registry of every installed artifact
+
+    Artifacts are indexed by name, class name, category and device type. The
+    selected artifacts are tracked as their `select` flag changes so listing
+    them does not scan every installed artifact.
+    """
+
+    __slots__ = (
+        "_by_category",
+        "_by_cls_name",
+        "_by_device_type",
+        "_counter",
+        "_indexed",
+        "_processing_device_type",
+        "_selected",
+        "_selected_cache",
+        "_store",
+        "process_queue",
+    )
 
     def __init__(self) -> None:
-        self._store: list = []
+        self._store: dict[str, Artifact] = {}
+        self._by_cls_name: dict[str, list[str]] = collections.defaultdict(list)
+        self._by_category: dict[str, dict[str, None]] = collections.defaultdict(dict)
+        self._by_device_type: dict[str, dict[str, None]] = collections.defaultdict(dict)
+        self._indexed: dict[str, tuple[int, str, str, str]] = {}
+        self._counter = itertools.count()
+        self._selected: set[str] = set()
+        self._selected_cache: t.Optional[list[Artifact]] = None
         self.process_queue: queue.PriorityQueue = queue.PriorityQueue()
         self._processing_device_type = None
 
     def __getitem__(self, __key: str) -> Artifact:
-        for artifact in self._store:
-            if artifact.cls_name.lower() == __key.lower():
-                return artifact
-        raise ValueError(f"Artifact '{__key}' not found in artifact service!")
+        name = self._name(__key)
+        if name is None:
+            raise ValueError(f"Artifact '{__key}' not found in artifact service!")
+        return self._store[name]
 
     def __setitem__(self, __key: str, __value: Artifact) -> None:
-        if __key in self:
+        registered = self._store.get(__key)
+        # Only the stand-in registered from a plugin's manifest can be replaced, by
+        # the artifact it stands in for
+        if registered is not None and (
+            not isinstance(registered, LazyArtifact)
+            or isinstance(__value, LazyArtifact)
+            or registered.cls_name != __value.cls_name
+        ):
             raise ValueError(f"Artifact '{__key}' already registered!")
-        self._store.append(__value)
+        self._register(__key, __value)
 
     def __delitem__(self, __key: str) -> None:
-        for artifact in self._store:
-            if artifact.cls_name.lower() == __key:
-                self._store.remove[artifact]
+        name = self._name(__key)
+        if name is not None:
+            self._unindex(name)
+            del self._store[name]
+
+    def __contains__(self, __key: object) -> bool:
+        return isinstance(__key, str) and self._name(__key) is not None
 
-    def __iter__(self) -> t.Iterator[str, Artifact]:
-        return iter(self._store)
+    def __iter__(self) -> t.Iterator[Artifact]:
+        return iter(list(self._store.values()))
 
     def __len__(self) -> int:
-        return len(self)
+        return len(self._store)
 
     def __repr__(self) -> str:
         return "Artifacts()"
 
     def __str__(self) -> str:
-        artifact_lst = {artifact.name for artifact in self._store}
+        artifact_lst = set(self._store)
         return (
             "Artifacts service contains the following artifacts: "
             f"{'; '.join(artifact_lst)}. Process queue contains "
-            f"{repr(len(self.process_queue))} artifacts to be processed!"
+            f"{repr(self.process_queue.qsize())} artifacts to be processed!"
         )
 
+    def _name(self, key: str) -> t.Optional[str]:
+        """Returns the registered name of an artifact by class name or name"""
+        names = self._by_cls_name.get(key.lower())
+        if names:
+            return names[0]
+        return key if key in self._store else None
+
+    def _register(self, name: str, artifact: Artifact) -> None:
+        registered = self._store.get(name)
+        if registered is not None:
+            self._unindex(name)
+
+        artifact._service = self
+        artifact._service_key = name
+        self._store[name] = artifact
+        self._index(name, artifact)
+
+        if isinstance(registered, LazyArtifact):
+            registered.resolve(artifact)
+        self.update_selection(artifact)
+
+    def _index(self, name: str, artifact: Artifact) -> None:
+        order = self._indexed[name][0] if name in self._indexed else next(self._counter)
+        cls_name = artifact.cls_name.lower()
+        self._indexed[name] = (order, cls_name, artifact.category, artifact.device_type)
+        self._by_cls_name[cls_name].append(name)
+        self._by_category[artifact.category][name] = None
+        self._by_device_type[artifact.device_type][name] = None
+
+    def _unindex(self, name: str) -> None:
+        _, cls_name, category, device_type = self._indexed[name]
+        self._by_cls_name[cls_name].remove(name)
+        self._by_category[category].pop(name, None)
+        self._by_device_type[device_type].pop(name, None)
+        self._selected.discard(name)
+        self._selected_cache = None
+
     @property
     def processing_device_type(self) -> str:
         return self._processing_device_type
@@ -92,14 +195,69 @@ def processing_device_type(self) -> str:
     @processing_device_type.setter
     def processing_device_type(self, device_type: str):
         self._processing_device_type = device_type
+        self._selected_cache = None
         self.reset()
 
-        for artifact in self:
-            if artifact.core and artifact.device_type == device_type:
-                artifact.select = True
+    def by_category(self, category: str) -> list[Artifact]:
+        """Returns the artifacts of a category
+
+        Args:
+            category: category of the artifacts
+
+        Returns:
+            The artifacts in the order they were registered
+        """
+        return [self._store[name] for name in self._by_category.get(category, ())]
+
+    def by_device_type(self, device_type: str) -> list[Artifact]:
+        """Returns the artifacts of a device type
+
+        Args:
+            device_type: device type of the artifacts
+
+        Returns:
+            The artifacts in the order they were registered
+        """
+        return [self._store[name] for name in self._by_device_type.get(device_type, ())]
+
+    def update_selection(self, artifact: Artifact) -> None:
+        """Updates the selected artifacts after `select` of an artifact changed
+
+        Called by the artifact when `select` is set.
+
+        Args:
+            artifact: artifact that changed
+        """
+        name = getattr(artifact, "_service_key", None)
+        if name is None or self._store.get(name) is not artifact:
+            return
+
+        if artifact.select:
+            if name not in self._selected:
+                self._selected.add(name)
+                self._selected_cache = None
+        elif name in self._selected:
+            self._selected.discard(name)
+            self._selected_cache = None
+
+    def create_queue(
+        self,
+        restore: t.Optional[t.Callable[[Artifact], bool]] = None,
+    ) -> None:
+        """Queues the selected artifacts for :meth:`run_queue`
+
+        Args:
+            restore: called with each artifact before it is queued. Artifacts it
+                returns True for were restored from a checkpoint and are not
+                queued. Defaults to None.
+        """
+        for artifact in self.selected():
+            if isinstance(artifact, LazyArtifact):
+                artifact = artifact.load()
+
+            if restore and restore(artifact):
+                continue
 
-    def create_queue(self):
-        for artifact in self:
             priority = 10
             if artifact.core:
                 priority = 1
@@ -113,14 +271,18 @@ def run_queue(
         self,
         window: PySG.Window = None,
         thread: ProcessThread = None,
+        completed: t.Optional[t.Callable[[Artifact], None]] = None,
     ) -> None:
         """Processes all the selected artifacts
 
         Args:
             window: :mod:`PySimpleGUI` window when running the GUI. Defaults to None.
             thread: :mod:`threading` instance for processing artifacts. Defaults to None.
+            completed: called with each artifact once it is processed, for example
+                to save a checkpoint. Defaults to None.
         """
         num_processed = 0
+        last_progress = 0.0
         plugins: Plugin = self.selected()
 
         if hasattr(plugins, "pre_process"):
@@ -140,11 +302,15 @@ def run_queue(
                 continue
 
             artifact.process()
+            if completed:
+                completed(artifact)
             num_processed += 1
-            if window:
+            if window and time.monotonic() - last_progress >= PROGRESS_INTERVAL:
+                last_progress = time.monotonic()
                 window.write_event_value("<THREAD>", num_processed)
             self.process_queue.task_done()
         if window and not thread.stopped:
+            window.write_event_value("<THREAD>", num_processed)
             window.write_event_value("<DONE>", None)
 
     def toggle_artifact(self, name: str):
@@ -164,7 +330,7 @@ def installed(self) -> list[str]:
             The list of artifacts
         """
 
-        return sorted({artifact.name for artifact in self})
+        return sorted(self._store)
 
     def installed_categories(self) -> list[str]:
         """Returns the list of installed artifact categories
@@ -173,31 +339,61 @@ def installed_categories(self) -> list[str]:
             The list of artifacts
         """
 
-        return sorted({artifact.category for artifact in self})
+        return sorted(
+            category for category, artifacts in self._by_category.items() if artifacts
+        )
 
-    def selected(self) -> set[str]:
+    def selected(self) -> list[Artifact]:
         """Returns the list of selected artifacts for processing
 
+        Only artifacts of the processing device type are returned once it is set.
+
         Returns:
-            The list of selected artifacts.
+            The list of selected artifacts in the order they were registered.
         """
-        return list(
-            filter(
-                lambda artifact: artifact.select
-                and (
-                    artifact.device_type == self.processing_device_type
-                    or not self.processing_device_type
-                ),
-                self,
-            )
-        )
+        if self._selected_cache is None:
+            device_type = self._by_device_type.get(self.processing_device_type, {})
+            self._selected_cache = [
+                self._store[name]
+                for name in sorted(self._selected, key=lambda name: self._indexed[name])
+                if name in device_type or not self.processing_device_type
+            ]
+        return list(self._selected_cache)
+
+    def selected_categories(self) -> list[str]:
+        """Returns the categories of the selected artifacts
+
+        Returns:
+            The sorted list of categories
+        """
+        return sorted({artifact.category for artifact in self.selected()})
+
+    def renew(self) -> None:
+        """Replaces every loaded artifact with a new instance
+
+        Results, found files and searches of the last run are dropped so the
+        artifacts can process another extraction. Nothing is selected afterwards.
+        """
+        self.process_queue = queue.PriorityQueue()
+        for name, artifact in list(self._store.items()):
+            if isinstance(artifact, LazyArtifact):
+                artifact.select = False
+                continue
+
+            if isinstance(artifact.data, RowSink):
+                artifact.data.close()
+            self._register(name, type(artifact)())
 
     def reset(self) -> None:
         """Resets the list of selected artifacts."""
-        for artifact in self:
-            if not artifact.core and not (
-                artifact.device_type == self.processing_device_type
-            ):
+        device_type = self._by_device_type.get(self.processing_device_type, {})
+
+        for name in list(self._selected):
+            artifact = self._store[name]
+            if not artifact.core and name not in device_type:
                 artifact.select = False
-            elif artifact.core and (artifact.device_type == self.processing_device_type):
+
+        for name in list(device_type):
+            artifact = self._store[name]
+            if artifact.core:
                 artifact.select = True
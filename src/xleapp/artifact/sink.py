@@ -0,0 +1,146 @@
+"""Row sink used for :attr:`Artifact.data`
+
+A :class:`RowSink` behaves like a list for `append`, `extend`, iteration and `len`.
+Once more rows than the spill threshold are held in memory they are pickled to an
+anonymous temporary file in chunks and streamed back in order when the sink is
+iterated, so large artifacts do not keep every row alive until the reports are
+generated. :class:`sqlite3.Row` rows are stored as tuples. If other rows cannot be
+pickled the sink stops spilling and keeps them in memory.
+"""
+from __future__ import annotations
+
+import logging
+import pickle
+import sqlite3
+import tempfile
+import typing as t
+
+import xleapp.globals as g
+
+
+logger_log = logging.getLogger("xleapp.logfile")
+
+SPILL_THRESHOLD = 100_000
+
+
+class RowSink:
+    """List compatible container for artifact rows that spills to disk
+
+    Args:
+        threshold: number of rows held in memory before they are spilled to disk.
+            Defaults to the application's `spill_threshold` or
+            :const:`SPILL_THRESHOLD`, read when the first row is added.
+            Set to 0 to never spill.
+    """
+
+    __slots__ = ["_buffer", "_file", "_num_of_chunks", "_num_of_spilled", "_threshold"]
+
+    def __init__(self, threshold: t.Optional[int] = None) -> None:
+        self._buffer: list[t.Any] = []
+        self._file: t.Optional[t.IO[bytes]] = None
+        self._num_of_chunks = 0
+        self._num_of_spilled = 0
+        self._threshold = threshold
+
+    def __len__(self) -> int:
+        return self._num_of_spilled + len(self._buffer)
+
+    def __iter__(self) -> t.Iterator[t.Any]:
+        if self._file:
+            self._file.flush()
+            position = 0
+            for _ in range(self._num_of_chunks):
+                self._file.seek(position)
+                chunk = pickle.load(self._file)
+                position = self._file.tell()
+                yield from chunk
+            self._file.seek(0, 2)
+
+        yield from list(self._buffer)
+
+    def __eq__(self, __o: object) -> bool:
+        if isinstance(__o, (list, RowSink)):
+            return len(self) == len(__o) and all(
+                row == other for row, other in zip(self, __o)
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return (
+            f"<RowSink rows={len(self)}, spilled={self._num_of_spilled}, "
+            f"threshold={repr(self.threshold)}>"
+        )
+
+    @property
+    def threshold(self) -> int:
+        """Number of rows held in memory before spilling to disk"""
+        if self._threshold is None:
+            return getattr(g.app, "spill_threshold", SPILL_THRESHOLD)
+        return self._threshold
+
+    @property
+    def spilled(self) -> bool:
+        """True if any rows were written to disk"""
+        return self._num_of_spilled > 0
+
+    def append(self, row: t.Any) -> None:
+        """Adds a row to the end of the sink
+
+        Args:
+            row: row to add
+        """
+        if self._threshold is None:
+            self._threshold = self.threshold
+
+        if isinstance(row, sqlite3.Row):
+            row = tuple(row)
+        self._buffer.append(row)
+        if len(self._buffer) >= self._threshold > 0:
+            self._spill()
+
+    def extend(self, rows: t.Iterable[t.Any]) -> None:
+        """Adds rows to the end of the sink
+
+        Args:
+            rows: rows to add
+        """
+        if self._threshold is None:
+            self._threshold = self.threshold
+
+        for row in rows:
+            if isinstance(row, sqlite3.Row):
+                row = tuple(row)
+            self._buffer.append(row)
+            if len(self._buffer) >= self._threshold > 0:
+                self._spill()
+
+    def clear(self) -> None:
+        """Removes every row and deletes the spilled rows"""
+        self.close()
+        self._buffer = []
+
+    def close(self) -> None:
+        """Deletes the temporary file holding spilled rows"""
+        if self._file:
+            self._file.close()
+            self._file = None
+        self._num_of_chunks = 0
+        self._num_of_spilled = 0
+
+    def _spill(self) -> None:
+        try:
+            data = pickle.dumps(self._buffer, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as err:
+            logger_log.warning(f"-> Rows kept in memory! They cannot be spilled: {err}")
+            self._threshold = 0
+            return
+
+        if not self._file:
+            self._file = tempfile.TemporaryFile(
+                prefix="xleapp_rows_",
+                dir=getattr(g.app, "temp_folder", None),
+            )
+        self._file.write(data)
+        self._num_of_chunks += 1
+        self._num_of_spilled += len(self._buffer)
+        self._buffer = []
@@ -0,0 +1,269 @@
+"""Processes many extractions in one run
+
+A batch reads a manifest of jobs, each naming a device type, an input path and an
+output folder. Jobs run in worker processes that discover the plugins once and
+reuse the registry, the compiled templates and the imports for every job they
+run. Each job gets its own :class:`~xleapp.app.Application` set as
+:data:`xleapp.globals.app` while it runs. The artifacts and search providers are
+reset when it finishes so nothing carries over to the next job.
+
+Manifests are JSON lists of objects or CSV files with a header::
+
+    device_type,input,output,artifacts
+    ios,extractions/phone1.zip,reports,
+    android,extractions/phone2.tar,reports,Accounts;SMS
+
+`artifacts` is optional. Jobs without artifacts process every artifact of their
+device type. Relative paths are relative to the manifest.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import csv
+import functools
+import json
+import logging
+import pathlib
+import time
+import typing as t
+
+from dataclasses import dataclass
+
+import xleapp.globals as g
+
+from xleapp import log, templating
+from xleapp.app import Application
+from xleapp.artifact.sink import SPILL_THRESHOLD
+from xleapp.helpers.search import search_providers
+from xleapp.helpers.utils import validate_input
+
+
+if t.TYPE_CHECKING:
+    import jinja2
+
+logger_log = logging.getLogger("xleapp.logfile")
+
+MANIFEST_FIELDS = ("device_type", "input", "output")
+ARTIFACTS_SEPARATOR = ";"
+
+
+@dataclass(frozen=True)
+class Job:
+    """Extraction to process
+
+    Attributes:
+        device_type (str): device type of the extraction
+        input_path (Path): file or folder of the extraction
+        output_path (Path): folder to create the report folder in
+        artifacts (tuple): names of the artifacts to process. Every artifact of the
+            device type if empty.
+    """
+
+    device_type: str
+    input_path: pathlib.Path
+    output_path: pathlib.Path
+    artifacts: tuple[str, ...] = ()
+
+    def __str__(self) -> str:
+        return f"{self.device_type} {self.input_path}"
+
+
+@dataclass(frozen=True)
+class BatchOptions:
+    """Options shared by every job of a batch
+
+    Attributes:
+        tsv_compression (str): compression of TSV exports. Defaults to None.
+        spill_threshold (int): rows an artifact holds in memory before spilling to
+            disk
+    """
+
+    tsv_compression: t.Optional[str] = None
+    spill_threshold: int = SPILL_THRESHOLD
+
+
+@dataclass
+class JobResult:
+    """Outcome of a job
+
+    Attributes:
+        job (Job): the job
+        report_folder (Path): report created by the job. None if the job failed
+            before creating it.
+        run_time (float): seconds the job ran
+        error (str): why the job failed. None if it completed.
+    """
+
+    job: Job
+    report_folder: t.Optional[pathlib.Path] = None
+    run_time: float = 0.0
+    error: t.Optional[str] = None
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None
+
+
+def _job(entry: t.Mapping[str, t.Any], folder: pathlib.Path, number: int) -> Job:
+    missing = [name for name in MANIFEST_FIELDS if not entry.get(name)]
+    if missing:
+        raise ValueError(f"Job {number} of the manifest is missing {', '.join(missing)}!")
+
+    artifacts = entry.get("artifacts") or ()
+    if isinstance(artifacts, str):
+        artifacts = artifacts.split(ARTIFACTS_SEPARATOR)
+
+    return Job(
+        device_type=str(entry["device_type"]).lower(),
+        input_path=folder / entry["input"],
+        output_path=folder / entry["output"],
+        artifacts=tuple(name.strip() for name in artifacts if name.strip()),
+    )
+
+
+def load_manifest(manifest_file: pathlib.Path) -> list[Job]:
+    """Reads the jobs of a manifest
+
+    Args:
+        manifest_file: JSON or CSV manifest
+
+    Returns:
+        The jobs in the order of the manifest
+
+    Raises:
+        ValueError: If a job is missing its device type, input or output
+    """
+    manifest_file = pathlib.Path(manifest_file)
+    folder = manifest_file.resolve().parent
+
+    with open(manifest_file, encoding="utf-8", newline="") as file:
+        if manifest_file.suffix.lower() == ".json":
+            entries = json.load(file)
+        else:
+            entries = list(csv.DictReader(file))
+
+    return [_job(entry, folder, number) for number, entry in enumerate(entries, 1)]
+
+
+@functools.cache
+def bytecode_cache() -> jinja2.BytecodeCache:
+    """Compiled templates shared by the jobs run in this process"""
+    from xleapp.templating.ext import MemoryBytecodeCache
+
+    return MemoryBytecodeCache()
+
+
+def _select_artifacts(application: Application, job: Job) -> None:
+    # Workers forked from a process that selected artifacts inherit the selection
+    for artifact in application.artifacts.selected():
+        artifact.select = False
+    application.set_device_type(job.device_type)
+    if job.artifacts:
+        for name in job.artifacts:
+            application.artifacts[name].select = True
+    else:
+        for artifact in application.artifacts.by_device_type(job.device_type):
+            artifact.select = True
+
+
+def run_job(
+    job: Job,
+    options: BatchOptions = BatchOptions(),
+    finished: t.Optional[t.Callable[[Application], None]] = None,
+) -> JobResult:
+    """Processes one extraction and generates its report
+
+    Errors are logged and returned in the result so the other jobs keep running.
+
+    Args:
+        job: extraction to process
+        options: options of the batch. Defaults to :class:`BatchOptions`.
+        finished: called with the application after the report is generated and
+            before the artifacts are reset. Defaults to None.
+
+    Returns:
+        JobResult: outcome of the job
+    """
+    start_time = time.perf_counter()
+    result = JobResult(job)
+
+    application = Application()
+    application.bytecode_cache = bytecode_cache()
+    application.tsv_compression = options.tsv_compression
+    application.spill_threshold = options.spill_threshold
+
+    with g.use_app(application):
+        try:
+            validate_input(job.input_path, job.output_path)
+            _select_artifacts(application, job)
+
+            application.create_output_folder(job.output_path)
+            result.report_folder = application.report_folder
+            application.input_path = job.input_path
+            log.init()
+
+            application(job.output_path, job.input_path)
+            if not hasattr(application, "seeker"):
+                raise ValueError(f"No search provider can read {str(job.input_path)!r}!")
+
+            logger_log.info(f"Processing {application.num_to_process} artifacts...")
+            application.run()
+            application.processing_time = time.perf_counter() - start_time
+
+            application.generate_reports()
+            templating.generate_index(application)
+            if finished:
+                finished(application)
+        except Exception as err:
+            logger_log.exception(f"Job {job} failed!")
+            result.error = f"{type(err).__name__}: {err}"
+        finally:
+            log.shutdown()
+            application.artifacts.renew()
+            search_providers.reset()
+
+    result.run_time = time.perf_counter() - start_time
+    return result
+
+
+def init_worker() -> None:
+    """Discovers the plugins once for each worker process"""
+    if not isinstance(g.app, Application):
+        g.app = Application()
+    # Workers forked from the main process already have the plugins
+    if not len(g.app.artifacts):
+        Application.discover_plugins()
+
+
+def run_batch(
+    jobs: t.Iterable[Job],
+    options: BatchOptions = BatchOptions(),
+    max_workers: int = 1,
+) -> t.Iterator[JobResult]:
+    """Runs jobs with a shared pool of worker processes
+
+    Args:
+        jobs: extractions to process
+        options: options of the batch. Defaults to :class:`BatchOptions`.
+        max_workers: jobs run at the same time. With 1 the jobs run one after
+            another in this process. Defaults to 1.
+
+    Yields:
+        The result of each job as it finishes
+    """
+    if max_workers == 1:
+        for job in jobs:
+            yield run_job(job, options)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=init_worker,
+    ) as executor:
+        futures = {executor.submit(run_job, job, options): job for job in jobs}
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as err:
+                # The worker died, for example when it ran out of memory
+                yield JobResult(futures[future], error=f"{type(err).__name__}: {err}")
@@ -6,6 +6,8 @@
 import xleapp.globals as g
 
 from xleapp import app, log, templating
+from xleapp.artifact.budget import BudgetOptions
+from xleapp.artifact.profiling import ProfileOptions
 from xleapp.helpers import decorators, utils
 
 
@@ -14,12 +16,13 @@
 pass_application = click.make_pass_decorator(app.Application, ensure=True)
 
 
+DEVICE_TYPES = ["ios", "returns", "android", "chromebook", "vehicle"]
+
+
 @click.command
 @click.argument(
     "device_type",
-    type=click.Choice(
-        ["ios", "returns", "android", "chromebook", "vehicle"], case_sensitive=False
-    ),
+    type=click.Choice(DEVICE_TYPES, case_sensitive=False),
 )
 @click.option(
     "--output_folder",
@@ -33,6 +36,86 @@
     type=click.Path(exists=True, dir_okay=True, resolve_path=True, writable=True),
     help="input file/folder path",
 )
+@click.option(
+    "--tsv-compression",
+    type=click.Choice(["gzip", "zstd"], case_sensitive=False),
+    help="compress TSV exports. 'zstd' requires the 'zstandard' package",
+)
+@click.option(
+    "--spill-threshold",
+    type=click.IntRange(min=0),
+    default=app.Application.spill_threshold,
+    show_default=True,
+    help="rows an artifact holds in memory before spilling to disk. 0 disables",
+)
+@click.option(
+    "--profile-artifact",
+    multiple=True,
+    metavar="NAME",
+    help="profile an artifact by name or class name. Can be repeated",
+)
+@click.option(
+    "--profile-all-over",
+    type=click.FloatRange(min=0),
+    metavar="SECONDS",
+    help="keep profiles of every artifact running longer than SECONDS",
+)
+@click.option(
+    "--profile-memory",
+    is_flag=True,
+    help="trace allocations of profiled artifacts with tracemalloc",
+)
+@click.option(
+    "--resume",
+    type=click.Path(exists=True, file_okay=False, resolve_path=True, writable=True),
+    metavar="REPORT_FOLDER",
+    help="resume the run of a report folder, skipping artifacts already processed",
+)
+@click.option(
+    "--result-cache",
+    is_flag=True,
+    help="load the results of artifacts whose files are unchanged from a cache",
+)
+@click.option(
+    "--cache-folder",
+    type=click.Path(file_okay=False, resolve_path=True, writable=True),
+    help="folder of the result cache. Defaults to the user's cache folder",
+)
+@click.option(
+    "--cache-fingerprint",
+    type=click.Choice(["auto", "stat", "hash"], case_sensitive=False),
+    default="auto",
+    show_default=True,
+    help="fingerprint found files by size and time ('stat') or by content ('hash')",
+)
+@click.option(
+    "--time-limit",
+    type=click.FloatRange(min=0),
+    default=0,
+    metavar="SECONDS",
+    help="cancel artifacts running longer than SECONDS",
+)
+@click.option(
+    "--rss-limit",
+    type=click.IntRange(min=0),
+    default=0,
+    metavar="MIB",
+    help="cancel artifacts growing the memory of the process by more than MIB",
+)
+@click.option(
+    "--long-running-time-limit",
+    type=click.FloatRange(min=0),
+    default=0,
+    metavar="SECONDS",
+    help="--time-limit of long running artifacts",
+)
+@click.option(
+    "--long-running-rss-limit",
+    type=click.IntRange(min=0),
+    default=0,
+    metavar="MIB",
+    help="--rss-limit of long running artifacts",
+)
 @click.argument("artifacts", required=False, nargs=-1)
 @pass_application
 def device(
@@ -40,6 +123,19 @@ def device(
     device_type: str,
     input_path: click.Path,
     output_folder: click.Path,
+    tsv_compression: str,
+    spill_threshold: int,
+    profile_artifact: tuple[str, ...],
+    profile_all_over: float,
+    profile_memory: bool,
+    resume: str,
+    result_cache: bool,
+    cache_folder: str,
+    cache_fingerprint: str,
+    time_limit: float,
+    rss_limit: int,
+    long_running_time_limit: float,
+    long_running_rss_limit: int,
     artifacts: list,
 ):
     """Parses the selected device
@@ -49,13 +145,50 @@ def device(
         device_type (str): device to parse
         input_path (click.Path): path to the input folder/file
         output_folder (click.Path): path to the output folder to create the report
+        tsv_compression (str): compression for TSV exports. Default: None
+        spill_threshold (int): rows held in memory by each artifact before spilling
+            to disk
+        profile_artifact (tuple): artifacts to profile. Saved to
+            `Script Logs/profiles`
+        profile_all_over (float): profile artifacts running longer than this many
+            seconds. Default: None
+        profile_memory (bool): trace allocations of profiled artifacts
+        resume (str): report folder of a run to resume. Default: None
+        result_cache (bool): load unchanged artifact results from a cache
+        cache_folder (str): folder of the result cache. Default: None
+        cache_fingerprint (str): how the result cache fingerprints found files
+        time_limit (float): seconds before an artifact is cancelled. 0 disables
+        rss_limit (int): MiB the memory can grow before an artifact is cancelled.
+            0 disables
+        long_running_time_limit (float): `time_limit` of long running artifacts
+        long_running_rss_limit (int): `rss_limit` of long running artifacts
         artifacts (list): list of artifacts to parse. Default: All
     """
 
     start_time = time.perf_counter()
 
+    application.tsv_compression = tsv_compression and tsv_compression.lower()
+    application.spill_threshold = spill_threshold
+    application.profile_options = ProfileOptions(
+        artifacts=frozenset(profile_artifact),
+        over=profile_all_over,
+        memory=profile_memory,
+    )
+    application.budget_options = BudgetOptions(
+        time_limit=time_limit,
+        rss_limit=rss_limit * 1024**2,
+        long_running_time_limit=long_running_time_limit,
+        long_running_rss_limit=long_running_rss_limit * 1024**2,
+    )
     application.set_device_type(device_type)
-    application.create_output_folder(output_folder)
+    if resume:
+        try:
+            application.resume(resume, input_path)
+        except (FileNotFoundError, ValueError) as err:
+            raise click.BadParameter(str(err), param_hint="--resume") from err
+    else:
+        application.create_output_folder(output_folder)
+    application.input_path = input_path
     log.init()
 
     if len(artifacts) == 0:
@@ -66,6 +199,12 @@ def device(
         for artifact in artifacts:
             application.artifacts.toggle_artifact(artifact)
 
+    # Profiled artifacts are matched by name or class name ignoring case
+    installed = {artifact.name.lower() for artifact in application.artifacts}
+    for name in profile_artifact:
+        if name not in application.artifacts and name.lower() not in installed:
+            logger_log.warning(f"Artifact {repr(name)} to profile is not installed!")
+
     click.echo(
         utils.generate_program_header(
             f"{version.__project__} {version.__version__}",
@@ -76,7 +215,9 @@ def device(
         ),
     )
 
-    application = application(output_folder, input_path)
+    application = application(application.output_path, input_path)
+    if result_cache:
+        application.use_result_cache(cache_folder, cache_fingerprint.lower())
 
     @decorators.timed
     def process():
@@ -89,11 +230,331 @@ def process():
 
     application.processing_time = end_time - start_time
 
+    application.generate_reports()
+
     logger_log.info("\nGenerating index file...")
     templating.generate_index(application)
     logger_log.info("-> Index file generated!")
 
-    application.generate_reports()
+
+@click.command
+@click.argument(
+    "manifest",
+    type=click.Path(exists=True, dir_okay=False, resolve_path=True),
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="extractions processed at the same time",
+)
+@click.option(
+    "--tsv-compression",
+    type=click.Choice(["gzip", "zstd"], case_sensitive=False),
+    help="compress TSV exports. 'zstd' requires the 'zstandard' package",
+)
+@click.option(
+    "--spill-threshold",
+    type=click.IntRange(min=0),
+    default=app.Application.spill_threshold,
+    show_default=True,
+    help="rows an artifact holds in memory before spilling to disk. 0 disables",
+)
+def batch(manifest: str, jobs: int, tsv_compression: str, spill_threshold: int):
+    """Parses every extraction listed in a manifest
+
+    The manifest is a JSON or CSV file of jobs with a `device_type`, `input` and
+    `output` and optional `artifacts` to process.
+
+    Args:
+        manifest (str): path to the manifest
+        jobs (int): number of extractions processed at the same time. Default: 1
+        tsv_compression (str): compression for TSV exports. Default: None
+        spill_threshold (int): rows held in memory by each artifact before spilling
+            to disk
+    """
+    from xleapp import batch as xleapp_batch
+
+    try:
+        batch_jobs = xleapp_batch.load_manifest(manifest)
+    except ValueError as err:
+        raise click.BadParameter(str(err), param_hint="MANIFEST") from err
+
+    options = xleapp_batch.BatchOptions(
+        tsv_compression=tsv_compression and tsv_compression.lower(),
+        spill_threshold=spill_threshold,
+    )
+    click.echo(f"Processing {len(batch_jobs)} extractions with {jobs} workers...")
+
+    failed = 0
+    for result in xleapp_batch.run_batch(batch_jobs, options, max_workers=jobs):
+        if result.failed:
+            failed += 1
+            click.echo(f"-> Failed {result.job} ({result.run_time:.2f}s): {result.error}")
+        else:
+            click.echo(
+                f"-> Completed {result.job} ({result.run_time:.2f}s): "
+                f"{result.report_folder}",
+            )
+
+    click.echo(f"Completed {len(batch_jobs) - failed} of {len(batch_jobs)} extractions")
+    if failed:
+        click.get_current_context().exit(1)
+
+
+@click.command
+@click.argument(
+    "device_type",
+    type=click.Choice(DEVICE_TYPES, case_sensitive=False),
+)
+@click.option(
+    "--output_folder",
+    "-o",
+    type=click.Path(exists=True, dir_okay=True, resolve_path=True, writable=True),
+    required=True,
+    help="output folder path",
+)
+@click.option(
+    "--input_path",
+    "-i",
+    type=click.Path(exists=True, dir_okay=True, resolve_path=True),
+    required=True,
+    help="input file/folder path",
+)
+@click.option(
+    "--shards",
+    type=click.IntRange(min=1),
+    default=2,
+    show_default=True,
+    help="number of shards to split the artifacts into",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=0),
+    help="worker processes on this host. 0 waits for workers on other hosts. "
+    "Defaults to the number of shards",
+)
+@click.option(
+    "--cost-history",
+    type=click.Path(exists=True, dir_okay=True, resolve_path=True),
+    help="run_metrics.json of an earlier run, or its Script Logs folder, used to "
+    "estimate the cost of each artifact",
+)
+@click.option(
+    "--wait-timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    metavar="SECONDS",
+    help="fail the shards that are not finished after waiting SECONDS for other "
+    "workers. Defaults to no limit",
+)
+@click.option(
+    "--tsv-compression",
+    type=click.Choice(["gzip", "zstd"], case_sensitive=False),
+    help="compress TSV exports. 'zstd' requires the 'zstandard' package",
+)
+@click.option(
+    "--spill-threshold",
+    type=click.IntRange(min=0),
+    default=app.Application.spill_threshold,
+    show_default=True,
+    help="rows an artifact holds in memory before spilling to disk. 0 disables",
+)
+@click.argument("artifacts", required=False, nargs=-1)
+@pass_application
+def shard(
+    application: app.Application,
+    device_type: str,
+    output_folder: str,
+    input_path: str,
+    shards: int,
+    workers: int,
+    cost_history: str,
+    wait_timeout: float,
+    tsv_compression: str,
+    spill_threshold: int,
+    artifacts: list,
+):
+    """Parses a device with the artifacts split into shards run by separate workers
+
+    The shards are queued in `shards.db` of a new `xLEAPP_Shards_<time>` folder.
+    Workers on other hosts join with `xleapp shard-worker QUEUE`. The reports of
+    the shards are merged into one report once every shard is finished.
+
+    Args:
+        application (app.Application): Application object
+        device_type (str): device to parse
+        output_folder (str): path to the output folder to create the report
+        input_path (str): path to the input folder/file
+        shards (int): number of shards. Default: 2
+        workers (int): worker processes on this host. Default: number of shards
+        cost_history (str): metrics of an earlier run to estimate artifact costs
+        wait_timeout (float): seconds to wait for other workers. Default: None
+        tsv_compression (str): compression for TSV exports. Default: None
+        spill_threshold (int): rows held in memory by each artifact before spilling
+            to disk
+        artifacts (list): list of artifacts to parse. Default: All
+    """
+    import functools
+    import pathlib
+
+    from xleapp import batch as xleapp_batch
+    from xleapp import shard as xleapp_shard
+    from xleapp.artifact import metrics
+
+    start_time = time.perf_counter()
+
+    device_type = device_type.lower()
+    application.set_device_type(device_type)
+    if len(artifacts) == 0:
+        selected = application.artifacts.by_device_type(device_type)
+    else:
+        selected = [application.artifacts[name] for name in artifacts]
+
+    queue = xleapp_shard.create_queue(
+        job=xleapp_batch.Job(
+            device_type=device_type,
+            input_path=pathlib.Path(input_path),
+            output_path=pathlib.Path(output_folder),
+        ),
+        artifacts=selected,
+        num_of_shards=shards,
+        options=xleapp_batch.BatchOptions(
+            tsv_compression=tsv_compression and tsv_compression.lower(),
+            spill_threshold=spill_threshold,
+        ),
+        history=cost_history and metrics.load_metrics(cost_history),
+    )
+    queued = queue.shards()
+    click.echo(f"Queued {len(queued)} shards in {queue.queue_file}")
+    for queued_shard in queued:
+        click.echo(
+            f"-> Shard {queued_shard.id}: {len(queued_shard.artifacts)} artifacts, "
+            f"estimated cost {queued_shard.cost:.2f}",
+        )
+
+    if workers is None:
+        workers = len(queued)
+    if workers:
+        xleapp_shard.run_workers(queue, workers)
+    if not queue.finished():
+        click.echo(f"Waiting for other workers: xleapp shard-worker {queue.queue_file}")
+        run_pending = None
+        if workers:
+            # Shards of workers that stopped are run again on this host
+            run_pending = functools.partial(xleapp_shard.run_workers, queue, workers)
+        queue.wait(timeout=wait_timeout, run_pending=run_pending)
+
+    failed = [queued_shard for queued_shard in queue.shards() if queued_shard.error]
+    for failed_shard in failed:
+        click.echo(f"-> Failed shard {failed_shard.id}: {failed_shard.error}")
+
+    report_folder = xleapp_shard.merge(
+        queue,
+        processing_time=time.perf_counter() - start_time,
+    )
+    click.echo(f"Report location: {report_folder}")
+    if failed or not report_folder:
+        click.get_current_context().exit(1)
+
+
+@click.command(name="shard-worker")
+@click.argument(
+    "queue_file",
+    type=click.Path(exists=True, dir_okay=False, resolve_path=True),
+)
+def shard_worker(queue_file: str):
+    """Runs pending shards of a queue created by `xleapp shard`
+
+    Args:
+        queue_file (str): path to `shards.db` of the sharded run
+    """
+    from xleapp import shard as xleapp_shard
+
+    num_of_shards = xleapp_shard.work(queue_file)
+    click.echo(f"Ran {num_of_shards} shards of {queue_file}")
+
+
+@click.command
+@click.argument(
+    "report_folder",
+    type=click.Path(exists=True, file_okay=False, resolve_path=True, writable=True),
+)
+@click.option(
+    "--artifact",
+    "-a",
+    "artifacts",
+    multiple=True,
+    metavar="NAME",
+    help="artifact to generate the reports of. Can be repeated. Default: All",
+)
+@click.option(
+    "--format",
+    "-f",
+    "formats",
+    multiple=True,
+    type=click.Choice(app.REPORT_FORMATS, case_sensitive=False),
+    help="report format to generate. Can be repeated. Default: All",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="processes writing HTML pages and TSV files",
+)
+@click.option(
+    "--tsv-compression",
+    type=click.Choice(["gzip", "zstd"], case_sensitive=False),
+    help="compress TSV exports. Default: compression of the report",
+)
+def report(
+    report_folder: str,
+    artifacts: tuple[str, ...],
+    formats: tuple[str, ...],
+    workers: int,
+    tsv_compression: str,
+):
+    """Generates the reports of an existing report folder again
+
+    Artifacts are not processed again. Their saved rows are read from the report
+    folder and the extraction is never opened.
+
+    Args:
+        report_folder (str): report folder of an earlier `device` run
+        artifacts (tuple): artifacts to generate the reports of. Default: All
+        formats (tuple): report formats to generate. Default: All
+        workers (int): processes writing HTML pages and TSV files. Default: 1
+        tsv_compression (str): compression for TSV exports. Default: compression
+            of the report
+    """
+    from xleapp import rebuild
+
+    try:
+        application = rebuild.open_report(
+            report_folder,
+            tsv_compression=tsv_compression and tsv_compression.lower(),
+        )
+    except FileNotFoundError as err:
+        raise click.BadParameter(str(err), param_hint="REPORT_FOLDER") from err
+
+    with g.use_app(application):
+        log.init()
+        try:
+            rebuild.rebuild(
+                application,
+                names=artifacts,
+                formats=[name.lower() for name in formats] or app.REPORT_FORMATS,
+                max_workers=workers,
+            )
+        except ValueError as err:
+            raise click.BadParameter(str(err), param_hint="--artifact") from err
+        finally:
+            log.shutdown()
+    click.echo(f"Report location: {application.report_folder}")
 
 
 @click.command
@@ -133,7 +594,50 @@ def artifact_path_lists(application: app.Application):
     click.echo("Saved artifact path list for Autopsy!")
 
 
+def print_import_profile(ctx: click.Context, param: click.Parameter, value: bool):
+    """Prints the slowest imports when starting xLEAPP and exits
+
+    Args:
+        ctx (click.Context): click context
+        param (click.Parameter): the `--import-profile` option
+        value (bool): True if the option was passed
+    """
+    if not value or ctx.resilient_parsing:
+        return
+
+    import prettytable
+
+    from xleapp.helpers import importtime
+
+    import_times = importtime.profile_imports("xleapp.cli")
+    output_table = prettytable.PrettyTable(
+        ["Module", "Cumulative (ms)", "Self (ms)"],
+        align="l",
+    )
+    for it in importtime.slowest(import_times):
+        output_table.add_row(
+            [
+                f"{'  ' * it.depth}{it.module}",
+                f"{it.cumulative_us / 1000:.1f}",
+                f"{it.self_us / 1000:.1f}",
+            ],
+        )
+
+    total = next(it.cumulative_us for it in import_times if it.module == "xleapp.cli")
+    click.echo(output_table.get_string(title="Slowest imports"))
+    click.echo(f"Imported {len(import_times)} modules in {total / 1000:.1f}ms")
+    ctx.exit()
+
+
 @click.group
+@click.option(
+    "--import-profile",
+    is_flag=True,
+    is_eager=True,
+    expose_value=False,
+    callback=print_import_profile,
+    help="show the slowest imports when starting and exit",
+)
 @click.version_option(
     package_name=version.__project__.lower(),
     prog_name=version.__project__,
@@ -152,7 +656,13 @@ def cli(application: app.Application):
             application.artifacts.installed_categories()
         )
 
-    if current_ctx.invoked_subcommand not in ["device"]:
+    if current_ctx.invoked_subcommand not in [
+        "device",
+        "batch",
+        "shard",
+        "shard-worker",
+        "report",
+    ]:
         num_of_installed_or_process = application.num_to_process
         num_of_installed_or_process_categories = application.num_of_categories
 
@@ -169,8 +679,12 @@ def cli(application: app.Application):
 
 cli.add_command(artifact_table)
 cli.add_command(artifact_path_lists)
+cli.add_command(batch)
 cli.add_command(device)
 cli.add_command(gui)
+cli.add_command(report)
+cli.add_command(shard)
+cli.add_command(shard_worker)
 
 if __name__ == "__main__":
     cli()
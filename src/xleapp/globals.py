@@ -1,6 +1,31 @@
 from __future__ import annotations
 
+import contextlib
+import typing as t
+
 from xleapp.app import Application
 
 
 app: Application = Application
+
+
+@contextlib.contextmanager
+def use_app(application: Application) -> t.Iterator[Application]:
+    """Sets the global :data:`app` while the context is open
+
+    The previous application is restored on exit so each job of a batch runs with
+    its own application.
+
+    Args:
+        application: application to use
+
+    Yields:
+        Application: the application
+    """
+    global app
+    previous = app
+    app = application
+    try:
+        yield application
+    finally:
+        app = previous
@@ -14,6 +14,7 @@
 from xleapp.helpers.strings import wrap_text
 from xleapp.helpers.utils import validate_input
 
+from . import log as gui_log
 from .layout import error_popup_no_modules, generate_artifact_list, generate_layout
 from .utils import ArtifactProcessor, disable_widgets
 
@@ -45,6 +46,7 @@ def main(app: Application) -> None:
         f"xLEAPP Logs, Events, And Plists Parser - {app.version}",
         generate_layout(),
     ).finalize()
+    log_handler = gui_log.Handler(window)
 
     if len(window["-DEVICETYPE-"].Values) > 0:
         device_type = app.device["Type"] = window["-DEVICETYPE-"].Values[0]
@@ -62,6 +64,7 @@ def main(app: Application) -> None:
         window.refresh()
 
         error_popup_no_modules()
+        log_handler.close()
         window.close()
 
     processing, stop, done = False, False, False
@@ -109,9 +112,12 @@ def main(app: Application) -> None:
             )
 
             log.init()
+            logging.getLogger("xleapp").addHandler(log_handler)
 
             logger.info(f"Processing {app.num_to_process} artifacts...")
             artifact_processor.start()
+        elif event == gui_log.LOG_EVENT:
+            log_handler.update()
         elif event == "<THREAD>":
             window["<PROGRESSBAR>"].update(values[event])
         elif event == "<DONE>":
@@ -121,12 +127,12 @@ def main(app: Application) -> None:
             end_time = time.perf_counter()
             app.processing_time = end_time - start_time
 
+            app.generate_reports()
+
             logger.info("\nGenerating index file...")
             templating.generate_index(app)
             logger.info("-> Index file generated!")
 
-            app.generate_reports()
-
             report_path = Path(app.report_folder / "index.html").resolve()
             str_report_path = str(report_path).replace("\\\\", "\\")
             str_report_path = wrap_text(str_report_path, "\\")
@@ -144,7 +150,7 @@ def main(app: Application) -> None:
             window["<RERUN>"].update(visible=False)
             window["-PROCESS-"].update(visible=True)
             window["<PROGRESSBAR>"].update(0)
-            window["<LOG>"].update("")
+            log_handler.clear()
 
         if stop and done:
             break
@@ -165,4 +171,5 @@ def main(app: Application) -> None:
         if not processing:
             window["-PROCESS-"].update(disabled=(len(window["-MODULELIST-"].get()) == 0))
 
+    log_handler.close()
     window.close()
@@ -101,7 +101,6 @@ def layout_left_column() -> PySG.Column:
                 [PySG.Multiline(
                     size=(79, 23),
                     key="<LOG>",
-                    reroute_stdout=True,
                     write_only=True,
                     autoscroll=True,
                 )],
@@ -1,18 +1,131 @@
+from __future__ import annotations
+
+import collections
+import itertools
 import logging
+import threading
+import typing as t
+
+
+if t.TYPE_CHECKING:
+    import PySimpleGUI as PySG
+
+
+# Lines kept in the log pane. Older lines are dropped.
+MAX_LINES = 5_000
+# Seconds between updates of the log pane
+UPDATE_INTERVAL = 0.25
+LOG_EVENT = "<LOG UPDATE>"
+
+
+class LogBuffer:
+    """Ring buffer of the lines shown in the log pane
+
+    Lines are kept until :meth:`flush` hands them to the GUI. Only the last
+    `max_lines` lines are kept.
+
+    Args:
+        max_lines: lines to keep. Defaults to :const:`MAX_LINES`.
+    """
+
+    def __init__(self, max_lines: int = MAX_LINES) -> None:
+        self.lines: collections.deque[str] = collections.deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._shown = 0
+
+    def append(self, line: str) -> None:
+        with self._lock:
+            self.lines.append(line)
+            self._pending += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.lines.clear()
+            self._pending = 0
+            self._shown = 0
+
+    def flush(self) -> tuple[str, bool]:
+        """Returns the text to add to the log pane
+
+        Returns:
+            The text and True if it should be appended or False if it replaces the
+            text in the pane because older lines were dropped
+        """
+        with self._lock:
+            pending, self._pending = self._pending, 0
+            if not pending:
+                return "", True
+
+            if self._shown + pending > self.lines.maxlen:
+                self._shown = len(self.lines)
+                return "\n".join(self.lines), False
+
+            prefix = "\n" if self._shown else ""
+            self._shown += pending
+            lines = reversed(list(itertools.islice(reversed(self.lines), pending)))
+        return prefix + "\n".join(lines), True
+
+
+class Handler(logging.Handler):
+    """Shows log records in the log pane of the GUI
+
+    Records are added to a :class:`LogBuffer`. The pane is updated at most once
+    every `interval` seconds by sending :const:`LOG_EVENT` to the window. The
+    event loop then calls :meth:`update`.
+
+    Args:
+        window: GUI window with the `<LOG>` pane
+        max_lines: lines kept in the pane. Defaults to :const:`MAX_LINES`.
+        interval: seconds between updates of the pane. Defaults to
+            :const:`UPDATE_INTERVAL`.
+    """
+
+    def __init__(
+        self,
+        window: PySG.Window,
+        max_lines: int = MAX_LINES,
+        interval: float = UPDATE_INTERVAL,
+    ) -> None:
+        super().__init__(level=logging.INFO)
+        self.setFormatter(logging.Formatter("%(name)s, [%(levelname)s], %(message)s"))
+        self.window = window
+        self.buffer = LogBuffer(max_lines)
+        self.interval = interval
+        self._timer: t.Optional[threading.Timer] = None
+        self._timer_lock = threading.Lock()
 
-from xleapp import gui
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
 
+        with self._timer_lock:
+            if self._timer is None:
+                self._timer = threading.Timer(self.interval, self._notify)
+                self._timer.daemon = True
+                self._timer.start()
 
-buffer: str = ""
+    def _notify(self) -> None:
+        with self._timer_lock:
+            self._timer = None
+        self.window.write_event_value(LOG_EVENT, None)
 
+    def update(self) -> None:
+        """Adds the new lines to the log pane. Call from the GUI event loop."""
+        text, append = self.buffer.flush()
+        if text or not append:
+            self.window["<LOG>"].update(value=text, append=append)
 
-class Handler(logging.StreamHandler):
-    def __init__(self):
-        super().__init__()
-        self.setLevel(logging.INFO)
+    def clear(self) -> None:
+        self.buffer.clear()
+        self.window["<LOG>"].update(value="")
 
-    def emit(self, record):
-        global buffer
-        record = f"{record.name}, [{record.levelname}], {record.msg}"
-        buffer = f"{buffer}\n{record}".strip()
-        gui.window["<LOG>"].update(value=buffer)
+    def close(self) -> None:
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        super().close()
@@ -0,0 +1,247 @@
+"""Column converters for epoch timestamps
+
+Artifacts often convert every row of a timestamp column one value at a time with
+:meth:`datetime.utcfromtimestamp`. The functions in this module convert a whole
+column at once. NumPy is used when it is installed, otherwise dates and times of
+day are formatted once and cached. :func:`sql_to_timestamp` builds the same conversion as
+an SQLite expression so it can be done inside the query instead.
+
+Null (`None`), zero and negative values are treated as "not set" and are
+returned as `empty`, as are values that are not finite numbers or fall outside
+the years 1-9999.
+"""
+from __future__ import annotations
+
+import functools
+import math
+import typing as t
+
+from dataclasses import dataclass
+from datetime import date
+
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+SECONDS_PER_DAY = 86_400
+UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+MIN_SECONDS = (date.min.toordinal() - UNIX_EPOCH_ORDINAL) * SECONDS_PER_DAY
+MAX_SECONDS = (date.max.toordinal() - UNIX_EPOCH_ORDINAL + 1) * SECONDS_PER_DAY - 1
+
+
+@dataclass(frozen=True)
+class Epoch:
+    """Epoch a timestamp is counted from
+
+    Attributes:
+        name (str): name of the epoch
+        offset (int): seconds from the Unix epoch to the start of this epoch
+        units (int): number of timestamp units in a second
+    """
+
+    name: str
+    offset: int
+    units: int
+
+
+EPOCHS: dict[str, Epoch] = {
+    epoch.name: epoch
+    for epoch in (
+        # Seconds since 2001-01-01. Also called Mac absolute time.
+        Epoch("cocoa", 978_307_200, 1),
+        Epoch("unix", 0, 1),
+        Epoch("unix_ms", 0, 1_000),
+        Epoch("unix_us", 0, 1_000_000),
+        # Microseconds since 1601-01-01. Used by WebKit and Chrome.
+        Epoch("webkit", -11_644_473_600, 1_000_000),
+        # 100 nanosecond intervals since 1601-01-01
+        Epoch("filetime", -11_644_473_600, 10_000_000),
+    )
+}
+
+
+def get_epoch(epoch: str | Epoch) -> Epoch:
+    """Returns the epoch by name
+
+    Args:
+        epoch: name of the epoch or an :obj:`Epoch`
+
+    Returns:
+        Epoch: the epoch
+
+    Raises:
+        ValueError: If the epoch is unknown
+    """
+    if isinstance(epoch, Epoch):
+        return epoch
+
+    try:
+        return EPOCHS[epoch.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown epoch {repr(epoch)}! Choose from {', '.join(EPOCHS)}."
+        ) from None
+
+
+def convert_column(
+    values: t.Iterable[t.Any],
+    epoch: str | Epoch = "unix",
+    empty: t.Any = "",
+) -> list[t.Any]:
+    """Converts a column of epoch timestamps to "YYYY-MM-DD HH:MM:SS" strings (UTC)
+
+    Example:
+        >>> convert_column([0, 600000000, None], epoch="cocoa")
+        ['', '2020-01-06 10:40:00', '']
+
+    Args:
+        values: timestamps counted from `epoch`
+        epoch: name of the epoch. One of :const:`EPOCHS`. Defaults to "unix".
+        empty: value returned for null, zero or invalid timestamps. Defaults to "".
+
+    Returns:
+        Formatted timestamps in the same order as `values`
+    """
+    epoch = get_epoch(epoch)
+    if not isinstance(values, (list, tuple)):
+        values = list(values)
+
+    if np is not None:
+        return _convert_numpy(values, epoch, empty)
+    return _convert_python(values, epoch, empty)
+
+
+def from_cocoa(values: t.Iterable[t.Any], empty: t.Any = "") -> list[t.Any]:
+    """Converts Cocoa/Mac absolute time (seconds since 2001-01-01)"""
+    return convert_column(values, "cocoa", empty)
+
+
+def from_unix(values: t.Iterable[t.Any], empty: t.Any = "") -> list[t.Any]:
+    """Converts Unix time in seconds"""
+    return convert_column(values, "unix", empty)
+
+
+def from_unix_ms(values: t.Iterable[t.Any], empty: t.Any = "") -> list[t.Any]:
+    """Converts Unix time in milliseconds"""
+    return convert_column(values, "unix_ms", empty)
+
+
+def from_unix_us(values: t.Iterable[t.Any], empty: t.Any = "") -> list[t.Any]:
+    """Converts Unix time in microseconds"""
+    return convert_column(values, "unix_us", empty)
+
+
+def from_webkit(values: t.Iterable[t.Any], empty: t.Any = "") -> list[t.Any]:
+    """Converts WebKit/Chrome time (microseconds since 1601-01-01)"""
+    return convert_column(values, "webkit", empty)
+
+
+def from_filetime(values: t.Iterable[t.Any], empty: t.Any = "") -> list[t.Any]:
+    """Converts Windows FILETIME (100 nanosecond intervals since 1601-01-01)"""
+    return convert_column(values, "filetime", empty)
+
+
+def sql_to_timestamp(column: str, epoch: str | Epoch = "unix") -> str:
+    """Builds an SQLite expression converting an epoch column to a timestamp
+
+    Example:
+        >>> f"SELECT {sql_to_timestamp('ZSTARTDATE', 'cocoa')} FROM ZOBJECT"
+
+    Args:
+        column: column name or expression to convert
+        epoch: name of the epoch. One of :const:`EPOCHS`. Defaults to "unix".
+
+    Returns:
+        SQL expression returning "YYYY-MM-DD HH:MM:SS" or NULL for null or zero
+        timestamps
+    """
+    epoch = get_epoch(epoch)
+
+    seconds = f"CAST(({column}) AS INTEGER)"
+    if epoch.units != 1:
+        seconds = f"{seconds} / {epoch.units}"
+    if epoch.offset:
+        seconds = f"{seconds} + {epoch.offset}"
+
+    return f"CASE WHEN ({column}) > 0 THEN datetime({seconds}, 'unixepoch') END"
+
+
+def _convert_numpy(values: t.Sequence[t.Any], epoch: Epoch, empty: t.Any) -> list[t.Any]:
+    raw = np.asarray(values)
+    if raw.dtype.kind not in "iuf":
+        raw = np.asarray([_number(value) for value in values])
+        if raw.dtype.kind not in "iuf":
+            raw = raw.astype(np.float64)
+
+    # Integers are divided exactly. Large WebKit and FILETIME values lose
+    # sub-second precision as floats and would round up to the next second.
+    if raw.dtype.kind == "f":
+        seconds = np.floor(raw / epoch.units + epoch.offset)
+    else:
+        seconds = raw // epoch.units + epoch.offset
+    valid = (raw > 0) & (seconds >= MIN_SECONDS) & (seconds <= MAX_SECONDS)
+
+    formatted = np.datetime_as_string(
+        np.where(valid, seconds, 0).astype(np.int64).astype("datetime64[s]"),
+        unit="s",
+    ).astype("<U19")
+    # Replace the "T" between the date and time with a space in place
+    formatted.view(np.uint32).reshape(-1, 19)[:, 10] = ord(" ")
+
+    converted = formatted.tolist()
+    for idx in np.flatnonzero(~valid).tolist():
+        converted[idx] = empty
+    return converted
+
+
+def _convert_python(
+    values: t.Sequence[t.Any],
+    epoch: Epoch,
+    empty: t.Any,
+) -> list[t.Any]:
+    times = _times_of_day()
+    converted = []
+    for value in values:
+        value = _number(value)
+        if not value > 0:
+            converted.append(empty)
+            continue
+
+        seconds = int(value // epoch.units + epoch.offset)
+        if not MIN_SECONDS <= seconds <= MAX_SECONDS:
+            converted.append(empty)
+            continue
+
+        days, seconds = divmod(seconds, SECONDS_PER_DAY)
+        converted.append(f"{_format_day(days)} {times[seconds]}")
+    return converted
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_day(days: int) -> str:
+    return date.fromordinal(UNIX_EPOCH_ORDINAL + days).isoformat()
+
+
+@functools.lru_cache(maxsize=1)
+def _times_of_day() -> tuple[str, ...]:
+    return tuple(
+        f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        for hours in range(24)
+        for minutes in range(60)
+        for seconds in range(60)
+    )
+
+
+def _number(value: t.Any) -> int | float:
+    if isinstance(value, bool) or value is None:
+        return 0
+    if isinstance(value, int):
+        return value
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0
+    return value if math.isfinite(value) else 0
@@ -4,7 +4,6 @@
 
 import xleapp.globals as g
 
-from PIL import Image
 from xleapp.helpers.search import FileSeekerBase
 
 
@@ -46,6 +45,8 @@ def generate_thumbnail(
             f"{g.app.default_configs.get('MEDIA_ROOT')}/{image_directory}/{image_filename}",
         )
         if files:
+            from PIL import Image
+
             im = Image.open(files[0])
             im.thumbnail(g.app.default_configs.get("THUMB_SIZE"))
             im.save(os.path.join(report_folder, thumb_name))
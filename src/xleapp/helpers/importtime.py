@@ -0,0 +1,98 @@
+"""Import time profiling built on `python -X importtime`"""
+from __future__ import annotations
+
+import re
+import subprocess
+import sys
+import typing as t
+
+from dataclasses import dataclass
+
+
+IMPORT_TIME_LINE = re.compile(
+    r"^import time:\s+(?P<self>\d+)\s+\|\s+(?P<cumulative>\d+)\s+\|(?P<name>.*)$",
+)
+
+
+@dataclass(frozen=True)
+class ImportTime:
+    """Time spent importing a single module
+
+    Attributes:
+        module (str): name of the module
+        self_us (int): microseconds spent in the module itself
+        cumulative_us (int): microseconds including the module's own imports
+        depth (int): nesting level of the import. 0 is imported directly.
+    """
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportTime]:
+    """Parses the stderr output of `python -X importtime`
+
+    Args:
+        output: text written to stderr
+
+    Returns:
+        Import times in the order the imports finished
+    """
+    import_times = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+
+        name = match["name"]
+        module = name.lstrip()
+        import_times.append(
+            ImportTime(
+                module=module,
+                self_us=int(match["self"]),
+                cumulative_us=int(match["cumulative"]),
+                depth=(len(name) - len(module) - 1) // 2,
+            ),
+        )
+    return import_times
+
+
+def profile_imports(module: str = "xleapp.cli") -> list[ImportTime]:
+    """Imports a module in a fresh interpreter with `-X importtime`
+
+    Args:
+        module: module to import. Defaults to "xleapp.cli".
+
+    Returns:
+        Import times of every module imported along the way
+
+    Raises:
+        ImportError: If the module failed to import
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode:
+        raise ImportError(f"Importing {repr(module)} failed!\n{result.stderr}")
+    return parse_importtime(result.stderr)
+
+
+def slowest(
+    import_times: t.Iterable[ImportTime],
+    limit: int = 25,
+) -> list[ImportTime]:
+    """Returns the imports with the largest cumulative time
+
+    Args:
+        import_times: parsed import times
+        limit: number of imports to return. Defaults to 25.
+
+    Returns:
+        The slowest imports, slowest first
+    """
+    return sorted(import_times, key=lambda it: it.cumulative_us, reverse=True)[:limit]
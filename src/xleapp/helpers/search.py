@@ -2,6 +2,7 @@
 
 import abc
 import collections
+import contextlib
 import fnmatch
 import functools
 import io
@@ -14,8 +15,6 @@
 
 from zipfile import ZipFile
 
-import magic
-
 from xleapp.helpers import descriptors, strings, utils
 
 
@@ -87,6 +86,8 @@ def validator(self, value: t.Any) -> t.Any:
                 if value.is_dir():
                     return "dir", value
                 else:
+                    import magic
+
                     return magic.from_file(str(value), mime=True), value
             else:
                 raise FileNotFoundError(f"File/Folder {str(value)} not found!")
@@ -339,6 +340,21 @@ def clear(self) -> None:
         """Clears the list of file handles"""
         self.file_handles.clear()
 
+    def reset(self) -> None:
+        """Closes the extraction and forgets its files so another one can be searched"""
+        if "input_file" in self.__dict__:
+            self.cleanup()
+            del self.input_file
+
+        for handles in self.file_handles.values():
+            for handle in handles:
+                with contextlib.suppress(AttributeError):
+                    handle().close()
+
+        self._file_handles = FileHandles()
+        self._all_files = set()
+        self.__dict__.pop("validate", None)
+
     @functools.cached_property
     @abc.abstractmethod
     def validate(self) -> bool:
@@ -361,10 +377,10 @@ def build_files_list(self, folder):
 
         for root, sub_folders, fls in os.walk(folder):
             for folder in sub_folders:
-                folders.add(f"{root}\\{folder}")
+                folders.add(os.path.join(root, folder))
 
             for found_file in fls:
-                files.add(f"{root}\\{found_file}")
+                files.add(os.path.join(root, found_file))
 
         return folders | files
 
@@ -420,14 +436,15 @@ def build_files_list(self, folder=None) -> list[tarfile.TarInfo]:
 
     @functools.cached_property
     def validate(self) -> bool:
-        mime, _ = self.input_path
+        mime, input_path = self.input_path
         # "inode/blockdevice" seems to be the file magic number on some iOS tar
         # extractions could manually pull the magic numbers instead of this for
         # tar file.
         return mime in [
+            "application/gzip",
             "application/x-gzip",
             "application/x-tar",
-        ] or self.input_file.suffix in [".gz", ".tar", ".tar.gz"]
+        ] or input_path.suffix in [".gz", ".tar"]
 
     @property
     def priority(self) -> int:
@@ -527,6 +544,11 @@ def __call__(
             raise ValueError(extraction_type)
         return builder(directory_or_file=input_path, **kwargs)
 
+    def reset(self) -> None:
+        """Resets every search provider before searching another extraction"""
+        for builder in self.data.values():
+            builder.reset()
+
 
 search_providers = FileSearchProvider()
 search_providers.register_builder("FS", FileSeekerDir())
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import math
 import os
 import re
 import typing as t
 
-from datetime import datetime
+from datetime import datetime, timezone
 from functools import reduce
 from pathlib import Path
 
@@ -12,6 +13,7 @@
 
 
 LENGTH_OF_TIMESTAMP = 16
+MAX_EPOCH_SECONDS = 100_000_000_000
 
 
 class ParseError(Exception):
@@ -210,3 +212,41 @@ def time_factor_conversion(time_in_utc: str) -> str:
         time_in_utc = datetime.fromtimestamp(time_in_utc / time_factor)
         time_in_utc = str(time_in_utc)
     return time_in_utc
+
+
+def timestamp_to_epoch(timestamp: t.Any) -> int | None:
+    """Normalizes a report timestamp to seconds since the Unix epoch (UTC)
+
+    Timestamps in reports are mostly strings formatted by SQLite or
+    :func:`datetime.strftime` but can also be :obj:`datetime` objects or numbers.
+    Naive timestamps are treated as UTC. Numbers larger than
+    :const:`MAX_EPOCH_SECONDS` are treated as milliseconds, then microseconds.
+
+    Args:
+        timestamp: value from the timestamp column of a report
+
+    Returns:
+        Seconds since the Unix epoch or None if the value is not a timestamp.
+    """
+    if isinstance(timestamp, bool) or timestamp in (None, ""):
+        return None
+
+    if isinstance(timestamp, (int, float)):
+        if not math.isfinite(timestamp):
+            return None
+        while abs(timestamp) >= MAX_EPOCH_SECONDS:
+            timestamp = timestamp / 1000
+        return int(timestamp)
+
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.fromisoformat(timestamp.strip())
+        except ValueError:
+            return None
+
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return int(timestamp.timestamp())
+
+    return None
@@ -1,7 +1,12 @@
+import atexit
+import contextlib
+import copy
 import importlib.util
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
 import typing as t
 
 from pathlib import Path
@@ -15,6 +20,9 @@
 StrPath = t.Union[str, os.PathLike[str]]
 
 MIN_ERROR_LEVEL = 20
+INDENT = "    "
+# Most records written by the logging thread before flushing its files
+BATCH_SIZE = 1_000
 
 
 class ProcessFileFilter(logging.Filter):
@@ -32,14 +40,48 @@ def filter(self, record):
         return g.app.debug
 
 
-class StreamHandler(logging.StreamHandler):
-    def emit(self, record: logging.LogRecord):
-        if record.msg.startswith("->"):
-            record.msg = f"    {record.msg}"
-        logging.StreamHandler.emit(self, record)
+class IndentFormatter(logging.Formatter):
+    """Indents messages starting with "->" to nest them under the previous message
+
+    The record is copied before indenting so other handlers see the original
+    message.
+    """
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        if record.message.startswith("->"):
+            record = copy.copy(record)
+            record.message = f"{INDENT}{record.message}"
+        return super().formatMessage(record)
+
+
+class BatchedHandlerMixin:
+    """Skips flushing after every record while a batch is written
+
+    :class:`QueueListener` writes records in batches and flushes once at the end
+    of each batch.
+    """
 
+    _batched: bool = False
 
-class FileHandler(logging.FileHandler):
+    def flush(self) -> None:
+        if not self._batched:
+            super().flush()  # type: ignore[misc]
+
+    @contextlib.contextmanager
+    def batch(self) -> t.Iterator[None]:
+        self._batched = True
+        try:
+            yield
+        finally:
+            self._batched = False
+            self.flush()
+
+
+class StreamHandler(BatchedHandlerMixin, logging.StreamHandler):
+    pass
+
+
+class FileHandler(BatchedHandlerMixin, logging.FileHandler):
     def __init__(
         self,
         filename: StrPath,
@@ -56,13 +98,8 @@ def __init__(
             errors=errors,
         )
 
-    def emit(self, record: logging.LogRecord):
-        if record.msg.startswith("->"):
-            record.msg = f"    {record.msg}"
-        logging.FileHandler.emit(self, record)
-
 
-class FileHandlerWithHeader(logging.FileHandler):
+class FileHandlerWithHeader(BatchedHandlerMixin, logging.FileHandler):
     def __init__(self, filename, header, mode="a", encoding=None, delay=0):
         self.header = header
         self.file_pre_exists = Path(filename)
@@ -76,13 +113,141 @@ def emit(self, record: logging.LogRecord):
             if not self.file_pre_exists:
                 self.stream.write(f"{self.header}\n")
 
-        message = record.msg
-        if message.startswith("->"):
-            message = f"    {message}"
-        record.msg = message
         logging.FileHandler.emit(self, record)
 
 
+class QueueHandler(logging.handlers.QueueHandler):
+    """Puts records on the logging queue for the handlers of one logger
+
+    Args:
+        queue: queue read by :class:`QueueListener`
+        route: name of the logger whose handlers write the record
+    """
+
+    def __init__(self, queue: t.Any, route: str) -> None:
+        super().__init__(queue)
+        self.route = route
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = super().prepare(record)
+        record.route = self.route
+        return record
+
+
+class QueueListener(logging.handlers.QueueListener):
+    """Writes queued records in batches from a background thread
+
+    Each record is written by the handlers of the logger it was logged to. Up to
+    `batch_size` records waiting on the queue are written before the handlers are
+    flushed.
+
+    Args:
+        queue: queue the :class:`QueueHandler` of each logger puts records on
+        routes: handlers of each logger by logger name
+        batch_size: most records written before flushing. Defaults to
+            :const:`BATCH_SIZE`.
+    """
+
+    def __init__(
+        self,
+        queue: t.Any,
+        routes: dict[str, list[logging.Handler]],
+        batch_size: int = BATCH_SIZE,
+    ) -> None:
+        handlers = {
+            id(handler): handler for route in routes.values() for handler in route
+        }
+        super().__init__(queue, *handlers.values(), respect_handler_level=True)
+        self.routes = routes
+        self.batch_size = batch_size
+
+    def handle(self, record: logging.LogRecord) -> None:
+        for handler in self.routes.get(getattr(record, "route", ""), self.handlers):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def handle_batch(self, records: list[logging.LogRecord]) -> None:
+        with contextlib.ExitStack() as stack:
+            for handler in self.handlers:
+                if isinstance(handler, BatchedHandlerMixin):
+                    stack.enter_context(handler.batch())
+            for record in records:
+                self.handle(record)
+
+    def _monitor(self) -> None:
+        has_task_done = hasattr(self.queue, "task_done")
+        stopped = False
+        while not stopped:
+            records = [self.dequeue(True)]
+            while len(records) < self.batch_size:
+                try:
+                    records.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+            stopped = self._sentinel in records
+            self.handle_batch(
+                [record for record in records if record is not self._sentinel],
+            )
+            if has_task_done:
+                for _ in records:
+                    self.queue.task_done()
+
+    def stop(self) -> None:
+        """Writes the records left on the queue and gives the loggers their
+        handlers back"""
+        super().stop()
+        for name, handlers in self.routes.items():
+            logging.getLogger(name or None).handlers = handlers
+
+
+listener: t.Optional[QueueListener] = None
+
+
+def queue_loggers(
+    names: t.Iterable[str],
+    log_queue: t.Optional[t.Any] = None,
+    batch_size: int = BATCH_SIZE,
+) -> QueueListener:
+    """Moves the handlers of loggers behind a queue written by a background thread
+
+    Logging then only puts the record on the queue so threads processing
+    artifacts never wait on writing logs.
+
+    Args:
+        names: names of the loggers. "" is the root logger.
+        log_queue: queue to use. Defaults to a new :class:`queue.SimpleQueue`.
+        batch_size: most records written before flushing. Defaults to
+            :const:`BATCH_SIZE`.
+
+    Returns:
+        QueueListener: the started listener. Stop it with :func:`shutdown`.
+    """
+    global listener
+    shutdown()
+
+    if log_queue is None:
+        log_queue = queue.SimpleQueue()
+
+    routes: dict[str, list[logging.Handler]] = {}
+    for name in names:
+        logger = logging.getLogger(name or None)
+        if logger.handlers:
+            routes[name] = list(logger.handlers)
+            logger.handlers = [QueueHandler(log_queue, name)]
+
+    listener = QueueListener(log_queue, routes, batch_size)
+    listener.start()
+    return listener
+
+
+def shutdown() -> None:
+    """Writes the queued records and stops the logging thread"""
+    global listener
+    if listener is not None:
+        listener.stop()
+        listener = None
+
+
 def init() -> None:
     mod = importlib.util.find_spec(__name__)
 
@@ -119,9 +284,14 @@ def init() -> None:
             g.app.log_folder / debug_log_file
         )
 
+        shutdown()
         logging.config.dictConfig(config)
+        queue_loggers(["", *config["loggers"]])
     else:
         raise FileNotFoundError(
             "Package found! Missing 'log_config.yaml' to "
             "configure logging! Reinstall package.",
         )
+
+
+atexit.register(shutdown)
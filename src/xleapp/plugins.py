@@ -2,8 +2,16 @@
 
 import abc
 import importlib
+import pathlib
 import typing as t
 
+from .artifact.manifest import (
+    LazyArtifact,
+    Manifest,
+    ManifestEntry,
+    default_manifest_folder,
+    fingerprint,
+)
 from .helpers.search import FileSeekerBase, search_providers
 
 
@@ -12,15 +20,86 @@
 
 
 class Plugin(abc.ABC):
+    """Base class for plugins installing artifacts
+
+    Artifacts are registered from a cached :class:`Manifest` so their modules
+    are only imported when they are needed. The manifest is rebuilt by importing
+    every module whenever a module of the plugin changes.
+
+    Attributes:
+        manifest_folder (Path): folder to cache the manifest in. Defaults to
+            :func:`default_manifest_folder`.
+    """
+
     _plugins: list[Artifact]
+    manifest_folder: t.Optional[pathlib.Path] = None
 
     def __init__(self) -> None:
         self._plugins: list = []
 
-        for it in self.folder.glob("*.py"):
-            if it.suffix == ".py" and it.stem not in ["__init__"]:
-                module_name = f'{".".join(self.folder.parts[-3:])}.{it.stem}'
-                importlib.import_module(module_name)
+        modules = {
+            f'{".".join(self.folder.parts[-3:])}.{it.stem}': it
+            for it in self.folder.glob("*.py")
+            if it.suffix == ".py" and it.stem not in ["__init__"]
+        }
+        manifest_file = (
+            self.manifest_folder or default_manifest_folder()
+        ) / f"{type(self).__module__}.{type(self).__name__}.json"
+        modules_fingerprint = fingerprint(modules.values())
+
+        manifest = Manifest.load(manifest_file, modules_fingerprint)
+        if manifest is None:
+            manifest = self.build_manifest(manifest_file, modules_fingerprint, modules)
+            manifest.save()
+        else:
+            self.register_manifest(manifest)
+
+    def build_manifest(
+        self,
+        manifest_file: pathlib.Path,
+        modules_fingerprint: str,
+        modules: t.Iterable[str],
+    ) -> Manifest:
+        """Imports every artifact module and records the registered artifacts
+
+        Args:
+            manifest_file: location of the cached manifest
+            modules_fingerprint: fingerprint of the modules
+            modules: names of the artifact modules
+
+        Returns:
+            Manifest: manifest of the plugin's artifacts
+        """
+        from xleapp import app
+
+        modules = set(modules)
+        for module_name in sorted(modules):
+            importlib.import_module(module_name)
+
+        return Manifest(
+            manifest_file,
+            modules_fingerprint,
+            (
+                ManifestEntry.from_artifact(artifact)
+                for artifact in app.__ARTIFACT_PLUGINS__
+                if type(artifact).__module__ in modules
+            ),
+        )
+
+    def register_manifest(self, manifest: Manifest) -> None:
+        """Registers a stand-in for each artifact in the manifest
+
+        Args:
+            manifest: manifest of the plugin's artifacts
+        """
+        from xleapp import app
+
+        for entry in manifest:
+            try:
+                app.__ARTIFACT_PLUGINS__[entry.name] = LazyArtifact(entry)
+            except ValueError:
+                # Already imported by another plugin or an earlier load
+                continue
 
     @property
     def plugins(self) -> list[Artifact]:
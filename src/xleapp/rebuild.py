@@ -0,0 +1,166 @@
+"""Generates the reports of an existing report folder again
+
+Every run saves the rows, headers and state of its artifacts to the case database
+of the report folder. The HTML pages, TSV, KML and timeline exports are generated
+again from the case database, so a changed template or a new export format does
+not need the artifacts to be processed again. The extraction is never opened.
+
+HTML pages and TSV files are written for each artifact, so they are split between
+worker processes. KML and timeline exports are written to shared databases by the
+main process while the workers run.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import pathlib
+import time
+import typing as t
+
+import xleapp.globals as g
+
+from xleapp import templating
+from xleapp.app import REPORT_FORMATS, Application
+from xleapp.batch import init_worker
+
+
+logger_log = logging.getLogger("xleapp.logfile")
+
+# Written to a file for each artifact and split between workers
+ARTIFACT_FORMATS = ("html", "tsv")
+
+
+def open_report(
+    report_folder: pathlib.Path,
+    tsv_compression: t.Optional[str] = None,
+) -> Application:
+    """Creates an application with the artifacts of a report folder restored
+
+    Args:
+        report_folder: report folder of an earlier run
+        tsv_compression: compression of TSV exports. Defaults to the compression
+            of the earlier run.
+
+    Returns:
+        Application: application of the report. Set it as
+            :data:`xleapp.globals.app` before reporting.
+
+    Raises:
+        FileNotFoundError: If the report folder has no saved artifacts
+    """
+    application = Application()
+    application.tsv_compression = tsv_compression
+    with g.use_app(application):
+        application.open_report(report_folder)
+    return application
+
+
+def artifact_names(
+    application: Application,
+    names: t.Collection[str] = (),
+) -> list[str]:
+    """Returns the names of the saved artifacts to report
+
+    Args:
+        application: application from :func:`open_report`
+        names: names or class names of artifacts. Defaults to every artifact of
+            the report.
+
+    Raises:
+        ValueError: If an artifact is not in the report
+    """
+    saved = [artifact.name for artifact in application.artifacts.selected()]
+    if not names:
+        return saved
+
+    selected = []
+    for name in names:
+        try:
+            artifact_name = application.artifacts[name].name
+        except ValueError:
+            artifact_name = None
+        if artifact_name not in saved:
+            raise ValueError(f"Artifact {name!r} is not in the report!")
+        selected.append(artifact_name)
+    return selected
+
+
+def report_artifacts(
+    report_folder: pathlib.Path,
+    names: t.Collection[str],
+    formats: t.Collection[str],
+    tsv_compression: t.Optional[str] = None,
+) -> None:
+    """Writes the HTML pages and TSV files of artifacts in a worker process
+
+    Args:
+        report_folder: report folder of an earlier run
+        names: artifacts to report
+        formats: any of :const:`ARTIFACT_FORMATS`
+        tsv_compression: compression of TSV exports. Defaults to None.
+    """
+    application = open_report(report_folder, tsv_compression)
+    with g.use_app(application):
+        for name in names:
+            application.generate_report(application.artifacts[name], formats)
+
+
+def rebuild(
+    application: Application,
+    names: t.Collection[str] = (),
+    formats: t.Collection[str] = REPORT_FORMATS,
+    max_workers: int = 1,
+) -> None:
+    """Generates the reports of a report folder again
+
+    The index page is written with the HTML pages.
+
+    Args:
+        application: application from :func:`open_report`, set as
+            :data:`xleapp.globals.app`
+        names: artifacts to report. Defaults to every artifact of the report.
+        formats: report files to write, any of :const:`REPORT_FORMATS`. Defaults
+            to all of them.
+        max_workers: processes writing HTML pages and TSV files. With 1 every file
+            is written by this process. Defaults to 1.
+
+    Raises:
+        ValueError: If an artifact is not in the report
+    """
+    start_time = time.perf_counter()
+    selected = artifact_names(application, names)
+    application.dbservice.clear(selected, formats)
+
+    worker_formats = [name for name in formats if name in ARTIFACT_FORMATS]
+    if max_workers == 1 or not worker_formats:
+        application.generate_reports(formats, names=selected)
+    else:
+        chunks = [selected[idx::max_workers] for idx in range(max_workers)]
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=init_worker,
+        ) as executor:
+            futures = [
+                executor.submit(
+                    report_artifacts,
+                    application.report_folder,
+                    chunk,
+                    worker_formats,
+                    application.tsv_compression,
+                )
+                for chunk in chunks
+                if chunk
+            ]
+            application.generate_reports(
+                [name for name in formats if name not in ARTIFACT_FORMATS],
+                names=selected,
+            )
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+
+    if "html" in formats:
+        templating.generate_index(application)
+    logger_log.info(
+        f"Generated reports of {len(selected)} artifacts again in "
+        f"{time.perf_counter() - start_time:.2f}s",
+    )
@@ -3,19 +3,69 @@
 from __future__ import annotations
 
 import abc
-import codecs
+import ast
+import collections.abc
 import contextlib
 import csv
+import gzip
+import io
+import itertools
+import json
+import logging
 import pathlib
 import sqlite3
 import typing as t
 
 from dataclasses import dataclass
 
-import simplekml
-
 from xleapp.helpers import descriptors, utils
 
+from . import kml, timeline
+
+
+logger_log = logging.getLogger("xleapp.logfile")
+
+
+BATCH_SIZE = 10_000
+TSV_BUFFER_SIZE = 1024 * 1024
+TSV_SUFFIXES = {None: ".tsv", "gzip": ".tsv.gz", "zstd": ".tsv.zst"}
+CASE_DB = "_case.db"
+SQLITE_MAX_INT = 2**63 - 1
+SQLITE_MIN_INT = -(2**63)
+
+# Report databases are rebuilt from the evidence on every run. Losing one to a
+# crash only means re-running, so trade durability for bulk insert speed.
+BULK_INSERT_PRAGMAS = (
+    "PRAGMA journal_mode = MEMORY",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+)
+# The case database also holds the checkpoint used to resume a run that stopped,
+# so it keeps its rollback journal on disk and syncs every commit to survive a
+# crash or a power loss.
+CASE_PRAGMAS = (
+    "PRAGMA journal_mode = TRUNCATE",
+    "PRAGMA synchronous = FULL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+)
+
+
+def batched(iterable: t.Iterable[t.Any], size: int = BATCH_SIZE) -> t.Iterator[list]:
+    """Splits an iterable into lists of at most `size` items
+
+    Args:
+        iterable: items to split
+        size: number of items in each batch. Defaults to :const:`BATCH_SIZE`.
+
+    Yields:
+        list: next batch of items
+    """
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
 
 class DatabaseError(Exception):
     def __init__(self, message: str) -> None:
@@ -51,7 +101,7 @@ def validator(self, value) -> pathlib.Path | None:
 
 
 class DBManager(contextlib.AbstractContextManager):
-    connection: t.Union[sqlite3.Connection, codecs.StreamReaderWriter]
+    connection: t.Union[sqlite3.Connection, t.TextIO]
     db_file: DBFile = DBFile()
     db_folder: pathlib.Path = None
 
@@ -108,34 +158,188 @@ def create(self) -> None:
                 CREATE TABLE data(key TEXT, latitude TEXT, longitude TEXT, activity TEXT)
                 """,
             )
+            try:
+                cursor.execute(
+                    """
+                    CREATE VIRTUAL TABLE data_rtree USING rtree(
+                        id, min_latitude, max_latitude, min_longitude, max_longitude
+                    )
+                    """,
+                )
+            except sqlite3.OperationalError as err:
+                logger_log.warning(f"-> Spatial index not created for KML data: {err}")
             db.commit()
 
+    @property
+    def has_spatial_index(self) -> bool:
+        with self as db:
+            return bool(
+                db.connection.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'data_rtree'",
+                ).fetchone(),
+            )
+
     def save(self, data_headers, data_list, name) -> None:
-        kml = simplekml.Kml(open=1)
+        headers = [header.lower() for header in data_headers]
+        time_idx = headers.index("timestamp")
+        lat_idx = headers.index("latitude")
+        lon_idx = headers.index("longitude")
+        spatial_index = self.has_spatial_index
+
+        with (
+            self as db,
+            kml.KmlWriter(self.db_folder / f"{name}.kml") as kml_file,
+        ):
+            for pragma in BULK_INSERT_PRAGMAS:
+                db.connection.execute(pragma)
+
+            (next_id,) = db.connection.execute(
+                "SELECT coalesce(max(rowid), 0) + 1 FROM data",
+            ).fetchone()
+
+            points = (
+                (row[time_idx], row[lat_idx], row[lon_idx])
+                for row in data_list
+                if row[lat_idx]
+            )
+            for batch in batched(points):
+                ids = range(next_id, next_id + len(batch))
+                next_id += len(batch)
+
+                db.connection.executemany(
+                    "INSERT INTO data(rowid, key, latitude, longitude, activity) "
+                    "VALUES(?,?,?,?,?)",
+                    [
+                        (idx, times, lat, lon, name)
+                        for idx, (times, lat, lon) in zip(ids, batch)
+                    ],
+                )
+                if spatial_index:
+                    db.connection.executemany(
+                        "INSERT INTO data_rtree VALUES(?,?,?,?,?)",
+                        _coordinates(ids, batch),
+                    )
+
+                for times, lat, lon in batch:
+                    kml_file.add_point(
+                        name=times,
+                        description=f"Timestamp: {times} - {name}",
+                        latitude=lat,
+                        longitude=lon,
+                    )
+
+    def copy_from(self, db_file: pathlib.Path, names: t.Collection[str]) -> None:
+        """Copies the points of artifacts from the KML database of another report
+
+        Args:
+            db_file: `_latlong.db` of the other report
+            names: artifacts to copy
+        """
+        spatial_index = self.has_spatial_index
 
         with self as db:
-            db.connection.execute("""PRAGMA synchronous = EXTRA""")
-            db.connection.execute("""PRAGMA journal_mode = WAL""")
-            db.connection.commit()
-
-            for row in data_list:
-                modified_dict = dict(zip(data_headers, row, strict=True))
-                times = modified_dict["Timestamp"]
-                lon = modified_dict["Longitude"]
-                lat = modified_dict["Latitude"]
-
-                if lat:
-                    pnt = kml.newpoint()
-                    pnt.name = times
-                    pnt.description = f"Timestamp: {times} - {name}"
-                    pnt.coords = [(lon, lat)]
+            for pragma in BULK_INSERT_PRAGMAS:
+                db.connection.execute(pragma)
+            (next_id,) = db.connection.execute(
+                "SELECT coalesce(max(rowid), 0) + 1 FROM data",
+            ).fetchone()
+
+            with _attach(db.connection, db_file) as other:
+                cursor = db.connection.execute(
+                    f"SELECT key, latitude, longitude, activity FROM {other}.data "
+                    "ORDER BY rowid",
+                )
+                while batch := cursor.fetchmany(BATCH_SIZE):
+                    batch = [row for row in batch if row["activity"] in names]
+                    ids = range(next_id, next_id + len(batch))
+                    next_id += len(batch)
+
+                    db.connection.executemany(
+                        "INSERT INTO data(rowid, key, latitude, longitude, activity) "
+                        "VALUES(?,?,?,?,?)",
+                        [(idx, *row) for idx, row in zip(ids, batch)],
+                    )
+                    if spatial_index:
+                        db.connection.executemany(
+                            "INSERT INTO data_rtree VALUES(?,?,?,?,?)",
+                            _coordinates(ids, [tuple(row)[:3] for row in batch]),
+                        )
 
+    def delete(self, names: t.Collection[str]) -> None:
+        """Deletes the points and KML files of artifacts so they can be saved again
+
+        Args:
+            names: artifacts to delete
+        """
+        spatial_index = self.has_spatial_index
+
+        with self as db:
+            for name in names:
+                if spatial_index:
                     db.connection.execute(
-                        "INSERT INTO data VALUES(?,?,?,?)",
-                        (times, lat, lon, name),
+                        "DELETE FROM data_rtree WHERE id IN "
+                        "(SELECT rowid FROM data WHERE activity = ?)",
+                        (name,),
                     )
+                db.connection.execute("DELETE FROM data WHERE activity = ?", (name,))
+                (self.db_folder / f"{name}.kml").unlink(missing_ok=True)
+
+    def within(
+        self,
+        min_latitude: float,
+        min_longitude: float,
+        max_latitude: float,
+        max_longitude: float,
+    ) -> list[sqlite3.Row]:
+        """Returns the points of every artifact inside a bounding box
+
+        Args:
+            min_latitude: southern edge of the box
+            min_longitude: western edge of the box
+            max_latitude: northern edge of the box
+            max_longitude: eastern edge of the box
+
+        Returns:
+            Rows of the `data` table inside the bounding box
+        """
+        with self as db:
+            return db.connection.execute(
+                """
+                SELECT data.* FROM data_rtree
+                JOIN data ON data.rowid = data_rtree.id
+                WHERE data_rtree.min_latitude >= ? AND data_rtree.max_latitude <= ?
+                AND data_rtree.min_longitude >= ? AND data_rtree.max_longitude <= ?
+                """,
+                (min_latitude, max_latitude, min_longitude, max_longitude),
+            ).fetchall()
+
+
+def _coordinates(
+    ids: t.Iterable[int],
+    points: t.Iterable[tuple[t.Any, t.Any, t.Any]],
+) -> t.Iterator[tuple[int, float, float, float, float]]:
+    for idx, (_, lat, lon) in zip(ids, points):
+        try:
+            lat, lon = float(lat), float(lon)
+        except (TypeError, ValueError):
+            continue
+        yield idx, lat, lat, lon, lon
+
+
+@contextlib.contextmanager
+def _attach(connection: sqlite3.Connection, db_file: pathlib.Path) -> t.Iterator[str]:
+    """Attaches another database to a connection while the block runs
 
-            kml.save(db.db_folder / f"{name}.kml")
+    Yields:
+        The schema name of the attached database
+    """
+    connection.commit()
+    connection.execute("ATTACH DATABASE ? AS other", (str(db_file),))
+    try:
+        yield "other"
+    finally:
+        connection.commit()
+        connection.execute("DETACH DATABASE other")
 
 
 class TimelineDBManager(DBManager):
@@ -144,6 +348,7 @@ def __init__(self, report_folder: pathlib.Path) -> None:
 
         super().__init__(db_folder=report_folder / db_folder)
         self.db_file = report_folder / db_folder / "t1.db"
+        self.merger = timeline.TimelineMerger(self.db_folder / "runs")
         self.create()
 
     def create(self) -> None:
@@ -152,70 +357,528 @@ def create(self) -> None:
             cursor = db.cursor()
             cursor.execute(
                 """
-                CREATE TABLE data(key TEXT, activity TEXT, datalist TEXT)
+                CREATE TABLE data(
+                    key TEXT, activity TEXT, datalist TEXT, epoch INTEGER
+                )
                 """,
             )
+            cursor.execute("CREATE INDEX data_epoch ON data(epoch)")
+            cursor.execute("CREATE INDEX data_activity_epoch ON data(activity, epoch)")
             db.commit()
 
     def save(self, data_headers, data_list, name) -> None:
+        events = timeline.events_from_rows(name, data_headers, data_list)
+
         with self as db:
-            db.connection.execute("""PRAGMA synchronous = EXTRA""")
-            db.connection.execute("""PRAGMA journal_mode = WAL""")
+            for pragma in BULK_INSERT_PRAGMAS:
+                db.connection.execute(pragma)
 
-            for row in data_list:
-                modified_list = list(
-                    map(lambda x, y: x.upper() + ": " + str(y), data_headers, row),
-                )
+            for batch in batched(events):
                 db.connection.executemany(
-                    "INSERT INTO data VALUES(?,?,?)",
-                    [(str(row[0]), name.upper(), str(modified_list))],
+                    "INSERT INTO data VALUES(?,?,?,?)",
+                    [
+                        (event.timestamp, event.activity, str(event.data), event.epoch)
+                        for event in batch
+                    ],
+                )
+                self.merger.add(batch)
+
+    def copy_from(self, db_file: pathlib.Path, names: t.Collection[str]) -> None:
+        """Copies the events of artifacts from the timeline database of another report
+
+        Args:
+            db_file: `t1.db` of the other report
+            names: artifacts to copy
+        """
+        activities = {name.upper() for name in names}
+
+        with self as db:
+            for pragma in BULK_INSERT_PRAGMAS:
+                db.connection.execute(pragma)
+
+            with _attach(db.connection, db_file) as other:
+                cursor = db.connection.execute(
+                    f"SELECT key, activity, datalist, epoch FROM {other}.data "
+                    "ORDER BY rowid",
                 )
+                while batch := cursor.fetchmany(BATCH_SIZE):
+                    batch = [row for row in batch if row["activity"] in activities]
+                    db.connection.executemany(
+                        "INSERT INTO data VALUES(?,?,?,?)",
+                        [tuple(row) for row in batch],
+                    )
+                    self.merger.add(_timeline_events(batch))
+
+    def delete(self, names: t.Collection[str]) -> None:
+        """Deletes the events of artifacts so they can be saved again
+
+        Args:
+            names: artifacts to delete
+        """
+        with self as db:
+            db.connection.executemany(
+                "DELETE FROM data WHERE activity = ?",
+                [(name.upper(),) for name in names],
+            )
+
+    def load(self, exclude: t.Collection[str] = ()) -> None:
+        """Adds the saved events of artifacts to the merged timeline
+
+        Events saved in this process are already added, so artifacts saved again
+        are excluded.
+
+        Args:
+            exclude: artifacts not to add. Defaults to none.
+        """
+        activities = {name.upper() for name in exclude}
+
+        with self as db:
+            cursor = db.connection.execute(
+                "SELECT key, activity, datalist, epoch FROM data ORDER BY rowid",
+            )
+            while batch := cursor.fetchmany(BATCH_SIZE):
+                self.merger.add(
+                    _timeline_events(
+                        row for row in batch if row["activity"] not in activities
+                    ),
+                )
+
+    def merge(self) -> t.Iterator[timeline.TimelineEvent]:
+        """Merges the events of every saved artifact in time order
+
+        The merged timeline is exported to `timeline.tsv` and `timeline.jsonl`
+        as the events are read.
+
+        Returns:
+            Iterator of :obj:`TimelineEvent` in time order
+        """
+        return timeline.export_events(
+            self.merger.merge(),
+            tsv_file=self.db_folder / "timeline.tsv",
+            jsonl_file=self.db_folder / "timeline.jsonl",
+        )
+
+
+def _timeline_events(rows: t.Iterable[sqlite3.Row]) -> list[timeline.TimelineEvent]:
+    return [
+        timeline.TimelineEvent(
+            epoch=row["epoch"],
+            timestamp=row["key"],
+            activity=row["activity"],
+            data=ast.literal_eval(row["datalist"]),
+        )
+        for row in rows
+    ]
 
 
 class TsvManager(DBManager):
-    def __init__(self, report_folder: pathlib.Path) -> None:
+    """Exports artifact data to TSV files
+
+    Args:
+        report_folder: location of the report
+        compression: compress the TSV files with "gzip" or "zstd". Defaults to no
+            compression. "zstd" requires the optional `zstandard` package.
+
+    Raises:
+        DatabaseError: If the compression is not supported
+    """
+
+    def __init__(
+        self,
+        report_folder: pathlib.Path,
+        compression: t.Optional[str] = None,
+    ) -> None:
         db_folder: str = "_TSV Exports"
 
+        if compression not in TSV_SUFFIXES:
+            raise DatabaseError(
+                f"TSV compression {repr(compression)} is not one of: "
+                f"{', '.join(str(option) for option in TSV_SUFFIXES)}!"
+            )
+        self.compression = compression
+
         super().__init__(db_folder=report_folder / db_folder)
 
     def __call__(self, name: str):
-        self.db_file = self.db_folder / f"{name}.tsv"
+        self.db_file = self.db_folder / f"{name}{TSV_SUFFIXES[self.compression]}"
         return self
 
     def create(self) -> None:
         pass
 
-    def __enter__(self) -> codecs.StreamReaderWriter:
-        self.connection = codecs.open(self.db_file, "a", "utf-8-sig")
+    def delete(self, names: t.Collection[str]) -> None:
+        """Deletes the TSV files of artifacts, whatever their compression
+
+        Args:
+            names: artifacts to delete
+        """
+        for name, suffix in itertools.product(names, TSV_SUFFIXES.values()):
+            (self.db_folder / f"{name}{suffix}").unlink(missing_ok=True)
+
+    def __enter__(self) -> t.TextIO:
+        self.connection = self._open()
         return self.connection
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self.connection.close()
 
+    def _open(self) -> t.TextIO:
+        options: dict[str, t.Any] = {"encoding": "utf-8-sig", "newline": ""}
+
+        if self.compression == "gzip":
+            return gzip.open(self.db_file, "at", **options)
+
+        if self.compression == "zstd":
+            try:
+                import zstandard
+            except ImportError as err:
+                raise DatabaseError(
+                    "TSV compression 'zstd' requires the 'zstandard' package!"
+                ) from err
+
+            stream = zstandard.ZstdCompressor().stream_writer(
+                open(self.db_file, "ab"),
+                closefd=True,
+            )
+            return io.TextIOWrapper(
+                io.BufferedWriter(stream, buffer_size=TSV_BUFFER_SIZE),
+                **options,
+            )
+
+        return open(self.db_file, "a", buffering=TSV_BUFFER_SIZE, **options)
+
     def save(self, name, data_headers, data_list) -> None:
+        """Saves rows to the TSV file
+
+        Args:
+            name (str): name of the TSV file
+            data_headers: list of columns headers
+            data_list: rows to save. Any iterable of rows can be used so rows can
+                be streamed to disk.
+        """
         with self as file:
             tsv_writer = csv.writer(file, delimiter="\t")
             tsv_writer.writerow(data_headers)
-            for i in data_list:
-                tsv_writer.writerow(i)
+            for batch in batched(data_list):
+                tsv_writer.writerows(batch)
+
+
+class CaseTable(collections.abc.Sequence):
+    """Read only view of a table of artifact rows saved in the case database
+
+    Rows are streamed from the database in batches so the table can be iterated
+    any number of times without being held in memory.
+
+    Args:
+        db_file: location of the case database
+        table_id: id of the table in the case database
+        headers: report headers of the table
+        num_of_rows: number of rows in the table
+    """
+
+    def __init__(
+        self,
+        db_file: pathlib.Path,
+        table_id: int,
+        headers: tuple[str, ...],
+        num_of_rows: int,
+    ) -> None:
+        self.db_file = db_file
+        self.table_id = table_id
+        self.headers = headers
+        self.num_of_rows = num_of_rows
+
+    def __len__(self) -> int:
+        return self.num_of_rows
+
+    def __repr__(self) -> str:
+        return (
+            f"<CaseTable table_id={repr(self.table_id)}, headers={repr(self.headers)}, "
+            f"num_of_rows={repr(self.num_of_rows)}>"
+        )
+
+    def __iter__(self) -> t.Iterator[tuple]:
+        yield from self._select()
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(f"{repr(self)} index out of range!")
+        return next(self._select(f"LIMIT 1 OFFSET {int(idx)}"))
+
+    def _select(self, clause: str = "") -> t.Iterator[tuple]:
+        connection = sqlite3.connect(self.db_file)
+        try:
+            cursor = connection.execute(
+                f"SELECT * FROM rows_{self.table_id} ORDER BY rowid {clause}",
+            )
+            while batch := cursor.fetchmany(BATCH_SIZE):
+                for width, *row in batch:
+                    yield tuple(row[:width])
+        finally:
+            connection.close()
+
+
+class CaseDBManager(DBManager):
+    """Saves the rows of every artifact once to a single case database
+
+    Each table of an artifact is saved to its own SQLite table with a column for
+    each report header. Values keep their SQLite type (integer, real, text, blob
+    or null). Anything else is saved as text.
+
+    Reports (HTML, TSV, KML and timeline) are generated by reading the rows back
+    with :obj:`CaseTable`.
+
+    The database is also the checkpoint of the run. The state of each artifact is
+    saved with its rows as soon as it is processed, along with values of the run
+    such as the device information, so a run that stopped can be resumed.
+    """
+
+    def __init__(self, report_folder: pathlib.Path) -> None:
+        super().__init__(db_folder=report_folder)
+        self.db_file = report_folder / CASE_DB
+
+    def create(self) -> None:
+        if not self.db_file.exists():
+            db = sqlite3.connect(self.db_file, isolation_level="exclusive")
+            cursor = db.cursor()
+            cursor.execute(
+                """
+                CREATE TABLE tables(
+                    id INTEGER PRIMARY KEY, artifact TEXT, idx INTEGER,
+                    headers TEXT, num_of_rows INTEGER, UNIQUE(artifact, idx)
+                )
+                """,
+            )
+            cursor.execute(
+                "CREATE TABLE checkpoints(artifact TEXT PRIMARY KEY, state TEXT)",
+            )
+            cursor.execute("CREATE TABLE run(key TEXT PRIMARY KEY, value TEXT)")
+            db.commit()
+
+    def save(
+        self,
+        data_headers,
+        data_list,
+        name,
+        state: t.Optional[dict[str, t.Any]] = None,
+    ) -> None:
+        """Saves the tables of an artifact, replacing any saved before
+
+        Args:
+            data_headers: headers of the table or a list of headers for each table
+            data_list: rows of the table or a list of rows for each table
+            name: name of the artifact
+            state: checkpoint of the artifact saved in the same transaction as the
+                rows. Defaults to None.
+        """
+        if isinstance(data_headers, list):
+            tables = list(zip(data_headers, data_list))
+        else:
+            tables = [(data_headers, data_list)]
+
+        with self as db:
+            for pragma in CASE_PRAGMAS:
+                db.connection.execute(pragma)
+
+            self._delete(db.connection, name)
+            for idx, (headers, rows) in enumerate(tables):
+                self._save_table(db.connection, name, idx, tuple(headers), rows)
+
+            if state is not None:
+                db.connection.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES(?,?)",
+                    (name, json.dumps(state)),
+                )
+
+    def checkpoints(self) -> dict[str, dict[str, t.Any]]:
+        """Returns the saved state of each checkpointed artifact by name"""
+        with self as db:
+            rows = db.connection.execute("SELECT artifact, state FROM checkpoints")
+            return {row["artifact"]: json.loads(row["state"]) for row in rows}
+
+    def load_value(self, key: str, default: t.Any = None) -> t.Any:
+        """Returns a value of the run saved with :meth:`save_value`
+
+        Args:
+            key: name of the value
+            default: returned if the value was not saved. Defaults to None.
+        """
+        with self as db:
+            row = db.connection.execute(
+                "SELECT value FROM run WHERE key = ?",
+                (key,),
+            ).fetchone()
+        return default if row is None else json.loads(row["value"])
+
+    def save_value(self, key: str, value: t.Any) -> None:
+        """Saves a value of the run, such as the device information
+
+        Args:
+            key: name of the value
+            value: JSON serializable value. Anything else is saved as text.
+        """
+        with self as db:
+            db.connection.execute(
+                "INSERT OR REPLACE INTO run VALUES(?,?)",
+                (key, json.dumps(value, default=str)),
+            )
+
+    def tables(self, name: str) -> list[CaseTable]:
+        """Returns the tables saved for an artifact
+
+        Args:
+            name: name of the artifact
+
+        Returns:
+            List of :obj:`CaseTable` in the order they were saved
+        """
+        with self as db:
+            saved_tables = db.connection.execute(
+                "SELECT id, headers, num_of_rows FROM tables "
+                "WHERE artifact = ? ORDER BY idx",
+                (name,),
+            ).fetchall()
+
+        return [
+            CaseTable(
+                db_file=self.db_file,
+                table_id=table["id"],
+                headers=tuple(json.loads(table["headers"])),
+                num_of_rows=table["num_of_rows"],
+            )
+            for table in saved_tables
+        ]
+
+    def copy_from(self, db_file: pathlib.Path, names: t.Collection[str]) -> None:
+        """Copies the tables of artifacts from the case database of another report
+
+        Args:
+            db_file: case database of the other report
+            names: artifacts to copy
+        """
+        with self as db:
+            for pragma in CASE_PRAGMAS:
+                db.connection.execute(pragma)
+
+            with _attach(db.connection, db_file) as other:
+                saved_tables = db.connection.execute(
+                    f"SELECT * FROM {other}.tables ORDER BY artifact, idx",
+                ).fetchall()
+                copied = [table for table in saved_tables if table["artifact"] in names]
+                for name in {table["artifact"] for table in copied}:
+                    self._delete(db.connection, name)
+
+                for table in copied:
+                    cursor = db.connection.execute(
+                        "INSERT INTO tables(artifact, idx, headers, num_of_rows) "
+                        "VALUES(?,?,?,?)",
+                        (
+                            table["artifact"],
+                            table["idx"],
+                            table["headers"],
+                            table["num_of_rows"],
+                        ),
+                    )
+                    db.connection.execute(
+                        f"CREATE TABLE rows_{cursor.lastrowid} AS "
+                        f"SELECT * FROM {other}.rows_{table['id']} ORDER BY rowid",
+                    )
+
+                db.connection.executemany(
+                    "INSERT OR REPLACE INTO checkpoints "
+                    f"SELECT * FROM {other}.checkpoints WHERE artifact = ?",
+                    [(name,) for name in names],
+                )
+
+    @staticmethod
+    def _delete(connection: sqlite3.Connection, name: str) -> None:
+        for (table_id,) in connection.execute(
+            "SELECT id FROM tables WHERE artifact = ?",
+            (name,),
+        ).fetchall():
+            connection.execute(f"DROP TABLE IF EXISTS rows_{table_id}")
+        connection.execute("DELETE FROM tables WHERE artifact = ?", (name,))
+
+    @staticmethod
+    def _save_table(
+        connection: sqlite3.Connection,
+        name: str,
+        idx: int,
+        headers: tuple[str, ...],
+        rows: t.Iterable[t.Sequence[t.Any]],
+    ) -> None:
+        cursor = connection.execute(
+            "INSERT INTO tables(artifact, idx, headers, num_of_rows) VALUES(?,?,?,0)",
+            (name, idx, json.dumps(headers)),
+        )
+        table_id = cursor.lastrowid
+        num_of_columns = max(len(headers), 1)
+        columns = ", ".join(f"c{col}" for col in range(num_of_columns))
+        connection.execute(f"CREATE TABLE rows_{table_id}(_width INTEGER, {columns})")
+
+        num_of_rows = 0
+        for batch in batched(rows):
+            widest = max(len(row) for row in batch)
+            for col in range(num_of_columns, widest):
+                connection.execute(f"ALTER TABLE rows_{table_id} ADD COLUMN c{col}")
+            num_of_columns = max(num_of_columns, widest)
+
+            placeholders = ",".join("?" * (num_of_columns + 1))
+            connection.executemany(
+                f"INSERT INTO rows_{table_id} VALUES({placeholders})",
+                [
+                    (len(row), *map(_adapt, row), *[None] * (num_of_columns - len(row)))
+                    for row in batch
+                ],
+            )
+            num_of_rows += len(batch)
+
+        connection.execute(
+            "UPDATE tables SET num_of_rows = ? WHERE id = ?",
+            (num_of_rows, table_id),
+        )
+
+
+def _adapt(value: t.Any) -> t.Any:
+    """Keeps values SQLite can store natively and saves anything else as text.
+
+    Booleans and integers too large for SQLite are saved as text so they are
+    reported the same as before saving.
+    """
+    if value is None or isinstance(value, (str, bytes, float)):
+        return value
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value if SQLITE_MIN_INT <= value <= SQLITE_MAX_INT else str(value)
+    return str(value)
 
 
 @dataclass
 class DBService:
     __slots__ = ["_report_folder", "_databases"]
 
-    def __init__(self, report_folder: pathlib.Path) -> None:
+    def __init__(
+        self,
+        report_folder: pathlib.Path,
+        tsv_compression: t.Optional[str] = None,
+    ) -> None:
         self._report_folder = report_folder
         self._databases = {}
+        self._databases["case"] = CaseDBManager(report_folder)
         self._databases["kml"] = KmlDBManager(report_folder)
         self._databases["timeline"] = TimelineDBManager(report_folder)
-        self._databases["tsv"] = TsvManager(report_folder)
+        self._databases["tsv"] = TsvManager(report_folder, compression=tsv_compression)
 
+        self._databases["case"].create()
         self._databases["kml"].create()
         self._databases["timeline"].create()
         self._databases["tsv"].create()
 
-    def save(self, db_type: str, name: str, data_list: list[t.Any], data_headers):
+    def save(self, db_type: str, name: str, data_list: t.Iterable[t.Any], data_headers):
         try:
             db = self._databases[db_type]
             if db_type == "tsv":
@@ -226,3 +889,97 @@ def save(self, db_type: str, name: str, data_list: list[t.Any], data_headers):
             raise DatabaseError(
                 f"Database type {repr(db_type)} does not exists!"
             ) from err
+
+    def tables(self, name: str) -> list[CaseTable]:
+        """Returns the tables of an artifact saved in the case database
+
+        Args:
+            name: name of the artifact
+
+        Returns:
+            List of :obj:`CaseTable`
+        """
+        return self._databases["case"].tables(name)
+
+    def checkpoint(
+        self,
+        name: str,
+        data_list: t.Iterable[t.Any],
+        data_headers,
+        state: dict[str, t.Any],
+    ) -> None:
+        """Saves the rows of an artifact to the case database with its checkpoint
+
+        Args:
+            name: name of the artifact
+            data_list: rows of the artifact
+            data_headers: report headers of the artifact
+            state: processed flag, metrics and anything else needed to restore the
+                artifact
+        """
+        self._databases["case"].save(
+            name=name,
+            data_list=data_list,
+            data_headers=data_headers,
+            state=state,
+        )
+
+    def checkpoints(self) -> dict[str, dict[str, t.Any]]:
+        """Returns the state of each artifact saved with :meth:`checkpoint`"""
+        return self._databases["case"].checkpoints()
+
+    def load_value(self, key: str, default: t.Any = None) -> t.Any:
+        """Returns a value of the run saved in the case database"""
+        return self._databases["case"].load_value(key, default)
+
+    def save_value(self, key: str, value: t.Any) -> None:
+        """Saves a value of the run to the case database"""
+        self._databases["case"].save_value(key, value)
+
+    def copy_from(self, report_folder: pathlib.Path, names: t.Collection[str]) -> None:
+        """Copies the saved data of artifacts from the databases of another report
+
+        Copied timeline events are merged with the events of this report.
+
+        Args:
+            report_folder: folder of the other report
+            names: artifacts to copy
+        """
+        db_files = {
+            "case": report_folder / CASE_DB,
+            "kml": report_folder / "_KML_Exports" / "_latlong.db",
+            "timeline": report_folder / "_Timeline" / "t1.db",
+        }
+        for db_type, db_file in db_files.items():
+            if db_file.exists():
+                self._databases[db_type].copy_from(db_file, names)
+
+    def clear(self, names: t.Collection[str], db_types: t.Collection[str]) -> None:
+        """Deletes the saved exports of artifacts so they can be saved again
+
+        Rows in the case database are kept.
+
+        Args:
+            names: artifacts to clear
+            db_types: exports to clear ("tsv", "kml" or "timeline")
+        """
+        for db_type in db_types:
+            if db_type != "case" and db_type in self._databases:
+                self._databases[db_type].delete(names)
+
+    def load_timeline(self, exclude: t.Collection[str] = ()) -> None:
+        """Adds the events saved by an earlier run to the merged timeline
+
+        Args:
+            exclude: artifacts whose events were saved again by this run
+        """
+        self._databases["timeline"].load(exclude)
+
+    def merge_timeline(self) -> tuple[int, t.Iterator[timeline.TimelineEvent]]:
+        """Merges the saved timeline events of every artifact
+
+        Returns:
+            The number of events and an iterator of the events in time order
+        """
+        timeline_db = self._databases["timeline"]
+        return len(timeline_db.merger), timeline_db.merge()
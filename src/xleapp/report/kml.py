@@ -0,0 +1,102 @@
+"""Incremental KML writer
+
+Writes each `<Placemark>` to disk as soon as it is added instead of building the
+whole document in memory first.
+"""
+from __future__ import annotations
+
+import contextlib
+import pathlib
+import typing as t
+
+from html import escape as html_escape
+
+
+KML_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<kml xmlns="http://www.opengis.net/kml/2.2" '
+    'xmlns:gx="http://www.google.com/kml/ext/2.2">\n'
+    "    <Document>\n"
+    "        <open>1</open>\n"
+)
+KML_FOOTER = "    </Document>\n</kml>\n"
+KML_PLACEMARK = (
+    "        <Placemark>\n"
+    "            <name>{name}</name>\n"
+    "            <description>{description}</description>\n"
+    "            <Point>\n"
+    "                <coordinates>{longitude},{latitude},0.0</coordinates>\n"
+    "            </Point>\n"
+    "        </Placemark>\n"
+)
+
+
+class KmlWriter(contextlib.AbstractContextManager):
+    """Streams placemarks to a KML file
+
+    Example:
+        >>> with KmlWriter(pathlib.Path("points.kml")) as kml:
+                kml.add_point("2020-01-01", "Visited", 40.7, -74.0)
+
+    Args:
+        kml_file: location of the KML file
+    """
+
+    def __init__(self, kml_file: pathlib.Path) -> None:
+        self.kml_file = kml_file
+        self.num_of_points = 0
+        self._fp: t.Optional[t.TextIO] = None
+
+    def __enter__(self) -> KmlWriter:
+        self._fp = self.kml_file.open("w", encoding="utf-8")
+        self._fp.write(KML_HEADER)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._fp:
+            self._fp.write(KML_FOOTER)
+            self._fp.close()
+            self._fp = None
+
+    def __repr__(self) -> str:
+        return f"<KmlWriter kml_file={repr(self.kml_file)}>"
+
+    def add_point(
+        self,
+        name: t.Any,
+        description: t.Any,
+        latitude: t.Any,
+        longitude: t.Any,
+    ) -> None:
+        """Writes a single point placemark
+
+        Args:
+            name: name of the placemark
+            description: description of the placemark
+            latitude: latitude of the point
+            longitude: longitude of the point
+
+        Raises:
+            ValueError: If the writer is not open
+        """
+        if not self._fp:
+            raise ValueError(f"{repr(self)} is not open for writing!")
+
+        self._fp.write(
+            KML_PLACEMARK.format(
+                name=escape(name),
+                description=escape(description),
+                latitude=escape(latitude),
+                longitude=escape(longitude),
+            ),
+        )
+        self.num_of_points += 1
+
+
+def escape(value: t.Any) -> str:
+    """Escapes "&", "<" and ">" for XML text
+
+    Uses :func:`html.escape` as :mod:`xml.sax.saxutils` pulls in
+    :mod:`urllib.request` when imported.
+    """
+    return html_escape(str(value), quote=False)
@@ -0,0 +1,218 @@
+"""Merged timeline of every artifact marked with `timeline`
+
+Rows are sorted in chunks of :const:`RUN_SIZE` as each artifact is saved and
+spilled to run files on disk. :meth:`TimelineMerger.merge` then performs an
+external k-way merge over the runs so only one row per open run is held in memory
+no matter how many events the timeline contains.
+"""
+from __future__ import annotations
+
+import contextlib
+import csv
+import heapq
+import itertools
+import json
+import pathlib
+import shutil
+import typing as t
+
+from dataclasses import dataclass
+
+from xleapp.helpers import utils
+
+
+RUN_SIZE = 100_000
+MAX_MERGE_FAN_IN = 64
+TIMELINE_HEADERS = ("Timestamp", "Activity", "Data")
+
+
+@dataclass(frozen=True)
+class TimelineEvent:
+    """Single event in the merged timeline
+
+    Attributes:
+        epoch (int): seconds since the Unix epoch. None if the timestamp could not
+            be parsed. These events sort after every other event.
+        timestamp (str): timestamp as reported by the artifact
+        activity (str): name of the artifact
+        data (list): report columns as "HEADER: value" strings
+    """
+
+    epoch: int | None
+    timestamp: str
+    activity: str
+    data: list[str]
+
+    @property
+    def sort_key(self) -> tuple[bool, int]:
+        return (self.epoch is None, self.epoch or 0)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            [self.epoch, self.timestamp, self.activity, self.data],
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def from_json(cls, line: str) -> TimelineEvent:
+        return cls(*json.loads(line))
+
+
+class TimelineMerger:
+    """Sorts timeline rows into runs on disk and merges them in time order
+
+    Args:
+        run_folder: folder to hold the sorted runs. Removed after merging.
+        run_size: number of events sorted in memory for each run.
+            Defaults to :const:`RUN_SIZE`.
+        fan_in: maximum number of runs opened at once while merging.
+            Defaults to :const:`MAX_MERGE_FAN_IN`.
+    """
+
+    def __init__(
+        self,
+        run_folder: pathlib.Path,
+        run_size: int = RUN_SIZE,
+        fan_in: int = MAX_MERGE_FAN_IN,
+    ) -> None:
+        self.run_folder = run_folder
+        self.run_size = run_size
+        self.fan_in = fan_in
+        self._buffer: list[TimelineEvent] = []
+        self._counter = itertools.count()
+        self._runs: list[pathlib.Path] = []
+        self._num_of_events = 0
+
+    def __len__(self) -> int:
+        return self._num_of_events + len(self._buffer)
+
+    def __repr__(self) -> str:
+        return (
+            f"<TimelineMerger run_folder={repr(self.run_folder)}, "
+            f"runs={len(self._runs)}, events={len(self)}>"
+        )
+
+    def add(self, events: t.Iterable[TimelineEvent]) -> None:
+        """Adds events, saving a sorted run each time :attr:`run_size` is reached
+
+        Args:
+            events: events to add to the timeline
+        """
+        for event in events:
+            self._buffer.append(event)
+            if len(self._buffer) >= self.run_size:
+                self._spill()
+
+    def _spill(self) -> None:
+        if self._buffer:
+            self._buffer.sort(key=lambda event: event.sort_key)
+            self._runs.append(self._write_run(self._buffer))
+            self._num_of_events += len(self._buffer)
+            self._buffer = []
+
+    def merge(self) -> t.Iterator[TimelineEvent]:
+        """Merges all events in time order
+
+        Runs are merged in passes when there are more than :attr:`fan_in` runs so
+        the number of open files stays bounded.
+
+        Yields:
+            TimelineEvent: next event in time order
+        """
+        self._spill()
+        runs = self._runs
+        self._runs = []
+
+        try:
+            while len(runs) > self.fan_in:
+                runs = [
+                    self._write_run(self._merge_runs(runs[idx : idx + self.fan_in]))
+                    for idx in range(0, len(runs), self.fan_in)
+                ]
+            yield from self._merge_runs(runs)
+        finally:
+            shutil.rmtree(self.run_folder, ignore_errors=True)
+
+    def _merge_runs(self, runs: list[pathlib.Path]) -> t.Iterator[TimelineEvent]:
+        with contextlib.ExitStack() as stack:
+            files = [stack.enter_context(run.open(encoding="utf-8")) for run in runs]
+            streams = [map(TimelineEvent.from_json, fp) for fp in files]
+            yield from heapq.merge(*streams, key=lambda event: event.sort_key)
+
+        for run in runs:
+            run.unlink(missing_ok=True)
+
+    def _write_run(self, events: t.Iterable[TimelineEvent]) -> pathlib.Path:
+        self.run_folder.mkdir(parents=True, exist_ok=True)
+        run = self.run_folder / f"run_{next(self._counter):08d}.jsonl"
+        with run.open("w", encoding="utf-8") as fp:
+            fp.writelines(f"{event.to_json()}\n" for event in events)
+        return run
+
+
+def events_from_rows(
+    name: str,
+    data_headers: t.Sequence[str],
+    data_list: t.Iterable[t.Sequence[t.Any]],
+) -> t.Iterator[TimelineEvent]:
+    """Converts artifact rows into timeline events
+
+    The first column of each row is used as the timestamp of the event.
+
+    Args:
+        name: name of the artifact
+        data_headers: report headers of the artifact
+        data_list: rows of the artifact
+
+    Yields:
+        TimelineEvent: event for each row
+    """
+    activity = name.upper()
+    headers = [f"{header.upper()}: " for header in data_headers]
+    for row in data_list:
+        yield TimelineEvent(
+            epoch=utils.timestamp_to_epoch(row[0]),
+            timestamp=str(row[0]),
+            activity=activity,
+            data=[header + str(value) for header, value in zip(headers, row)],
+        )
+
+
+def export_events(
+    events: t.Iterable[TimelineEvent],
+    tsv_file: pathlib.Path,
+    jsonl_file: pathlib.Path,
+) -> t.Iterator[TimelineEvent]:
+    """Writes events to TSV and JSONL files while passing them on
+
+    Args:
+        events: events in time order
+        tsv_file: location of the TSV export
+        jsonl_file: location of the JSONL export
+
+    Yields:
+        TimelineEvent: each event after it was written
+    """
+    with (
+        tsv_file.open("w", encoding="utf-8-sig", newline="") as tsv_fp,
+        jsonl_file.open("w", encoding="utf-8") as jsonl_fp,
+    ):
+        tsv_writer = csv.writer(tsv_fp, delimiter="\t")
+        tsv_writer.writerow(("Epoch",) + TIMELINE_HEADERS)
+        for event in events:
+            tsv_writer.writerow(
+                (event.epoch, event.timestamp, event.activity, "; ".join(event.data)),
+            )
+            jsonl_fp.write(
+                json.dumps(
+                    {
+                        "epoch": event.epoch,
+                        "timestamp": event.timestamp,
+                        "activity": event.activity,
+                        "data": event.data,
+                    },
+                    ensure_ascii=False,
+                )
+                + "\n",
+            )
+            yield event
@@ -0,0 +1,784 @@
+"""Processes the artifacts of one extraction in shards run by separate workers
+
+The selected artifacts are split into shards of about the same estimated cost.
+The shards are saved to a SQLite job queue, `shards.db`, in a new
+`xLEAPP_Shards_<time>` folder of the output folder. Workers claim shards from
+the queue and run each one as a :mod:`xleapp.batch` job against the same
+read-only evidence, writing a report for the shard in a `shard-<id>` folder.
+
+Workers on other hosts can join with `xleapp shard-worker QUEUE` when the
+output folder and the evidence are on a shared filesystem mounted at the same
+path on every host. SQLite locking on network filesystems must be reliable for
+this to work.
+
+Workers save a heartbeat to the queue while they run a shard. A shard whose
+worker stopped sending heartbeats for :const:`LEASE_TIMEOUT` seconds, for example
+because its host went down, is queued again or failed after
+:const:`MAX_ATTEMPTS` tries, so the run does not wait for it forever.
+
+Once every shard is finished the shard reports are merged into one report:
+artifact pages, TSV and KML exports and exported files are copied, the case,
+KML and timeline databases are combined, and the navigation, timeline, metrics
+and index are generated for the merged report. Core artifacts run in every
+shard. Only the copy from the first shard is kept.
+"""
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import contextlib
+import dataclasses
+import datetime
+import heapq
+import html
+import json
+import logging
+import os
+import pathlib
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+import typing as t
+
+from dataclasses import dataclass
+
+import xleapp.globals as g
+
+from xleapp import report, templating
+from xleapp.app import Application
+from xleapp.artifact import metrics
+from xleapp.batch import BatchOptions, Job, JobResult, init_worker, run_job
+from xleapp.report import db
+
+
+if t.TYPE_CHECKING:
+    from xleapp.artifact.abstract import Artifact
+
+
+logger_log = logging.getLogger("xleapp.logfile")
+
+QUEUE_FILE = "shards.db"
+SHARD_SUMMARY = "shard.json"
+# Logs of every shard combined for the index of the merged report
+LOG_FILES = ("xleapp.log", "process_file.log")
+# Estimated seconds to run an artifact without metrics of an earlier run
+DEFAULT_COST = 1.0
+LONG_RUNNING_COST = 10.0
+# Seconds between checks of the queue while waiting for other workers
+POLL_INTERVAL = 2.0
+# Seconds a worker waits for the queue database to be unlocked
+QUEUE_TIMEOUT = 60.0
+# Seconds between heartbeats of a worker running a shard
+HEARTBEAT_INTERVAL = 30.0
+# Seconds without a heartbeat before the shard of a worker is claimed again
+LEASE_TIMEOUT = 5 * 60.0
+# Times a shard is claimed before it is failed
+MAX_ATTEMPTS = 2
+
+
+def estimate_costs(
+    artifacts: t.Iterable[Artifact],
+    history: t.Optional[t.Iterable[t.Mapping[str, t.Any]]] = None,
+) -> dict[str, float]:
+    """Estimates how long each artifact takes to run
+
+    Args:
+        artifacts: artifacts to estimate
+        history: rows of `run_metrics.json` of an earlier run. Artifacts missing
+            from it fall back to :const:`LONG_RUNNING_COST` for long running
+            artifacts and :const:`DEFAULT_COST` for the others. Defaults to None.
+
+    Returns:
+        The estimated cost of each artifact by name
+    """
+    run_times = {
+        row["cls_name"].lower(): float(row["total_time"]) for row in history or ()
+    }
+
+    costs = {}
+    for artifact in artifacts:
+        default = LONG_RUNNING_COST if artifact.long_running_process else DEFAULT_COST
+        costs[artifact.name] = run_times.get(artifact.cls_name.lower(), default)
+    return costs
+
+
+def partition(costs: t.Mapping[str, float], num_of_shards: int) -> list[list[str]]:
+    """Splits artifacts into shards of about the same total cost
+
+    The most expensive artifact is added to the cheapest shard until every
+    artifact is in a shard.
+
+    Args:
+        costs: estimated cost of each artifact by name
+        num_of_shards: shards to create. Fewer are returned if there are fewer
+            artifacts.
+
+    Returns:
+        The names of the artifacts in each shard, most expensive shard first
+    """
+    shards: list[list[str]] = [[] for _ in range(num_of_shards)]
+    loads = [(0.0, idx) for idx in range(num_of_shards)]
+
+    for name, cost in sorted(costs.items(), key=lambda item: (-item[1], item[0])):
+        load, idx = heapq.heappop(loads)
+        shards[idx].append(name)
+        heapq.heappush(loads, (load + cost, idx))
+
+    shards = [shard for shard in shards if shard]
+    return sorted(shards, key=lambda shard: -sum(costs[name] for name in shard))
+
+
+@dataclass
+class Shard:
+    """Artifacts of the extraction run by one worker
+
+    Attributes:
+        id (int): number of the shard
+        artifacts (list): names of the artifacts to run
+        cost (float): estimated cost of the artifacts
+        status (str): "pending", "running", "done" or "failed"
+        worker (str): worker that claimed the shard
+        report_folder (Path): report of the shard once it is done
+        error (str): why the shard failed
+    """
+
+    id: int
+    artifacts: list[str]
+    cost: float
+    status: str = "pending"
+    worker: t.Optional[str] = None
+    report_folder: t.Optional[pathlib.Path] = None
+    error: t.Optional[str] = None
+
+
+class ShardQueue:
+    """SQLite queue of the shards of an extraction
+
+    Args:
+        queue_file: location of the queue database
+    """
+
+    def __init__(self, queue_file: pathlib.Path) -> None:
+        self.queue_file = pathlib.Path(queue_file)
+
+    def __repr__(self) -> str:
+        return f"<ShardQueue queue_file={repr(self.queue_file)}>"
+
+    @property
+    def folder(self) -> pathlib.Path:
+        return self.queue_file.parent
+
+    @contextlib.contextmanager
+    def _connect(self, write: bool = False) -> t.Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(
+            self.queue_file,
+            timeout=QUEUE_TIMEOUT,
+            isolation_level=None,
+        )
+        connection.row_factory = sqlite3.Row
+        try:
+            if write:
+                # Lock the queue so only one worker claims each shard
+                connection.execute("BEGIN IMMEDIATE")
+            yield connection
+            if write:
+                connection.execute("COMMIT")
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+        finally:
+            connection.close()
+
+    @classmethod
+    def create(
+        cls,
+        folder: pathlib.Path,
+        job: Job,
+        options: BatchOptions,
+        shards: t.Sequence[list[str]],
+        costs: t.Mapping[str, float],
+    ) -> ShardQueue:
+        """Creates the queue of an extraction
+
+        Args:
+            folder: new folder for the queue and the reports of the shards
+            job: extraction to process. The artifacts are taken from `shards`.
+            options: options passed to every shard
+            shards: names of the artifacts of each shard
+            costs: estimated cost of each artifact by name
+
+        Returns:
+            The new queue
+        """
+        folder.mkdir(parents=True)
+        queue = cls(folder / QUEUE_FILE)
+
+        with queue._connect(write=True) as connection:
+            connection.execute(
+                """
+                CREATE TABLE job(
+                    device_type TEXT, input_path TEXT, output_path TEXT, options TEXT
+                )
+                """,
+            )
+            connection.execute(
+                """
+                CREATE TABLE shards(
+                    id INTEGER PRIMARY KEY, artifacts TEXT, cost REAL,
+                    status TEXT DEFAULT 'pending', worker TEXT, report_folder TEXT,
+                    error TEXT, started REAL, finished REAL, heartbeat REAL,
+                    attempts INTEGER DEFAULT 0
+                )
+                """,
+            )
+            connection.execute(
+                "INSERT INTO job VALUES(?,?,?,?)",
+                (
+                    job.device_type,
+                    str(job.input_path),
+                    str(job.output_path),
+                    json.dumps(dataclasses.asdict(options)),
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO shards(id, artifacts, cost) VALUES(?,?,?)",
+                [
+                    (idx, json.dumps(names), sum(costs[name] for name in names))
+                    for idx, names in enumerate(shards, 1)
+                ],
+            )
+        return queue
+
+    def job(self) -> tuple[Job, BatchOptions]:
+        """Returns the extraction and the options of the queue"""
+        with self._connect() as connection:
+            row = connection.execute("SELECT * FROM job").fetchone()
+
+        job = Job(
+            device_type=row["device_type"],
+            input_path=pathlib.Path(row["input_path"]),
+            output_path=pathlib.Path(row["output_path"]),
+        )
+        return job, BatchOptions(**json.loads(row["options"]))
+
+    def shards(self) -> list[Shard]:
+        """Returns every shard of the queue in order"""
+        with self._connect() as connection:
+            rows = connection.execute("SELECT * FROM shards ORDER BY id").fetchall()
+        return [self._shard(row) for row in rows]
+
+    @staticmethod
+    def _shard(row: sqlite3.Row) -> Shard:
+        return Shard(
+            id=row["id"],
+            artifacts=json.loads(row["artifacts"]),
+            cost=row["cost"],
+            status=row["status"],
+            worker=row["worker"],
+            report_folder=row["report_folder"] and pathlib.Path(row["report_folder"]),
+            error=row["error"],
+        )
+
+    def claim(self, worker: str) -> t.Optional[Shard]:
+        """Claims the most expensive pending shard
+
+        Args:
+            worker: name of the worker
+
+        Returns:
+            The claimed shard or None if no shard is pending
+        """
+        with self._connect(write=True) as connection:
+            row = connection.execute(
+                "SELECT * FROM shards WHERE status = 'pending' "
+                "ORDER BY cost DESC, id LIMIT 1",
+            ).fetchone()
+            if row is None:
+                return None
+
+            current_time = time.time()
+            connection.execute(
+                "UPDATE shards SET status = 'running', worker = ?, started = ?, "
+                "heartbeat = ?, attempts = attempts + 1 WHERE id = ?",
+                (worker, current_time, current_time, row["id"]),
+            )
+
+        shard = self._shard(row)
+        shard.status, shard.worker = "running", worker
+        return shard
+
+    def heartbeat(self, shard_id: int, worker: str) -> None:
+        """Tells the queue that a worker is still running a shard
+
+        Args:
+            shard_id: number of the shard
+            worker: name of the worker
+        """
+        with self._connect(write=True) as connection:
+            connection.execute(
+                "UPDATE shards SET heartbeat = ? "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (time.time(), shard_id, worker),
+            )
+
+    def complete(
+        self,
+        shard_id: int,
+        result: JobResult,
+        worker: t.Optional[str] = None,
+    ) -> None:
+        """Saves the outcome of a shard
+
+        Args:
+            shard_id: number of the shard
+            result: outcome of the job that ran the shard
+            worker: name of the worker that ran the shard. The outcome is only
+                saved if the shard was not claimed again by another worker.
+                Defaults to None to always save it.
+        """
+        query = (
+            "UPDATE shards SET status = ?, report_folder = ?, error = ?, "
+            "finished = ? WHERE id = ?"
+        )
+        params = [
+            "failed" if result.failed else "done",
+            result.report_folder and str(result.report_folder),
+            result.error,
+            time.time(),
+            shard_id,
+        ]
+        if worker is not None:
+            query += " AND worker = ? AND status = 'running'"
+            params.append(worker)
+
+        with self._connect(write=True) as connection:
+            connection.execute(query, params)
+
+    def fail_worker(self, worker: str, error: str) -> None:
+        """Fails the running shards of a worker that stopped
+
+        Args:
+            worker: name of the worker
+            error: why the worker stopped
+        """
+        with self._connect(write=True) as connection:
+            connection.execute(
+                "UPDATE shards SET status = 'failed', error = ?, finished = ? "
+                "WHERE worker = ? AND status = 'running'",
+                (error, time.time(), worker),
+            )
+
+    def expire(self, lease_timeout: float = LEASE_TIMEOUT) -> list[int]:
+        """Queues the shards of workers without a recent heartbeat again
+
+        Shards already claimed :const:`MAX_ATTEMPTS` times are failed instead.
+
+        Args:
+            lease_timeout: seconds without a heartbeat before a shard expires.
+                Defaults to :const:`LEASE_TIMEOUT`.
+
+        Returns:
+            Numbers of the expired shards
+        """
+        current_time = time.time()
+        with self._connect(write=True) as connection:
+            rows = connection.execute(
+                "SELECT id, worker, attempts FROM shards "
+                "WHERE status = 'running' AND heartbeat < ?",
+                (current_time - lease_timeout,),
+            ).fetchall()
+            for row in rows:
+                error = f"Worker {row['worker']} stopped sending heartbeats"
+                logger_log.warning(f"-> Shard {row['id']} expired! {error}")
+                if row["attempts"] < MAX_ATTEMPTS:
+                    connection.execute(
+                        "UPDATE shards SET status = 'pending', worker = NULL, "
+                        "heartbeat = NULL WHERE id = ?",
+                        (row["id"],),
+                    )
+                else:
+                    connection.execute(
+                        "UPDATE shards SET status = 'failed', error = ?, finished = ? "
+                        "WHERE id = ?",
+                        (error, current_time, row["id"]),
+                    )
+        return [row["id"] for row in rows]
+
+    def finished(self) -> bool:
+        """True once no shard is pending or running"""
+        with self._connect() as connection:
+            (remaining,) = connection.execute(
+                "SELECT count(*) FROM shards WHERE status IN ('pending', 'running')",
+            ).fetchone()
+        return not remaining
+
+    def pending(self) -> bool:
+        """True if a shard is waiting for a worker"""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT 1 FROM shards WHERE status = 'pending' LIMIT 1",
+            ).fetchone()
+        return row is not None
+
+    def wait(
+        self,
+        poll_interval: float = POLL_INTERVAL,
+        timeout: t.Optional[float] = None,
+        lease_timeout: float = LEASE_TIMEOUT,
+        run_pending: t.Optional[t.Callable[[], t.Any]] = None,
+    ) -> None:
+        """Waits for the workers to finish every shard
+
+        Shards of workers that stopped sending heartbeats are expired with
+        :meth:`expire` while waiting.
+
+        Args:
+            poll_interval: seconds between checks of the queue. Defaults to
+                :const:`POLL_INTERVAL`.
+            timeout: seconds to wait before the shards that are not finished are
+                failed. Defaults to None to wait until every shard is finished.
+            lease_timeout: seconds without a heartbeat before a shard expires.
+                Defaults to :const:`LEASE_TIMEOUT`.
+            run_pending: called to run shards that were queued again. Defaults to
+                None to leave them to other workers.
+        """
+        start_time = time.perf_counter()
+        while not self.finished():
+            if self.expire(lease_timeout) and run_pending and self.pending():
+                run_pending()
+                continue
+
+            if timeout is not None and time.perf_counter() - start_time > timeout:
+                self._fail_unfinished(f"Timed out after waiting {timeout:g}s")
+                return
+            time.sleep(poll_interval)
+
+    def _fail_unfinished(self, error: str) -> None:
+        with self._connect(write=True) as connection:
+            connection.execute(
+                "UPDATE shards SET status = 'failed', error = ?, finished = ? "
+                "WHERE status IN ('pending', 'running')",
+                (error, time.time()),
+            )
+
+
+def create_queue(
+    job: Job,
+    artifacts: t.Iterable[Artifact],
+    num_of_shards: int,
+    options: BatchOptions = BatchOptions(),
+    history: t.Optional[t.Iterable[t.Mapping[str, t.Any]]] = None,
+) -> ShardQueue:
+    """Splits the artifacts of an extraction into a new queue of shards
+
+    Core artifacts are left out because they run in every shard.
+
+    Args:
+        job: extraction to process
+        artifacts: selected artifacts
+        num_of_shards: shards to create
+        options: options passed to every shard. Defaults to :class:`BatchOptions`.
+        history: rows of `run_metrics.json` of an earlier run used to estimate the
+            cost of the artifacts. Defaults to None.
+
+    Returns:
+        The new queue
+    """
+    costs = estimate_costs(
+        (artifact for artifact in artifacts if not artifact.core),
+        history,
+    )
+    current_time = datetime.datetime.now().strftime("%Y-%m-%d_%A_%H%M%S")
+    folder = pathlib.Path(job.output_path) / f"xLEAPP_Shards_{current_time}"
+
+    return ShardQueue.create(
+        folder,
+        job,
+        options,
+        partition(costs, num_of_shards),
+        costs,
+    )
+
+
+def save_summary(application: Application) -> None:
+    """Saves what the report of a shard needs to be merged
+
+    Args:
+        application: application that ran the shard
+    """
+    summary = {
+        "extraction_type": application.extraction_type,
+        "device": dict(application.device),
+        "artifacts": [
+            {
+                "name": artifact.name,
+                "cls_name": artifact.cls_name,
+                "category": artifact.category,
+                "processed": artifact.processed,
+                "web_icon": artifact.web_icon.value if artifact.processed else None,
+            }
+            for artifact in application.artifacts.selected()
+        ],
+    }
+    (application.log_folder / SHARD_SUMMARY).write_text(
+        json.dumps(summary, indent=2, default=str),
+        encoding="utf-8",
+    )
+
+
+@contextlib.contextmanager
+def _heartbeat(
+    queue: ShardQueue,
+    shard: Shard,
+    worker: str,
+    interval: float = HEARTBEAT_INTERVAL,
+) -> t.Iterator[None]:
+    stopped = threading.Event()
+
+    def beat() -> None:
+        while not stopped.wait(interval):
+            try:
+                queue.heartbeat(shard.id, worker)
+            except sqlite3.Error as err:
+                logger_log.warning(f"-> Heartbeat of shard {shard.id} failed! {err}")
+
+    thread = threading.Thread(target=beat, name=f"Heartbeat-{shard.id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def work(queue_file: pathlib.Path, worker: t.Optional[str] = None) -> int:
+    """Runs shards of a queue until none are pending
+
+    Args:
+        queue_file: location of the queue database
+        worker: name of the worker. Defaults to the host name and process id.
+
+    Returns:
+        The number of shards run
+    """
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    queue = ShardQueue(queue_file)
+    job, options = queue.job()
+
+    num_of_shards = 0
+    while shard := queue.claim(worker):
+        logger_log.info(f"Worker {worker} running shard {shard.id}...")
+        shard_folder = queue.folder / f"shard-{shard.id}"
+        shard_folder.mkdir(exist_ok=True)
+
+        shard_job = dataclasses.replace(
+            job,
+            output_path=shard_folder,
+            artifacts=tuple(shard.artifacts),
+        )
+        with _heartbeat(queue, shard, worker):
+            result = run_job(shard_job, options, finished=save_summary)
+        queue.complete(shard.id, result, worker)
+        num_of_shards += 1
+    return num_of_shards
+
+
+def run_workers(queue: ShardQueue, max_workers: int) -> None:
+    """Runs workers on this host until no shard is pending
+
+    Shards claimed by a worker process that dies are marked as failed.
+
+    Args:
+        queue: queue of the extraction
+        max_workers: worker processes to run. With 1 the shards run in this
+            process.
+    """
+    host = socket.gethostname()
+    if max_workers == 1:
+        work(queue.queue_file, f"{host}:local-1")
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=init_worker,
+    ) as executor:
+        futures = {
+            executor.submit(work, queue.queue_file, worker): worker
+            for worker in (f"{host}:local-{idx}" for idx in range(1, max_workers + 1))
+        }
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                future.result()
+            except Exception as err:
+                # The worker died, for example when it ran out of memory
+                queue.fail_worker(futures[future], f"{type(err).__name__}: {err}")
+
+
+def _copy_page(
+    page: pathlib.Path,
+    report_folder: pathlib.Path,
+    shard_folder: pathlib.Path,
+) -> None:
+    # Pages link to the index of the report they were written in
+    text = page.read_text(encoding="UTF-8")
+    for folder in {str(shard_folder), html.escape(str(shard_folder))}:
+        text = text.replace(folder, str(report_folder))
+    (report_folder / page.name).write_text(text, encoding="UTF-8")
+
+
+def _copy_exports(
+    shard_folder: pathlib.Path,
+    report_folder: pathlib.Path,
+    artifact: t.Mapping[str, t.Any],
+) -> None:
+    name = artifact["name"]
+    page = shard_folder / f"{artifact['category']} - {name}.html"
+    if page.exists():
+        _copy_page(page, report_folder, shard_folder)
+
+    export_files = [
+        *(f"_TSV Exports/{name}{suffix}" for suffix in db.TSV_SUFFIXES.values()),
+        f"_KML_Exports/{name}.kml",
+    ]
+    for export_file in export_files:
+        if (shard_folder / export_file).exists():
+            shutil.copy2(shard_folder / export_file, report_folder / export_file)
+
+    export_folder = shard_folder / "export" / artifact["cls_name"]
+    if export_folder.exists():
+        shutil.copytree(
+            export_folder,
+            report_folder / "export" / artifact["cls_name"],
+            dirs_exist_ok=True,
+        )
+
+
+def _append_log(log_file: pathlib.Path, merged_file: pathlib.Path) -> None:
+    if log_file.exists():
+        with open(merged_file, "a", encoding="utf-8") as merged:
+            merged.write(f"==> {log_file.parent.parent.name} <==\n")
+            merged.write(log_file.read_text(encoding="utf-8", errors="replace"))
+
+
+def merge(
+    queue: ShardQueue,
+    processing_time: float = 0.0,
+) -> t.Optional[pathlib.Path]:
+    """Merges the reports of the finished shards into one report
+
+    Args:
+        queue: queue of the extraction
+        processing_time: seconds spent processing the extraction. Defaults to 0.
+
+    Returns:
+        The merged report folder or None if no shard completed
+    """
+    shards = [shard for shard in queue.shards() if shard.status == "done"]
+    if not shards:
+        return None
+
+    job, options = queue.job()
+    application = Application()
+    application.tsv_compression = options.tsv_compression
+
+    with g.use_app(application):
+        application.create_output_folder(job.output_path)
+        application.input_path = job.input_path
+        application.processing_time = processing_time
+        report_folder = application.report_folder
+
+        report.copy_static_files(report_folder)
+        application.dbservice = db.DBService(
+            report_folder,
+            tsv_compression=options.tsv_compression,
+        )
+
+        nav: dict[str, set[templating.NavigationItem]] = collections.defaultdict(set)
+        performance: list[dict[str, t.Any]] = []
+        merged: set[str] = set()
+
+        for shard in shards:
+            summary = json.loads(
+                (shard.report_folder / "Script Logs" / SHARD_SUMMARY).read_text(
+                    encoding="utf-8",
+                ),
+            )
+            application.extraction_type = summary["extraction_type"]
+            for key, value in summary["device"].items():
+                application.device.setdefault(key, value)
+
+            artifacts = [
+                artifact
+                for artifact in summary["artifacts"]
+                if artifact["name"] not in merged
+            ]
+            names = {artifact["name"] for artifact in artifacts}
+            merged.update(names)
+
+            for artifact in artifacts:
+                _copy_exports(shard.report_folder, report_folder, artifact)
+                if artifact["processed"]:
+                    page = f"{artifact['category']} - {artifact['name']}.html"
+                    nav[artifact["category"]].add(
+                        templating.NavigationItem(
+                            name=artifact["name"],
+                            web_icon=artifact["web_icon"],
+                            href=str(report_folder / page),
+                        ),
+                    )
+
+            application.dbservice.copy_from(shard.report_folder, names)
+            performance.extend(
+                row
+                for row in metrics.load_metrics(shard.report_folder / "Script Logs")
+                if row["name"] in names
+            )
+            shard_logs = shard.report_folder / "Script Logs"
+            shutil.copytree(shard_logs, application.log_folder / f"shard-{shard.id}")
+            for log_file in LOG_FILES:
+                _append_log(shard_logs / log_file, application.log_folder / log_file)
+
+        # Saved so the reports can be generated again with `xleapp report`
+        for key, value in (
+            ("input_path", str(job.input_path)),
+            ("device_type", job.device_type),
+            ("extraction_type", application.extraction_type),
+            ("tsv_compression", options.tsv_compression),
+            ("device", dict(application.device)),
+            ("processing_time", processing_time),
+        ):
+            application.dbservice.save_value(key, value)
+
+        num_of_events, events = application.dbservice.merge_timeline()
+        timeline_nav = templating.generate_timeline(
+            report_folder=report_folder,
+            log_folder=application.log_folder,
+            events=events,
+            num_of_events=num_of_events,
+        )
+        if timeline_nav:
+            nav["Timeline"].add(timeline_nav)
+
+        templating.generate_nav_script(
+            report_folder=report_folder,
+            log_folder=application.log_folder,
+            navigation=nav,
+        )
+
+        performance.sort(key=lambda row: row["total_time"], reverse=True)
+        metrics.write_metrics(performance, application.log_folder)
+
+        index_page = templating.Index(
+            report_folder=report_folder,
+            log_folder=application.log_folder,
+            extraction_type=application.extraction_type,
+            processing_time=processing_time,
+            performance=performance,
+        )
+        (report_folder / "index.html").write_text(index_page.html())
+
+    logger_log.info(f"Merged {len(shards)} shards into {report_folder}")
+    return report_folder
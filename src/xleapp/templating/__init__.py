@@ -1,9 +1,12 @@
 import collections
+import itertools
+import math
 import pathlib
 import typing as t
 
 from ._partials.index import Index
-from .ext import IncludeLogFileExtension as IncludeLogFileExtension
+from ._partials.navigation import Navigation
+from ._partials.timeline import PAGES_FOLDER, TimelinePage
 from .html import ArtifactHtmlReport as ArtifactHtmlReport
 from .html import Contributor
 from .html import HtmlPage as HtmlPage
@@ -14,17 +17,33 @@
 if t.TYPE_CHECKING:
     from xleapp.app import Application
     from xleapp.artifact.service import Artifacts
+    from xleapp.report.timeline import TimelineEvent
+
+    from .ext import IncludeLogFileExtension as IncludeLogFileExtension
+
+
+def __getattr__(name: str) -> t.Any:
+    # The extension imports jinja2 so it is only loaded when asked for
+    if name == "IncludeLogFileExtension":
+        from .ext import IncludeLogFileExtension
+
+        return IncludeLogFileExtension
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+NAVIGATION_SCRIPT = "nav_artifacts.js"
+TIMELINE_PAGE_SIZE = 5_000
 
 
 def generate_index(app: "Application") -> None:
-    nav = generate_nav(app.report_folder, app.artifacts)
+    from xleapp.artifact.metrics import metrics_table
 
     index_page = Index(
         report_folder=app.report_folder,
         log_folder=app.log_folder,
         extraction_type=app.extraction_type,
         processing_time=app.processing_time,
-        navigation=nav,
+        performance=metrics_table(app.artifacts.selected()),
     )
 
     index_file = app.report_folder / "index.html"
@@ -76,3 +95,108 @@ def generate_nav(
             )
             nav[artifact.category].add(temp_item)
     return nav
+
+
+def generate_nav_script(
+    report_folder: pathlib.Path,
+    log_folder: pathlib.Path,
+    navigation: dict[str, set[NavigationItem]],
+) -> pathlib.Path:
+    """Renders the navigation once to a script loaded by every report page.
+
+    Args:
+        report_folder (Path): Report folder where Artifact HTML Reports
+            are saved.
+        log_folder (Path): Log folder for the log output
+        navigation (dict): dictionary of navigation items from
+            :func:`generate_nav`
+
+    Returns:
+        Path: location of the navigation script
+    """
+    nav_page = Navigation(
+        report_folder=report_folder,
+        log_folder=log_folder,
+        navigation=navigation,
+    )
+
+    nav_file = report_folder / "_static" / NAVIGATION_SCRIPT
+    nav_file.parent.mkdir(parents=True, exist_ok=True)
+    nav_file.write_text(nav_page.html(), encoding="UTF-8")
+    return nav_file
+
+
+def generate_timeline(
+    report_folder: pathlib.Path,
+    log_folder: pathlib.Path,
+    events: t.Iterable["TimelineEvent"],
+    num_of_events: int,
+    page_size: int = TIMELINE_PAGE_SIZE,
+) -> t.Optional[NavigationItem]:
+    """Generates the paginated HTML pages of the merged timeline.
+
+    Pages are saved to :const:`PAGES_FOLDER` in the report folder, replacing the pages
+    of an earlier run. Only one page of events is held in memory at a time.
+
+    Args:
+        report_folder (Path): Report folder where the pages are saved.
+        log_folder (Path): Log folder for the log output
+        events: events of the merged timeline in time order
+        num_of_events (int): total number of events
+        page_size (int): number of events on each page. Defaults to
+            :const:`TIMELINE_PAGE_SIZE`.
+
+    Returns:
+        NavigationItem: navigation to the first timeline page or None if there
+            are no events.
+    """
+    num_of_pages = math.ceil(num_of_events / page_size)
+    iterator = iter(events)
+
+    pages_folder = report_folder / PAGES_FOLDER
+    for old_page in pages_folder.glob("*.html"):
+        old_page.unlink()
+    if num_of_pages:
+        pages_folder.mkdir(parents=True, exist_ok=True)
+
+    for page in range(1, num_of_pages + 1):
+        timeline_page = TimelinePage(
+            report_folder=report_folder,
+            log_folder=log_folder,
+            events=list(itertools.islice(iterator, page_size)),
+            page=page,
+            num_of_pages=num_of_pages,
+            num_of_events=num_of_events,
+        )
+        output_file = report_folder / TimelinePage.path(page)
+        output_file.write_text(timeline_page.html(), encoding="UTF-8")
+
+    # Drain anything left so exports of the timeline are complete
+    for _ in iterator:
+        pass
+
+    if not num_of_pages:
+        return None
+
+    return timeline_navigation(report_folder)
+
+
+def timeline_navigation(report_folder: pathlib.Path) -> t.Optional[NavigationItem]:
+    """Returns the navigation to the first timeline page of a report
+
+    Args:
+        report_folder (Path): Report folder where the pages are saved.
+
+    Returns:
+        NavigationItem: navigation to the first timeline page or None if the
+            report has no timeline.
+    """
+    first_page = report_folder / TimelinePage.path(1)
+    if not first_page.exists():
+        return None
+
+    return NavigationItem(
+        name="Timeline",
+        web_icon="clock",
+        href=str(first_page),
+    )
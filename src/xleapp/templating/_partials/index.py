@@ -1,3 +1,5 @@
+import typing as t
+
 from dataclasses import dataclass, field
 
 from xleapp import templating
@@ -12,10 +14,13 @@ class Index(html.HtmlPage):
     Attributes:
         authors (list): list of authors
         contributors (list): list of contributors
+        performance (list): metrics of each artifact from
+            :func:`xleapp.artifact.metrics.metrics_table`
     """
 
     authors: list[html.Contributor] = field(init=False)
     contributors: list[html.Contributor] = field(init=False)
+    performance: list[dict[str, t.Any]] = field(default_factory=list)
 
     def __post_init__(self) -> None:
         self.authors = templating.get_contributors(__authors__)
@@ -30,7 +35,7 @@ def html(self) -> str:
         """
 
         return self.template.render(
-            navigation=self.navigation,
             authors=self.authors,
             contributors=self.contributors,
+            performance=self.performance,
         )
@@ -0,0 +1,26 @@
+from dataclasses import dataclass, field
+
+from xleapp.templating import html
+
+
+@dataclass
+class Navigation(html.HtmlPage):
+    """Navigation sidebar shared by every page of the HTML report
+
+    The sidebar is rendered once into a script which each page loads instead of
+    rendering the full list of artifacts into every page.
+
+    Attributes:
+        navigation (dict): navigation items of the report by category
+    """
+
+    navigation: dict[str, set[html.NavigationItem]] = field(default_factory=dict)
+
+    @html.Template("nav_script")
+    def html(self) -> str:
+        """Generates the script holding the navigation
+
+        Returns:
+            str: JavaScript of the navigation sidebar
+        """
+        return self.template.render(navigation=self.navigation)
@@ -0,0 +1,59 @@
+import pathlib
+
+from dataclasses import dataclass, field
+
+from xleapp.report.timeline import TIMELINE_HEADERS, TimelineEvent
+from xleapp.templating import html
+
+
+# Folder of the timeline pages within the report folder
+PAGES_FOLDER = pathlib.PurePosixPath("_Timeline", "pages")
+
+
+@dataclass
+class TimelinePage(html.HtmlPage):
+    """Single page of the merged timeline
+
+    Pages are saved to :const:`PAGES_FOLDER` so a large timeline does not fill the
+    report folder.
+
+    Attributes:
+        events (list): events shown on this page
+        page (int): number of this page, starting at 1
+        num_of_pages (int): total number of timeline pages
+        num_of_events (int): total number of events in the timeline
+    """
+
+    events: list[TimelineEvent] = field(default_factory=list)
+    page: int = 1
+    num_of_pages: int = 1
+    num_of_events: int = 0
+
+    @staticmethod
+    def file_name(page: int) -> str:
+        return f"Timeline - Page {page}.html"
+
+    @classmethod
+    def path(cls, page: int) -> pathlib.PurePosixPath:
+        """Returns the path of a page relative to the report folder"""
+        return PAGES_FOLDER / cls.file_name(page)
+
+    @html.Template("timeline")
+    def html(self) -> str:
+        """Generates html for page
+
+        Returns:
+            str: HTML of the timeline page
+        """
+        return self.template.render(
+            headers=TIMELINE_HEADERS,
+            rows=[
+                (event.timestamp, event.activity, "; ".join(event.data))
+                for event in self.events
+            ],
+            page=self.page,
+            num_of_pages=self.num_of_pages,
+            num_of_events=self.num_of_events,
+            page_path=self.path,
+            report_root="../" * len(PAGES_FOLDER.parts),
+        )
@@ -10,6 +10,7 @@
 
 
 if t.TYPE_CHECKING:
+    from jinja2.bccache import Bucket
     from jinja2.parser import Parser
 
 
@@ -29,3 +30,25 @@ def _render(self, template: str) -> t.Any:
         except Exception:
             file_text = f"{template} not found or missing! No logs available."
         return markupsafe.Markup(f'<pre class="log-file">{file_text}</pre>')
+
+
+class MemoryBytecodeCache(jinja2.BytecodeCache):
+    """Keeps compiled templates in memory
+
+    Share one cache between jinja environments so each template is compiled once
+    per process instead of once per report.
+    """
+
+    def __init__(self) -> None:
+        self._bytecode: dict[str, bytes] = {}
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        code = self._bytecode.get(bucket.key)
+        if code is not None:
+            bucket.bytecode_from_string(code)
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        self._bytecode[bucket.key] = bucket.bytecode_to_string()
+
+    def clear(self) -> None:
+        self._bytecode.clear()
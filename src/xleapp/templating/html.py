@@ -96,15 +96,10 @@ class HtmlPageMixinDefaults:
         device (Device): Extracted device information object
         project (str): project name
         version (str): project version
-        navigation (dict): Navigation of the HTML report
     """
 
     extraction_type: t.Optional[str] = field(default="fs", init=True)
     processing_time: float = field(default=0.0, init=True)
-    navigation: dict[str, set[NavigationItem]] = field(
-        default_factory=lambda: {},
-        init=True,
-    )
 
 
 class HtmlPage(HtmlPageMixinDefaults, HtmlPageMixin, HtmlPageBase):
@@ -173,7 +168,7 @@ def html(self) -> str:
         Returns:
             str: HTML str of artifact report
         """
-        return self.template.render(artifact=self.artifact, navigation=self.navigation)
+        return self.template.render(artifact=self.artifact)
 
     @property
     def report(self) -> bool:
@@ -0,0 +1,105 @@
+import pathlib
+
+import pytest
+
+from harness import (
+    Measurement,
+    compare,
+    format_comparison,
+    format_size,
+    load_results,
+    measure,
+    save_results,
+)
+from synthetic import ExtractionSpec, generate_extraction
+
+
+results_key = pytest.StashKey[list]()
+
+
+def pytest_configure(config):
+    config.stash[results_key] = []
+
+
+def sizes_option(config, option):
+    return [int(size) for size in config.getoption(option).split(",") if size.strip()]
+
+
+def pytest_generate_tests(metafunc):
+    if "num_of_files" in metafunc.fixturenames:
+        sizes = sizes_option(metafunc.config, "--benchmark-sizes")
+        metafunc.parametrize(
+            "num_of_files",
+            sizes,
+            ids=[f"{size}files" for size in sizes],
+            scope="session",
+        )
+
+    if "num_of_rows" in metafunc.fixturenames:
+        sizes = sizes_option(metafunc.config, "--benchmark-rows")
+        metafunc.parametrize("num_of_rows", sizes, ids=[f"{size}rows" for size in sizes])
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results: list[Measurement] = config.stash.get(results_key, [])
+    if not results:
+        return
+
+    terminalreporter.section("benchmarks")
+    width = max(len(result.name) for result in results)
+    terminalreporter.write_line(
+        f"{'Benchmark':<{width}}  {'Seconds':>10}  {'Peak memory':>12}  Info",
+    )
+    for result in results:
+        info = ", ".join(f"{key}={value}" for key, value in result.info.items())
+        terminalreporter.write_line(
+            f"{result.name:<{width}}  {result.seconds:>10.4f}  "
+            f"{format_size(result.peak_memory):>12}  {info}",
+        )
+
+    results_file = config.getoption("--benchmark-json")
+    if results_file:
+        save_results(results, pathlib.Path(results_file))
+        terminalreporter.write_line(f"Saved benchmark results to {results_file}")
+
+    baseline_file = config.getoption("--benchmark-compare")
+    if baseline_file:
+        terminalreporter.section(f"compared with {baseline_file}")
+        for comparison in compare(load_results(pathlib.Path(baseline_file)), results):
+            terminalreporter.write_line(
+                format_comparison(comparison),
+                red=comparison.regressed(),
+                green=comparison.time_ratio < 1,
+            )
+
+
+@pytest.fixture(scope="session")
+def extraction(num_of_files, tmp_path_factory):
+    """Synthetic extraction with `num_of_files` files, packed in every format"""
+    folder: pathlib.Path = tmp_path_factory.mktemp(f"extraction-{num_of_files}")
+    return generate_extraction(folder, ExtractionSpec(num_of_files=num_of_files))
+
+
+@pytest.fixture
+def benchmark(request):
+    """Measures a function and records the result for the terminal summary
+
+    Returns a function taking the function to measure, the options of
+    :func:`harness.measure` and extra information to report as keyword
+    arguments.
+    """
+    results = request.config.stash[results_key]
+
+    def run(func, *, rounds=1, memory=False, setup=None, name=None, **info):
+        measurement, result = measure(
+            name or request.node.name,
+            func,
+            rounds=rounds,
+            memory=memory,
+            setup=setup,
+        )
+        measurement.info.update(info)
+        results.append(measurement)
+        return result
+
+    return run
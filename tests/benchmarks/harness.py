@@ -0,0 +1,256 @@
+"""Measures benchmarks for the `benchmark` test marker
+
+Results can be saved as a JSON baseline with `--benchmark-json` and compared
+with a later run with `--benchmark-compare`, or from the command line::
+
+    $ python tests/benchmarks/harness.py baseline.json results.json
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import datetime
+import gc
+import json
+import pathlib
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import typing as t
+
+from dataclasses import dataclass, field
+
+
+RESULTS_VERSION = 1
+TOLERANCE = 0.2
+
+
+@dataclass
+class Measurement:
+    """Result of a single benchmark
+
+    Attributes:
+        name (str): name of the benchmark
+        seconds (float): wall clock time of the fastest round
+        peak_memory (int): peak bytes allocated while running. None unless memory
+            was traced.
+        rounds (int): number of times the benchmark ran
+        info (dict): parameters of the benchmark such as the number of files
+    """
+
+    name: str
+    seconds: float
+    peak_memory: t.Optional[int] = None
+    rounds: int = 1
+    info: dict[str, t.Any] = field(default_factory=dict)
+
+
+def measure(
+    name: str,
+    func: t.Callable[[], t.Any],
+    *,
+    rounds: int = 1,
+    memory: bool = False,
+    setup: t.Optional[t.Callable[[], t.Any]] = None,
+) -> tuple[Measurement, t.Any]:
+    """Runs a function and measures it
+
+    Time is measured without tracing memory. With `memory` the function runs once
+    more under :mod:`tracemalloc` to find the peak allocation.
+
+    Args:
+        name: name of the benchmark
+        func: function to benchmark
+        rounds: number of timed rounds. The fastest is kept. Defaults to 1.
+        memory: also measure the peak memory. Defaults to False.
+        setup: called before each round and not timed. Defaults to None.
+
+    Returns:
+        The measurement and the return value of the last round
+    """
+    best = float("inf")
+    result = None
+    for _ in range(rounds):
+        if setup:
+            setup()
+        gc.collect()
+        start_time = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start_time)
+
+    peak_memory = None
+    if memory:
+        if setup:
+            setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = func()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return Measurement(name, best, peak_memory, rounds), result
+
+
+def format_size(num_of_bytes: t.Optional[int]) -> str:
+    if num_of_bytes is None:
+        return "-"
+    size = float(num_of_bytes)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+@dataclass
+class Comparison:
+    """Change of a benchmark against a baseline
+
+    Attributes:
+        name (str): name of the benchmark
+        baseline (Measurement): measurement of the baseline
+        current (Measurement): measurement of this run
+    """
+
+    name: str
+    baseline: Measurement
+    current: Measurement
+
+    @property
+    def time_ratio(self) -> float:
+        if not self.baseline.seconds:
+            return 1.0
+        return self.current.seconds / self.baseline.seconds
+
+    @property
+    def memory_ratio(self) -> t.Optional[float]:
+        if not (self.baseline.peak_memory and self.current.peak_memory):
+            return None
+        return self.current.peak_memory / self.baseline.peak_memory
+
+    def regressed(self, tolerance: float = TOLERANCE) -> bool:
+        """Checks if the benchmark got slower or used more memory
+
+        Args:
+            tolerance: allowed increase as a fraction. Defaults to
+                :const:`TOLERANCE`.
+
+        Returns:
+            True if time or peak memory grew more than `tolerance`
+        """
+        memory_ratio = self.memory_ratio or 1.0
+        return self.time_ratio > 1 + tolerance or memory_ratio > 1 + tolerance
+
+
+def git_commit() -> t.Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=pathlib.Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def save_results(results: t.Iterable[Measurement], results_file: pathlib.Path) -> None:
+    """Saves measurements as a JSON baseline
+
+    Args:
+        results: measurements to save
+        results_file: location of the JSON file
+    """
+    results_file = pathlib.Path(results_file)
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    results_file.write_text(
+        json.dumps(
+            {
+                "version": RESULTS_VERSION,
+                "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": [dataclasses.asdict(result) for result in results],
+            },
+            indent=1,
+        ),
+        encoding="utf-8",
+    )
+
+
+def load_results(results_file: pathlib.Path) -> list[Measurement]:
+    """Loads measurements saved with :func:`save_results`
+
+    Args:
+        results_file: location of the JSON file
+
+    Returns:
+        The saved measurements
+
+    Raises:
+        ValueError: If the file was saved by an incompatible version
+    """
+    saved = json.loads(pathlib.Path(results_file).read_text(encoding="utf-8"))
+    if saved.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{results_file} is not a version {RESULTS_VERSION} baseline!")
+    return [Measurement(**result) for result in saved["results"]]
+
+
+def compare(
+    baseline: t.Iterable[Measurement],
+    results: t.Iterable[Measurement],
+) -> list[Comparison]:
+    """Pairs measurements with the baseline measurement of the same name
+
+    Args:
+        baseline: measurements of the baseline
+        results: measurements of this run
+
+    Returns:
+        Comparisons of the benchmarks found in both
+    """
+    baseline_by_name = {measurement.name: measurement for measurement in baseline}
+    return [
+        Comparison(result.name, baseline_by_name[result.name], result)
+        for result in results
+        if result.name in baseline_by_name
+    ]
+
+
+def format_comparison(comparison: Comparison) -> str:
+    memory_ratio = comparison.memory_ratio
+    memory = f"{memory_ratio:.2f}x" if memory_ratio is not None else "-"
+    return (
+        f"{comparison.name}: time {comparison.baseline.seconds:.4f}s -> "
+        f"{comparison.current.seconds:.4f}s ({comparison.time_ratio:.2f}x), "
+        f"peak memory {memory}"
+    )
+
+
+def main(argv: t.Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compares benchmark results")
+    parser.add_argument("baseline", type=pathlib.Path)
+    parser.add_argument("results", type=pathlib.Path)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args(argv)
+
+    comparisons = compare(load_results(args.baseline), load_results(args.results))
+    regressions = 0
+    for comparison in comparisons:
+        regressed = comparison.regressed(args.tolerance)
+        regressions += regressed
+        print(("REGRESSED " if regressed else "") + format_comparison(comparison))
+
+    print(f"{len(comparisons)} benchmarks compared, {regressions} regressed")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Synthetic artifacts with a configurable shape for report benchmarks
+
+:func:`make_artifact` registers an artifact whose `process` produces rows from an
+:class:`ArtifactShape` instead of reading files. Rows are generated in chunks so
+even millions of rows are produced quickly and never held in memory at once.
+"""
+from __future__ import annotations
+
+import types
+import typing as t
+
+from dataclasses import dataclass
+
+from xleapp import Artifact, app
+from xleapp.artifact import RowSink
+from xleapp.helpers.epochs import from_unix
+
+
+CHUNK_SIZE = 10_000
+# 2020-01-01 00:00:00 UTC
+FIRST_TIMESTAMP = 1_577_836_800
+# Artifacts take their device type from the second part of their module name
+MODULE = "xleapp_benchmarks.synthetic"
+
+
+@dataclass(frozen=True)
+class ArtifactShape:
+    """Shape of a synthetic artifact
+
+    Attributes:
+        rows (int): rows in each table
+        columns (int): columns in each table, including timestamp and location
+        tables (int): number of tables. More than one uses a list of
+            `report_headers`.
+        timeline (bool): add the rows to the timeline
+        kml (bool): add "Latitude" and "Longitude" columns so a KML is saved
+    """
+
+    rows: int = 1_000
+    columns: int = 6
+    tables: int = 1
+    timeline: bool = False
+    kml: bool = False
+
+    def __str__(self) -> str:
+        flags = "".join(
+            f"-{flag}" for flag in ("timeline", "kml") if getattr(self, flag)
+        )
+        return f"{self.rows}rows-{self.columns}cols-{self.tables}tables{flags}"
+
+    @property
+    def headers(self) -> tuple[str, ...]:
+        headers = ["Timestamp"]
+        if self.kml:
+            headers.extend(["Latitude", "Longitude"])
+        headers.extend(
+            f"Column {column}" for column in range(len(headers), self.columns)
+        )
+        return tuple(headers)
+
+
+def _value(column: int, row: int) -> t.Any:
+    kind = column % 4
+    if kind == 0:
+        return row
+    if kind == 1:
+        # Few distinct values like bundle IDs or account types
+        return f"com.example.app{row % 97}"
+    if kind == 2:
+        return row * 0.25
+    return f"Row {row} text"
+
+
+def rows(shape: ArtifactShape, table: int = 0) -> t.Iterator[tuple[t.Any, ...]]:
+    """Yields the rows of a table of a synthetic artifact
+
+    Args:
+        shape: shape of the artifact
+        table: index of the table. Defaults to 0.
+
+    Yields:
+        Rows with one value per header
+    """
+    num_of_columns = len(shape.headers)
+    first_value = 2 if shape.kml else 0
+    for start in range(0, shape.rows, CHUNK_SIZE):
+        end = min(start + CHUNK_SIZE, shape.rows)
+        timestamps = from_unix(range(FIRST_TIMESTAMP + start, FIRST_TIMESTAMP + end))
+        for row, timestamp in zip(range(start, end), timestamps):
+            values = [timestamp]
+            if shape.kml:
+                values.append((row * 7_919) % 180_000 / 1_000 - 90)
+                values.append((row * 104_729) % 360_000 / 1_000 - 180)
+            values.extend(
+                _value(column + table, row)
+                for column in range(first_value, num_of_columns - 1)
+            )
+            yield tuple(values)
+
+
+def make_artifact(shape: ArtifactShape) -> Artifact:
+    """Registers a synthetic artifact and returns it
+
+    Args:
+        shape: shape of the artifact
+
+    Returns:
+        Artifact: the registered artifact
+    """
+
+    def __post_init__(self) -> None:
+        self.report_headers = (
+            [shape.headers] * shape.tables if shape.tables > 1 else shape.headers
+        )
+        self.timeline = shape.timeline
+
+    def process(self) -> None:
+        if shape.tables > 1:
+            self.data = []
+            for table in range(shape.tables):
+                sink = RowSink()
+                sink.extend(rows(shape, table))
+                self.data.append(sink)
+        else:
+            self.data = RowSink()
+            self.data.extend(rows(shape))
+        self.processed = True
+
+    def exec_body(namespace: dict[str, t.Any]) -> None:
+        namespace.update(
+            {
+                "__module__": MODULE,
+                "__post_init__": __post_init__,
+                "process": process,
+            },
+        )
+
+    label = f"Synthetic {shape}"
+    cls_name = "Synthetic" + str(shape).replace("-", "_")
+    types.new_class(
+        cls_name,
+        (Artifact,),
+        {"category": "Benchmarks", "label": label},
+        exec_body,
+    )
+    return app.__ARTIFACT_PLUGINS__[label]
@@ -0,0 +1,445 @@
+"""Deterministic synthetic extractions for benchmarks
+
+Builds a directory tree that looks like an iOS full file system extraction
+without needing a real device image. A handful of real SQLite databases and
+property lists are placed at the paths artifacts search for and the rest of the
+tree is filled with small files spread across app containers. The same seed
+always produces the same tree. The tree can also be packed as zip, tar and
+tar.gz archives.
+
+Example:
+    Generate a 100k file extraction with every archive format::
+
+    $ python tests/benchmarks/synthetic.py /tmp/extraction --files 100000
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import io
+import pathlib
+import plistlib
+import random
+import sqlite3
+import tarfile
+import typing as t
+import uuid
+import zipfile
+
+from dataclasses import dataclass, field
+
+
+ARCHIVE_FORMATS = ("zip", "tar", "tar.gz")
+# Fixed timestamp for archive members so archives are byte for byte reproducible
+ARCHIVE_DATE_TIME = (2020, 1, 1, 0, 0, 0)
+ARCHIVE_MTIME = 1_577_836_800
+FILLER_ROOT = "private/var/mobile/Containers/Data/Application"
+FILLER_SUFFIXES = (".jpg", ".json", ".dat", ".plist", ".png", ".txt")
+
+
+def _accounts(db: sqlite3.Connection, rng: random.Random, rows: int) -> None:
+    db.executescript(
+        """
+        CREATE TABLE ZACCOUNTTYPE (Z_PK INTEGER PRIMARY KEY, ZACCOUNTTYPEDESCRIPTION);
+        CREATE TABLE ZACCOUNT (
+            Z_PK INTEGER PRIMARY KEY, ZACCOUNTTYPE, ZDATE, ZUSERNAME,
+            ZACCOUNTDESCRIPTION, ZIDENTIFIER, ZOWNINGBUNDLEID
+        );
+        """,
+    )
+    db.executemany(
+        "INSERT INTO ZACCOUNTTYPE VALUES (?, ?)",
+        [(1, "iCloud"), (2, "Game Center"), (3, "IMAP")],
+    )
+    db.executemany(
+        "INSERT INTO ZACCOUNT VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                idx,
+                rng.randint(1, 3),
+                rng.randint(500_000_000, 700_000_000),
+                f"user{idx}@example.com",
+                f"Account {idx}",
+                str(uuid.UUID(int=rng.getrandbits(128))),
+                "com.apple.accounts",
+            )
+            for idx in range(1, rows + 1)
+        ],
+    )
+
+
+def _messages(db: sqlite3.Connection, rng: random.Random, rows: int) -> None:
+    db.execute(
+        "CREATE TABLE message (ROWID INTEGER PRIMARY KEY, date, text, is_from_me, "
+        "handle_id)",
+    )
+    db.executemany(
+        "INSERT INTO message VALUES (?, ?, ?, ?, ?)",
+        [
+            (
+                idx,
+                rng.randint(500_000_000, 700_000_000) * 1_000_000_000,
+                f"Message {idx}",
+                rng.randint(0, 1),
+                rng.randint(1, 50),
+            )
+            for idx in range(1, rows + 1)
+        ],
+    )
+
+
+def _calls(db: sqlite3.Connection, rng: random.Random, rows: int) -> None:
+    db.execute(
+        "CREATE TABLE ZCALLRECORD (Z_PK INTEGER PRIMARY KEY, ZDATE, ZDURATION, "
+        "ZADDRESS, ZORIGINATED)",
+    )
+    db.executemany(
+        "INSERT INTO ZCALLRECORD VALUES (?, ?, ?, ?, ?)",
+        [
+            (
+                idx,
+                rng.randint(500_000_000, 700_000_000),
+                rng.random() * 600,
+                f"+1555{rng.randint(0, 9_999_999):07d}",
+                rng.randint(0, 1),
+            )
+            for idx in range(1, rows + 1)
+        ],
+    )
+
+
+def _locations(db: sqlite3.Connection, rng: random.Random, rows: int) -> None:
+    db.execute(
+        "CREATE TABLE ZRTLEARNEDLOCATIONOFINTERESTVISITMO (Z_PK INTEGER PRIMARY KEY, "
+        "ZENTRYDATE, ZEXITDATE, ZLOCATIONLATITUDE, ZLOCATIONLONGITUDE)",
+    )
+    db.executemany(
+        "INSERT INTO ZRTLEARNEDLOCATIONOFINTERESTVISITMO VALUES (?, ?, ?, ?, ?)",
+        [
+            (
+                idx,
+                (entry := rng.randint(500_000_000, 700_000_000)),
+                entry + rng.randint(60, 7_200),
+                rng.uniform(-90, 90),
+                rng.uniform(-180, 180),
+            )
+            for idx in range(1, rows + 1)
+        ],
+    )
+
+
+def _preferences(rng: random.Random) -> dict[str, t.Any]:
+    return {
+        "SBLastSystemVersion": "13.4.1",
+        "SBDefaultApplication": "com.apple.mobilesafari",
+        "SBRecentDisplayItems": [
+            f"com.example.app{rng.randint(0, 99)}" for _ in range(10)
+        ],
+    }
+
+
+def _mobile_gestalt(rng: random.Random) -> dict[str, t.Any]:
+    return {
+        "CacheExtra": {
+            "ProductType": "iPhone12,1",
+            "ProductVersion": "13.4.1",
+            "SerialNumber": f"F{rng.getrandbits(40):010X}",
+        },
+        "CacheVersion": "17E262",
+    }
+
+
+def _location_clients(rng: random.Random) -> dict[str, t.Any]:
+    return {
+        f"com.example.app{idx}": {
+            "Authorization": rng.randint(0, 4),
+            "LocationTimeStopped": float(rng.randint(500_000_000, 700_000_000)),
+        }
+        for idx in range(25)
+    }
+
+
+@dataclass(frozen=True)
+class SeedFile:
+    """Real artifact file placed in the extraction
+
+    Attributes:
+        path (str): path relative to the root of the extraction
+        build (Callable): creates the SQLite tables or returns the plist contents
+        kind (str): "sqlite" or "plist"
+    """
+
+    path: str
+    build: t.Callable[..., t.Any]
+    kind: str = "sqlite"
+
+
+SEED_FILES = (
+    SeedFile("private/var/mobile/Library/Accounts/Accounts3.sqlite", _accounts),
+    SeedFile("private/var/mobile/Library/SMS/sms.db", _messages),
+    SeedFile(
+        "private/var/mobile/Library/CallHistoryDB/CallHistory.storedata",
+        _calls,
+    ),
+    SeedFile(
+        "private/var/mobile/Library/Caches/com.apple.routined/Cache.sqlite",
+        _locations,
+    ),
+    SeedFile(
+        "private/var/mobile/Library/Preferences/com.apple.springboard.plist",
+        _preferences,
+        "plist",
+    ),
+    SeedFile(
+        "private/var/containers/Shared/SystemGroup/"
+        "systemgroup.com.apple.mobilegestaltcache/Library/Caches/"
+        "com.apple.MobileGestalt.plist",
+        _mobile_gestalt,
+        "plist",
+    ),
+    SeedFile(
+        "private/var/root/Library/Caches/locationd/clients.plist",
+        _location_clients,
+        "plist",
+    ),
+)
+
+# Searches matching the seed files, as written in artifacts
+SEED_SEARCHES = (
+    "**/Accounts3.sqlite",
+    "**/sms.db",
+    "**/CallHistory.storedata",
+    "**/com.apple.routined/Cache.sqlite",
+    "**/com.apple.springboard.plist",
+    "**/com.apple.MobileGestalt.plist",
+    "**/locationd/clients.plist",
+)
+
+
+@dataclass(frozen=True)
+class ExtractionSpec:
+    """Shape of a synthetic extraction
+
+    Attributes:
+        num_of_files (int): total number of files including the seed files
+        depth (int): number of folders below each app container
+        fanout (int): number of app containers and of sub folders per level
+        files_per_folder (int): filler files written to each folder
+        file_size (int): size of each filler file in bytes
+        rows (int): rows in each seed database
+        seed (int): seed of the random generator
+    """
+
+    num_of_files: int = 10_000
+    depth: int = 3
+    fanout: int = 16
+    files_per_folder: int = 100
+    file_size: int = 64
+    rows: int = 100
+    seed: int = 0
+
+
+@dataclass
+class Extraction:
+    """Synthetic extraction on disk
+
+    Attributes:
+        root (Path): root folder of the extracted file system
+        spec (ExtractionSpec): shape of the extraction
+        files (list[str]): every file relative to `root`
+        archives (dict[str, Path]): archives of the extraction by format
+    """
+
+    root: pathlib.Path
+    spec: ExtractionSpec
+    files: list[str] = field(default_factory=list)
+    archives: dict[str, pathlib.Path] = field(default_factory=dict)
+
+    @property
+    def seed_files(self) -> list[pathlib.Path]:
+        return [self.root / seed_file.path for seed_file in SEED_FILES]
+
+
+def filler_paths(spec: ExtractionSpec) -> t.Iterator[str]:
+    """Yields the relative paths of the filler files
+
+    Args:
+        spec: shape of the extraction
+
+    Yields:
+        Paths relative to the root of the extraction
+    """
+    rng = random.Random(spec.seed)
+    containers = [
+        str(uuid.UUID(int=rng.getrandbits(128))).upper() for _ in range(spec.fanout)
+    ]
+    num_of_filler = max(spec.num_of_files - len(SEED_FILES), 0)
+
+    for idx in range(num_of_filler):
+        folder_idx = idx // spec.files_per_folder
+        container = containers[folder_idx % spec.fanout]
+        folder_idx //= spec.fanout
+        folders = []
+        for _ in range(spec.depth):
+            folders.append(f"{folder_idx % spec.fanout:02x}")
+            folder_idx //= spec.fanout
+        suffix = FILLER_SUFFIXES[idx % len(FILLER_SUFFIXES)]
+        yield "/".join(
+            [FILLER_ROOT, container, "Library", *folders, f"file{idx:07d}{suffix}"],
+        )
+
+
+def generate_tree(
+    root: pathlib.Path,
+    spec: ExtractionSpec = ExtractionSpec(),
+) -> Extraction:
+    """Writes a synthetic extraction to a folder
+
+    Args:
+        root: folder to write the extraction to. Created if missing.
+        spec: shape of the extraction. Defaults to :class:`ExtractionSpec`.
+
+    Returns:
+        Extraction: the generated extraction
+    """
+    root = pathlib.Path(root)
+    extraction = Extraction(root=root, spec=spec)
+    rng = random.Random(spec.seed)
+
+    for seed_file in SEED_FILES:
+        path = root / seed_file.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.unlink(missing_ok=True)
+        if seed_file.kind == "sqlite":
+            db = sqlite3.connect(path)
+            with db:
+                seed_file.build(db, rng, spec.rows)
+            db.close()
+        else:
+            path.write_bytes(
+                plistlib.dumps(seed_file.build(rng), fmt=plistlib.FMT_BINARY),
+            )
+        extraction.files.append(seed_file.path)
+
+    created: set[pathlib.Path] = set()
+    for relative_path in filler_paths(spec):
+        path = root / relative_path
+        if path.parent not in created:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            created.add(path.parent)
+        path.write_bytes(rng.randbytes(spec.file_size))
+        extraction.files.append(relative_path)
+
+    return extraction
+
+
+def pack(
+    extraction: Extraction,
+    archive: pathlib.Path,
+    archive_format: str,
+) -> pathlib.Path:
+    """Packs an extraction as an archive
+
+    Args:
+        extraction: extraction to pack
+        archive: location of the archive
+        archive_format: one of :const:`ARCHIVE_FORMATS`
+
+    Returns:
+        Path: location of the archive
+
+    Raises:
+        ValueError: If the archive format is unknown
+    """
+    archive = pathlib.Path(archive)
+    if archive_format == "zip":
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for relative_path in extraction.files:
+                info = zipfile.ZipInfo(relative_path, date_time=ARCHIVE_DATE_TIME)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                zip_file.writestr(info, (extraction.root / relative_path).read_bytes())
+    elif archive_format in ("tar", "tar.gz"):
+        with open(archive, "wb") as fp:
+            # GzipFile with mtime=0 keeps the gzip header reproducible
+            stream: t.IO[bytes] = (
+                gzip.GzipFile(fileobj=fp, mode="wb", mtime=0)
+                if archive_format == "tar.gz"
+                else fp
+            )
+            with tarfile.open(fileobj=stream, mode="w") as tar_file:
+                for relative_path in extraction.files:
+                    contents = (extraction.root / relative_path).read_bytes()
+                    info = tarfile.TarInfo(relative_path)
+                    info.size = len(contents)
+                    info.mtime = ARCHIVE_MTIME
+                    tar_file.addfile(info, io.BytesIO(contents))
+            if stream is not fp:
+                stream.close()
+    else:
+        raise ValueError(
+            f"Unknown archive format {repr(archive_format)}! "
+            f"Choose from {', '.join(ARCHIVE_FORMATS)}.",
+        )
+
+    extraction.archives[archive_format] = archive
+    return archive
+
+
+def generate_extraction(
+    folder: pathlib.Path,
+    spec: ExtractionSpec = ExtractionSpec(),
+    archive_formats: t.Iterable[str] = ARCHIVE_FORMATS,
+) -> Extraction:
+    """Writes a synthetic extraction and packs it in each archive format
+
+    The tree is written to `folder/fs` and the archives to `folder/extraction.<fmt>`.
+
+    Args:
+        folder: folder for the extraction and archives
+        spec: shape of the extraction. Defaults to :class:`ExtractionSpec`.
+        archive_formats: archive formats to pack. Defaults to every format.
+
+    Returns:
+        Extraction: the generated extraction
+    """
+    folder = pathlib.Path(folder)
+    extraction = generate_tree(folder / "fs", spec)
+    for archive_format in archive_formats:
+        pack(extraction, folder / f"extraction.{archive_format}", archive_format)
+    return extraction
+
+
+def main(argv: t.Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generates a synthetic extraction")
+    parser.add_argument("folder", type=pathlib.Path)
+    parser.add_argument("--files", type=int, default=ExtractionSpec.num_of_files)
+    parser.add_argument("--depth", type=int, default=ExtractionSpec.depth)
+    parser.add_argument("--fanout", type=int, default=ExtractionSpec.fanout)
+    parser.add_argument("--rows", type=int, default=ExtractionSpec.rows)
+    parser.add_argument("--seed", type=int, default=ExtractionSpec.seed)
+    parser.add_argument(
+        "--archive",
+        action="append",
+        choices=ARCHIVE_FORMATS,
+        help="archive format to pack. Can be repeated. Default: all",
+    )
+    args = parser.parse_args(argv)
+
+    extraction = generate_extraction(
+        args.folder,
+        ExtractionSpec(
+            num_of_files=args.files,
+            depth=args.depth,
+            fanout=args.fanout,
+            rows=args.rows,
+            seed=args.seed,
+        ),
+        args.archive or ARCHIVE_FORMATS,
+    )
+    print(f"Wrote {len(extraction.files)} files to {extraction.root}")
+    for archive in extraction.archives.values():
+        print(f"Packed {archive}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Benchmarks generating reports of synthetic artifacts
+
+Run with `pytest tests/benchmarks --benchmark`. Use `--benchmark-rows` to pick
+the number of rows, for example `--benchmark-rows 1000,100000`. Save a baseline
+with `--benchmark-json PATH` and compare a later run with
+`--benchmark-compare PATH`.
+"""
+import dataclasses
+import itertools
+
+import pytest
+import xleapp.globals
+
+from scaling import ArtifactShape, make_artifact
+from xleapp import templating
+from xleapp.app import Application
+from xleapp.report import db
+
+
+pytestmark = pytest.mark.benchmark
+
+SHAPES = (
+    ArtifactShape(),
+    ArtifactShape(columns=24),
+    ArtifactShape(timeline=True, kml=True),
+    ArtifactShape(columns=4, tables=3),
+)
+
+
+def shape_id(shape):
+    return str(shape).partition("-")[2]
+
+
+@pytest.fixture
+def application(tmp_path, monkeypatch):
+    """Application writing each report to a new folder under `tmp_path`
+
+    Call `application.new_report()` to start a new report folder.
+    """
+    application = Application()
+    application.extraction_type = "fs"
+    application.processing_time = 0.0
+    # Deselects every artifact that is not core
+    application.artifacts.processing_device_type = None
+    monkeypatch.setattr(xleapp.globals, "app", application)
+
+    rounds = itertools.count()
+
+    def new_report():
+        report_folder = tmp_path / f"report-{next(rounds)}"
+        application.report_folder = report_folder
+        application.log_folder = report_folder / "Script Logs"
+        application.temp_folder = report_folder / "temp"
+        application.log_folder.mkdir(parents=True)
+        application.temp_folder.mkdir(parents=True)
+        application.dbservice = db.DBService(report_folder)
+
+    application.new_report = new_report
+    new_report()
+    return application
+
+
+@pytest.mark.parametrize("shape", SHAPES, ids=shape_id)
+def test_report_formats(num_of_rows, shape, application, benchmark):
+    shape = dataclasses.replace(shape, rows=num_of_rows)
+    artifact = make_artifact(shape)
+    info = {"rows": num_of_rows, "columns": shape.columns, "tables": shape.tables}
+
+    def run(step, func, **options):
+        return benchmark(func, name=f"{step} [{shape}]", memory=True, **options, **info)
+
+    run("process", artifact.process)
+    run("case", lambda: application.save_case_data(artifact), setup=artifact.process)
+
+    html_report = templating.ArtifactHtmlReport(
+        report_folder=application.report_folder,
+        log_folder=application.log_folder,
+        extraction_type=application.extraction_type,
+    )
+    run("html", lambda: html_report(artifact).report)
+
+    tables = application.dbservice.tables(artifact.name)
+
+    def save(db_type):
+        for table in tables:
+            application.dbservice.save(
+                db_type=db_type,
+                name=artifact.name,
+                data_list=table,
+                data_headers=table.headers,
+            )
+
+    run("tsv", lambda: save("tsv"))
+    if shape.kml:
+        run("kml", lambda: save("kml"))
+    if shape.timeline:
+        run("timeline", lambda: save("timeline"))
+
+    assert sum(len(table) for table in tables) == num_of_rows * shape.tables
+
+
+@pytest.mark.parametrize("shape", SHAPES, ids=shape_id)
+def test_generate_reports(num_of_rows, shape, application, benchmark):
+    shape = dataclasses.replace(shape, rows=num_of_rows)
+    artifact = make_artifact(shape)
+    artifact.select = True
+
+    def setup():
+        application.new_report()
+        artifact.process()
+
+    try:
+        benchmark(
+            application.generate_reports,
+            setup=setup,
+            memory=True,
+            name=f"generate_reports [{shape}]",
+            rows=num_of_rows,
+            columns=shape.columns,
+            tables=shape.tables,
+        )
+    finally:
+        artifact.select = False
+
+    report_file = f"{artifact.category} - {artifact.name}.html"
+    assert (application.report_folder / report_file).exists()
@@ -0,0 +1,120 @@
+"""Benchmarks searching synthetic extractions
+
+Run with `pytest tests/benchmarks --benchmark`. Use `--benchmark-sizes` to pick
+the number of files, for example `--benchmark-sizes 10000,100000`.
+"""
+import itertools
+
+from types import SimpleNamespace
+
+import pytest
+import xleapp.globals
+
+from synthetic import SEED_SEARCHES
+from xleapp.artifact.regex import Regex
+from xleapp.helpers.search import FileHandles, FileSeekerDir, FileSeekerTar, FileSeekerZip
+
+
+pytestmark = pytest.mark.benchmark
+
+# FileHandles.add opens every file it is given. The batch is capped to stay
+# below the open file limit.
+FILE_HANDLES_BATCH = 200
+
+
+def search_all(seeker):
+    return {search: list(seeker.search(search)) for search in SEED_SEARCHES}
+
+
+def test_seeker_dir(extraction, num_of_files, benchmark):
+    seeker = benchmark(
+        lambda: FileSeekerDir()(extraction.root),
+        name=f"FileSeekerDir build [{num_of_files}]",
+        files=num_of_files,
+    )
+    found = benchmark(
+        lambda: search_all(seeker),
+        name=f"FileSeekerDir search [{num_of_files}]",
+        files=num_of_files,
+        searches=len(SEED_SEARCHES),
+    )
+
+    assert all(found.values())
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar", "tar.gz"])
+def test_seeker_archive(extraction, num_of_files, archive_format, tmp_path, benchmark):
+    seeker_class = FileSeekerZip if archive_format == "zip" else FileSeekerTar
+    archive = extraction.archives[archive_format]
+
+    seeker = benchmark(
+        lambda: seeker_class()(archive, temp_folder=tmp_path),
+        name=f"{seeker_class.__name__} open [{archive_format}, {num_of_files}]",
+        files=num_of_files,
+    )
+    found = benchmark(
+        lambda: search_all(seeker),
+        name=f"{seeker_class.__name__} search [{archive_format}, {num_of_files}]",
+        files=num_of_files,
+        searches=len(SEED_SEARCHES),
+    )
+    seeker.cleanup()
+
+    assert all(found.values())
+
+
+def test_file_handles_add(extraction, num_of_files, benchmark):
+    regex = Regex("**/*.jpg")
+    files = [
+        extraction.root / path
+        for path in itertools.islice(
+            (path for path in extraction.files if path.endswith(".jpg")),
+            FILE_HANDLES_BATCH,
+        )
+    ]
+    seed_files = extraction.seed_files
+    file_handles = FileHandles()
+
+    def add():
+        for seed_file, search in zip(seed_files, SEED_SEARCHES):
+            file_handles.add(Regex(search), [seed_file])
+        file_handles.add(regex, files)
+
+    def close():
+        for handles in file_handles.data.values():
+            for handle in handles:
+                handle().close()
+        file_handles.data = {}
+
+    benchmark(
+        add,
+        name=f"FileHandles.add [{num_of_files}]",
+        files=len(seed_files) + len(files),
+    )
+
+    assert len(file_handles.data[regex]) == len(files)
+    close()
+
+
+def test_artifact_context(
+    extraction,
+    num_of_files,
+    test_artifact,
+    monkeypatch,
+    benchmark,
+):
+    seeker = FileSeekerDir()(extraction.root)
+    monkeypatch.setattr(xleapp.globals, "app", SimpleNamespace(seeker=seeker))
+
+    def context():
+        artifact = test_artifact()
+        with artifact.context() as artifact:
+            return artifact
+
+    artifact = benchmark(
+        context,
+        name=f"Artifact.context [{num_of_files}]",
+        files=num_of_files,
+    )
+
+    assert artifact.found
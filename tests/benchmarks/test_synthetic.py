@@ -0,0 +1,39 @@
+import plistlib
+import sqlite3
+import tarfile
+import zipfile
+
+from synthetic import SEED_FILES, ExtractionSpec, generate_extraction
+
+
+def test_generate_extraction(tmp_path):
+    spec = ExtractionSpec(num_of_files=50, files_per_folder=10, rows=5)
+    extraction = generate_extraction(tmp_path / "first", spec)
+
+    assert len(extraction.files) == 50
+    assert all((extraction.root / path).is_file() for path in extraction.files)
+
+    accounts, *_ = extraction.seed_files
+    with sqlite3.connect(accounts) as db:
+        assert db.execute("SELECT COUNT(*) FROM ZACCOUNT").fetchone() == (5,)
+    plists = [
+        extraction.root / seed_file.path
+        for seed_file in SEED_FILES
+        if seed_file.kind == "plist"
+    ]
+    assert all(plistlib.loads(plist.read_bytes()) for plist in plists)
+
+    with zipfile.ZipFile(extraction.archives["zip"]) as zip_file:
+        assert zip_file.namelist() == extraction.files
+    with tarfile.open(extraction.archives["tar.gz"]) as tar_file:
+        assert tar_file.getnames() == extraction.files
+
+
+def test_generate_extraction_is_deterministic(tmp_path):
+    spec = ExtractionSpec(num_of_files=50, files_per_folder=10, rows=5)
+    first = generate_extraction(tmp_path / "first", spec)
+    second = generate_extraction(tmp_path / "second", spec)
+
+    assert first.files == second.files
+    for archive_format, archive in first.archives.items():
+        assert archive.read_bytes() == second.archives[archive_format].read_bytes()
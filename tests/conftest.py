@@ -24,8 +24,16 @@
         "marker-descr": "downloads archives for testing. Tests will take longer!",
         "skip-reason": "Test only runs with the --{} option.",
     },
+    "benchmark": {
+        "help": "runs benchmarks against synthetic extractions. Slow!",
+        "marker-descr": "benchmarks performance. Tests will take longer!",
+        "skip-reason": "Test only runs with the --{} option.",
+    },
 }
 
+benchmark_sizes = "10000,100000,1000000"
+benchmark_rows = "1000,10000,100000,1000000,10000000"
+
 
 def pytest_addoption(parser):
     for marker, info in optional_markers.items():
@@ -35,6 +43,28 @@ def pytest_addoption(parser):
             default=False,
             help=info["help"],
         )
+    parser.addoption(
+        "--benchmark-sizes",
+        default=benchmark_sizes,
+        help="comma separated numbers of files for benchmarks. "
+        f"Default: {benchmark_sizes}",
+    )
+    parser.addoption(
+        "--benchmark-rows",
+        default=benchmark_rows,
+        help="comma separated numbers of rows for report benchmarks. "
+        f"Default: {benchmark_rows}",
+    )
+    parser.addoption(
+        "--benchmark-json",
+        metavar="PATH",
+        help="save benchmark results as a JSON baseline",
+    )
+    parser.addoption(
+        "--benchmark-compare",
+        metavar="PATH",
+        help="compare benchmark results with a JSON baseline",
+    )
 
 
 def pytest_configure(config):
@@ -154,7 +184,9 @@ def process(self):
                         row_dict = dict_from_row(row)  # noqa
                         self.data.append(tuple(row_dict.values()))
 
-    return dataclass(TestArtifact, eq=True)
+    yield dataclass(TestArtifact, eq=True)
+    # Every test defines the class again, which registers it again
+    del xleapp.app.__ARTIFACT_PLUGINS__["Test Artifact"]
 
 
 @pytest.fixture
@@ -0,0 +1,83 @@
+import sqlite3
+
+import pytest
+
+from xleapp.helpers import epochs
+
+
+@pytest.fixture(params=["numpy", "python"])
+def converter(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(epochs, "np", None)
+    return epochs.convert_column
+
+
+@pytest.mark.parametrize(
+    "epoch, value",
+    [
+        ("cocoa", 721_628_000),
+        ("unix", 1_699_935_200),
+        ("unix_ms", 1_699_935_200_999),
+        ("unix_us", 1_699_935_200_999_999),
+        ("webkit", 13_344_408_800_999_999),
+        ("filetime", 133_444_088_009_999_999),
+    ],
+)
+def test_convert_column(converter, epoch, value):
+    assert converter([value], epoch) == ["2023-11-14 04:13:20"]
+
+
+def test_convert_column_sentinels(converter):
+    values = [
+        None,
+        0,
+        -1,
+        "",
+        "not a date",
+        10**20,
+        float("inf"),
+        float("-inf"),
+        float("nan"),
+        "721628000",
+        721_628_000.5,
+    ]
+
+    assert converter(values, "cocoa", empty=None) == [
+        None,
+        None,
+        None,
+        None,
+        None,
+        None,
+        None,
+        None,
+        None,
+        "2023-11-14 04:13:20",
+        "2023-11-14 04:13:20",
+    ]
+
+
+def test_unknown_epoch():
+    with pytest.raises(ValueError):
+        epochs.convert_column([1], "hfs")
+
+
+def test_sql_to_timestamp():
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE TABLE dates (cocoa, webkit)")
+    db.executemany(
+        "INSERT INTO dates VALUES (?, ?)",
+        [(721_628_000, 13_344_408_800_999_999), (0, None)],
+    )
+
+    query = (
+        f"SELECT {epochs.sql_to_timestamp('cocoa', 'cocoa')}, "
+        f"{epochs.sql_to_timestamp('webkit', 'webkit')} FROM dates"
+    )
+
+    assert db.execute(query).fetchall() == [
+        ("2023-11-14 04:13:20", "2023-11-14 04:13:20"),
+        (None, None),
+    ]
@@ -0,0 +1,27 @@
+import datetime
+
+import pytest
+
+from xleapp.helpers.utils import timestamp_to_epoch
+
+
+@pytest.mark.parametrize(
+    ["timestamp", "epoch"],
+    [
+        ("2020-04-01 12:30:00", 1585744200),
+        ("2020-04-01T12:30:00", 1585744200),
+        ("2020-04-01 12:30:00.250", 1585744200),
+        (datetime.datetime(2020, 4, 1, 12, 30), 1585744200),
+        (1585744200, 1585744200),
+        (1585744200000, 1585744200),
+        (1585744200000000, 1585744200),
+        ("", None),
+        (None, None),
+        ("Not a timestamp", None),
+        (float("inf"), None),
+        (float("-inf"), None),
+        (float("nan"), None),
+    ],
+)
+def test_timestamp_to_epoch(timestamp, epoch):
+    assert timestamp_to_epoch(timestamp) == epoch
@@ -0,0 +1,119 @@
+import pytest
+
+from xleapp.report.db import CaseDBManager, CaseTable, DBService
+
+
+@pytest.fixture
+def case_db(tmp_path):
+    case_db = CaseDBManager(tmp_path)
+    case_db.create()
+    return case_db
+
+
+def test_case_db_round_trip(case_db):
+    rows = [
+        ("2020-04-01 12:30:00", 42, 1.5, None, b"\x00\x01", True),
+        ("2020-04-01 12:45:00", 2**70, -1.5, "text", b"", False, "extra"),
+        ("2020-04-01 13:00:00",),
+    ]
+
+    case_db.save(data_headers=("A", "B", "C", "D", "E", "F"), data_list=rows, name="Test")
+    (table,) = case_db.tables("Test")
+
+    assert isinstance(table, CaseTable)
+    assert table.headers == ("A", "B", "C", "D", "E", "F")
+    assert len(table) == 3
+    assert list(table) == [
+        ("2020-04-01 12:30:00", 42, 1.5, None, b"\x00\x01", "True"),
+        ("2020-04-01 12:45:00", str(2**70), -1.5, "text", b"", "False", "extra"),
+        ("2020-04-01 13:00:00",),
+    ]
+    assert table[-1] == ("2020-04-01 13:00:00",)
+    with pytest.raises(IndexError):
+        table[3]
+
+
+def test_case_db_multiple_tables(case_db):
+    case_db.save(
+        data_headers=[("Timestamp", "Value"), ("Key", "Value")],
+        data_list=[[("2020-04-01", 1)], [("key", "value"), ("key2", "value2")]],
+        name="Test",
+    )
+    # Saving again replaces the previous tables
+    case_db.save(
+        data_headers=[("Timestamp", "Value"), ("Key", "Value")],
+        data_list=[[("2020-04-01", 1)], [("key", "value")]],
+        name="Test",
+    )
+
+    tables = case_db.tables("Test")
+
+    assert [table.headers for table in tables] == [("Timestamp", "Value"), ("Key", "Value")]
+    assert [len(table) for table in tables] == [1, 1]
+    assert case_db.tables("Missing") == []
+
+
+def test_db_service_copy_from(tmp_path):
+    headers = ("Timestamp", "Latitude", "Longitude")
+    shards = []
+    for number in range(2):
+        service = DBService(tmp_path / f"shard-{number}")
+        for name in ("Core", f"Artifact {number}"):
+            rows = [(f"202{number}-01-01 00:00:00", number + 1, number + 0.5)]
+            for db_type in ("case", "kml", "timeline"):
+                service.save(db_type, name=name, data_list=rows, data_headers=headers)
+        shards.append(service)
+
+    merged = DBService(tmp_path / "merged")
+    merged.copy_from(tmp_path / "shard-0", {"Core", "Artifact 0"})
+    merged.copy_from(tmp_path / "shard-1", {"Artifact 1"})
+
+    assert [list(table) for table in merged.tables("Core")] == [
+        [("2020-01-01 00:00:00", 1, 0.5)],
+    ]
+    assert [list(table) for table in merged.tables("Artifact 1")] == [
+        [("2021-01-01 00:00:00", 2, 1.5)],
+    ]
+
+    num_of_events, events = merged.merge_timeline()
+    assert num_of_events == 3
+    assert [event.activity for event in events] == ["CORE", "ARTIFACT 0", "ARTIFACT 1"]
+
+    kml_db = merged._databases["kml"]
+    with kml_db as db:
+        rows = db.connection.execute("SELECT rowid, activity FROM data").fetchall()
+    assert [tuple(row) for row in rows] == [
+        (1, "Core"),
+        (2, "Artifact 0"),
+        (3, "Artifact 1"),
+    ]
+    if kml_db.has_spatial_index:
+        assert [row["activity"] for row in kml_db.within(1.5, 1, 2.5, 2)] == [
+            "Artifact 1",
+        ]
+
+
+def test_db_service_clear_keeps_other_artifacts(tmp_path):
+    headers = ("Timestamp", "Latitude", "Longitude")
+    service = DBService(tmp_path)
+    for number, name in enumerate(("Artifact 0", "Artifact 1")):
+        rows = [(f"202{number}-01-01 00:00:00", number + 1, number + 0.5)]
+        for db_type in ("case", "tsv", "kml", "timeline"):
+            service.save(db_type, name=name, data_list=rows, data_headers=headers)
+
+    service.clear({"Artifact 0"}, ("tsv", "kml", "timeline"))
+
+    assert not (tmp_path / "_TSV Exports" / "Artifact 0.tsv").exists()
+    assert not (tmp_path / "_KML_Exports" / "Artifact 0.kml").exists()
+    assert (tmp_path / "_TSV Exports" / "Artifact 1.tsv").exists()
+    assert len(service.tables("Artifact 0")[0]) == 1
+
+    with service._databases["kml"] as db:
+        rows = db.connection.execute("SELECT activity FROM data").fetchall()
+    assert [row["activity"] for row in rows] == ["Artifact 1"]
+
+    reopened = DBService(tmp_path)
+    reopened.load_timeline()
+    num_of_events, events = reopened.merge_timeline()
+    assert num_of_events == 1
+    assert [event.activity for event in events] == ["ARTIFACT 1"]
@@ -0,0 +1,32 @@
+import xml.dom.minidom
+
+import pytest
+
+from xleapp.report.kml import KmlWriter
+
+
+def test_kml_writer(tmp_path):
+    kml_file = tmp_path / "points.kml"
+
+    with KmlWriter(kml_file) as kml:
+        kml.add_point("2020-04-01 12:30:00", "Home & <Work>", 40.7, -74.0)
+        kml.add_point("2020-04-01 12:45:00", "Park", 40.8, -73.9)
+
+    document = xml.dom.minidom.parse(str(kml_file))
+    placemarks = document.getElementsByTagName("Placemark")
+
+    assert kml.num_of_points == 2
+    assert len(placemarks) == 2
+    assert (
+        placemarks[0].getElementsByTagName("description")[0].firstChild.data
+        == "Home & <Work>"
+    )
+    assert (
+        placemarks[1].getElementsByTagName("coordinates")[0].firstChild.data
+        == "-73.9,40.8,0.0"
+    )
+
+
+def test_kml_writer_not_open(tmp_path):
+    with pytest.raises(ValueError):
+        KmlWriter(tmp_path / "points.kml").add_point("name", "description", 1, 1)
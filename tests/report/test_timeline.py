@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from xleapp.report.timeline import TimelineEvent, TimelineMerger, events_from_rows
+
+
+@pytest.fixture
+def merger(tmp_path):
+    return TimelineMerger(tmp_path / "runs", run_size=10, fan_in=3)
+
+
+def test_events_from_rows():
+    events = list(
+        events_from_rows(
+            "Accounts",
+            ("Timestamp", "Username"),
+            [("2020-04-01 12:30:00", "user"), ("unknown", "other")],
+        )
+    )
+
+    assert events[0] == TimelineEvent(
+        epoch=1585744200,
+        timestamp="2020-04-01 12:30:00",
+        activity="ACCOUNTS",
+        data=["TIMESTAMP: 2020-04-01 12:30:00", "USERNAME: user"],
+    )
+    assert events[1].epoch is None
+
+
+def test_merge_is_time_ordered(merger):
+    epochs = list(range(100)) + [None] * 5
+    random.Random(42).shuffle(epochs)
+
+    merger.add(TimelineEvent(epoch, str(epoch), "TEST", []) for epoch in epochs)
+    assert len(merger) == len(epochs)
+
+    merged = [event.epoch for event in merger.merge()]
+
+    assert merged == list(range(100)) + [None] * 5
+    assert not merger.run_folder.exists()
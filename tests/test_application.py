@@ -1,5 +1,10 @@
 from collections import UserDict
 
+import pytest
+
+from xleapp.app import Application
+from xleapp.helpers.search import search_providers
+
 
 def test_device_creation(test_device):
     assert isinstance(test_device, UserDict)
@@ -19,3 +24,32 @@ def test_device_creation(test_device):
         ["Reported Phone Number", "19048075555"],
         ["IMEI", "356720085253071"],
     ]
+
+
+def test_resume_restores_checkpointed_artifacts(tmp_path, test_artifact):
+    evidence = tmp_path / "evidence"
+    evidence.mkdir()
+
+    first = Application()
+    first.create_output_folder(tmp_path)
+    first(tmp_path, evidence)
+    artifact = test_artifact()
+    artifact.processed = True
+    artifact.data.append(("2020-04-01 12:30:00", "iCloud"))
+    artifact.metrics.rows = 1
+    first.checkpoint_artifact(artifact)
+
+    second = Application()
+    second.resume(first.report_folder, evidence)
+    second(tmp_path, evidence)
+    restored = test_artifact()
+
+    try:
+        assert second.restore_artifact(restored)
+        assert restored.processed
+        assert restored.metrics.rows == 1
+        assert list(restored.data) == [("2020-04-01 12:30:00", "iCloud")]
+        with pytest.raises(ValueError, match="cannot be resumed"):
+            Application().resume(first.report_folder, tmp_path / "other")
+    finally:
+        search_providers.reset()
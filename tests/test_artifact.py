@@ -20,3 +20,10 @@ def artifact_context(self, test_artifact):
 
     def test_contact_manager_creation(self, artifact_context):
         assert isinstance(artifact_context, Artifact)
+
+
+def test_search_regex_without_process(test_artifact):
+    test_af: Artifact = test_artifact()
+
+    assert {str(regex) for regex in test_af.regex} == {"**/Accounts3.sqlite"}
+    assert not test_af.processed
@@ -0,0 +1,116 @@
+import json
+
+import pytest
+import xleapp.globals
+
+from xleapp import Artifact, Search, batch, rebuild
+from xleapp.app import Application
+
+
+class DeviceArtifact(Artifact, category="Batch", label="Batch Device"):
+    def __post_init__(self):
+        self.report_headers = ("Timestamp", "Model")
+
+    @Search("**/device.txt")
+    def process(self):
+        self.device["Model"] = "Test Phone"
+        self.data.append(("2020-04-01 12:30:00", "Test Phone"))
+
+
+def test_load_csv_manifest(tmp_path):
+    manifest = tmp_path / "jobs.csv"
+    manifest.write_text(
+        "device_type,input,output,artifacts\n"
+        "iOS,phone1.zip,reports,\n"
+        "android,/evidence/phone2,reports,Accounts; SMS\n",
+    )
+
+    jobs = batch.load_manifest(manifest)
+
+    assert jobs == [
+        batch.Job("ios", tmp_path / "phone1.zip", tmp_path / "reports"),
+        batch.Job(
+            "android",
+            tmp_path / "/evidence/phone2",
+            tmp_path / "reports",
+            ("Accounts", "SMS"),
+        ),
+    ]
+
+
+def test_load_json_manifest(tmp_path):
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text(
+        json.dumps(
+            [{"device_type": "ios", "input": "phone", "output": "reports"}],
+        ),
+    )
+
+    (job,) = batch.load_manifest(manifest)
+
+    assert job.input_path == tmp_path / "phone"
+    assert job.artifacts == ()
+
+
+def test_load_manifest_missing_field(tmp_path):
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text(json.dumps([{"device_type": "ios", "input": "phone"}]))
+
+    with pytest.raises(ValueError, match="Job 1 .* missing output"):
+        batch.load_manifest(manifest)
+
+
+def test_use_app_restores_previous():
+    previous = xleapp.globals.app
+    application = Application()
+
+    with xleapp.globals.use_app(application):
+        assert xleapp.globals.app is application
+
+    assert xleapp.globals.app is previous
+
+
+def test_report_folders_are_unique(tmp_path):
+    first, second = Application(), Application()
+    first.create_output_folder(tmp_path)
+    second.create_output_folder(tmp_path)
+
+    assert first.report_folder != second.report_folder
+    assert second.log_folder.exists()
+
+
+def test_failed_job_returns_error(tmp_path):
+    job = batch.Job("ios", tmp_path / "missing", tmp_path)
+
+    (result,) = batch.run_batch([job])
+
+    assert result.failed
+    assert "INPUT" in result.error
+    assert result.report_folder is None
+
+
+def test_run_job_generates_report(tmp_path):
+    evidence = tmp_path / "evidence"
+    evidence.mkdir()
+    (evidence / "device.txt").write_text("Test Phone")
+    (tmp_path / "reports").mkdir()
+    job = batch.Job("test_batch", evidence, tmp_path / "reports", ("Batch Device",))
+
+    application = Application()
+    device_type = application.artifacts.processing_device_type
+    try:
+        result = batch.run_job(job)
+        saved = rebuild.open_report(result.report_folder)
+    finally:
+        # Registered when the class was defined
+        del application.artifacts[DeviceArtifact.name]
+        application.artifacts.processing_device_type = device_type
+
+    assert not result.failed, result.error
+    assert result.run_time > 0
+    assert result.report_folder.parent == tmp_path / "reports"
+    assert (result.report_folder / "index.html").exists()
+    assert (result.report_folder / "Batch - Batch Device.html").exists()
+    # Device information stays with the application of the job
+    assert "Model" not in application.device
+    assert saved.device["Model"] == "Test Phone"
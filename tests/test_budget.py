@@ -0,0 +1,87 @@
+import sqlite3
+import time
+
+import pytest
+import xleapp.globals as g
+
+from xleapp.app import Application
+from xleapp.artifact.abstract import Artifact
+from xleapp.artifact.budget import BudgetOptions
+from xleapp.artifact.service import Artifacts
+from xleapp.helpers.search import Handle
+
+
+class StalledArtifact(Artifact, category="Budget", label="Stalled Artifact"):
+    def process(self):
+        self.data.append(("2020-01-01",))
+        while True:
+            self.check_cancelled()
+            time.sleep(0.01)
+
+
+class StalledQueryArtifact(Artifact, category="Budget", label="Stalled Query"):
+    def process(self):
+        db = sqlite3.connect(self.db_path)
+        self.found = {Handle(found_file=db, path=self.db_path)}
+        db.execute(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+            "SELECT count(*) FROM n"
+        ).fetchall()
+
+
+class QuickArtifact(Artifact, category="Budget", label="Quick Artifact"):
+    def process(self):
+        self.data.append(("2020-01-01",))
+        self.processed = True
+
+
+@pytest.fixture
+def application():
+    application = Application()
+    application.budget_options = BudgetOptions(time_limit=0.2, interval=0.02)
+    with g.use_app(application):
+        yield application
+
+
+def test_over_budget_artifact_is_cancelled(application, tmp_path):
+    artifacts = Artifacts()
+    stalled, query, quick = StalledArtifact(), StalledQueryArtifact(), QuickArtifact()
+    query.db_path = tmp_path / "stalled.db"
+    query.db_path.touch()
+    for artifact in (stalled, query, quick):
+        artifacts[artifact.name] = artifact
+        artifact.select = True
+    completed = []
+
+    artifacts.create_queue()
+    artifacts.run_queue(completed=completed.append)
+
+    assert sorted(completed) == sorted([stalled, query, quick])
+    assert not stalled.processed
+    assert stalled.cancel_reason == "ran longer than 0.2s"
+    assert len(stalled.data) == 0
+    assert not query.processed
+    assert query.cancel_reason == "ran longer than 0.2s"
+    assert quick.processed
+    assert quick.cancel_reason is None
+
+
+def test_budget_limits():
+    assert BudgetOptions().limits(QuickArtifact()) == (None, None)
+
+    options = BudgetOptions(
+        time_limit=60,
+        rss_limit=0,
+        long_running_time_limit=600,
+        long_running_rss_limit=1024,
+    )
+    artifact = QuickArtifact()
+
+    assert options.limits(artifact) == (60, None)
+
+    artifact.long_running_process = True
+    assert options.limits(artifact) == (600, 1024)
+
+    artifact.time_limit = 0
+    artifact.rss_limit = 2048
+    assert options.limits(artifact) == (None, 2048)
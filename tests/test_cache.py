@@ -0,0 +1,138 @@
+import os
+
+import pytest
+import xleapp.globals as g
+
+from xleapp.app import Application
+from xleapp.artifact import cache as result_cache
+from xleapp.artifact.cache import ResultCache
+from xleapp.helpers.search import FileSeekerDir, FileSeekerZip
+
+
+@pytest.fixture
+def application(tmp_path):
+    application = Application()
+    application.report_folder = tmp_path / "report"
+    with g.use_app(application):
+        yield application
+
+
+@pytest.fixture
+def evidence(tmp_path):
+    evidence = tmp_path / "evidence"
+    evidence.mkdir()
+    (evidence / "Accounts3.sqlite").write_bytes(b"accounts")
+    return evidence
+
+
+def parse(rows):
+    calls = []
+
+    def process(artifact):
+        calls.append(artifact)
+        artifact.data.extend(rows)
+        artifact.device["Account"] = "iCloud"
+
+    return process, calls
+
+
+@pytest.mark.parametrize("fingerprint", ["stat", "hash"])
+def test_cache_loads_unchanged_results(
+    application,
+    evidence,
+    test_artifact,
+    tmp_path,
+    fingerprint,
+):
+    cache = ResultCache(tmp_path / "cache", fingerprint=fingerprint, roots=[evidence])
+    process, calls = parse([("2020-04-01 12:30:00", "iCloud")])
+
+    first = test_artifact()
+    first.found = {evidence / "Accounts3.sqlite"}
+    cache.process(first, process)
+
+    application.device.clear()
+    second = test_artifact()
+    second.found = {evidence / "Accounts3.sqlite"}
+    cache.process(second, process)
+
+    assert len(calls) == 1
+    assert list(second.data) == [("2020-04-01 12:30:00", "iCloud")]
+    assert application.device["Account"] == "iCloud"
+
+
+def test_cache_key_changes_with_files(application, evidence, test_artifact, tmp_path):
+    cache = ResultCache(tmp_path / "cache", roots=[evidence])
+    artifact = test_artifact()
+    artifact.found = {evidence / "Accounts3.sqlite"}
+    key = cache.key(artifact)
+
+    moved = tmp_path / "moved"
+    evidence.rename(moved)
+    artifact.found = {moved / "Accounts3.sqlite"}
+    assert ResultCache(tmp_path / "cache", roots=[moved]).key(artifact) == key
+
+    stat = (moved / "Accounts3.sqlite").stat()
+    os.utime(moved / "Accounts3.sqlite", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert ResultCache(tmp_path / "cache", roots=[moved]).key(artifact) != key
+
+    artifact.version = "2"
+    artifact.cacheable = False
+    assert cache.key(artifact) is None
+
+
+def test_cache_key_changes_with_xleapp_version(
+    application,
+    evidence,
+    test_artifact,
+    tmp_path,
+    monkeypatch,
+):
+    cache = ResultCache(tmp_path / "cache", roots=[evidence])
+    artifact = test_artifact()
+    artifact.found = {evidence / "Accounts3.sqlite"}
+    key = cache.key(artifact)
+
+    monkeypatch.setattr(result_cache, "__version__", "0.0.0")
+    assert cache.key(artifact) != key
+
+
+@pytest.mark.parametrize(
+    "seeker, fingerprint, expected",
+    [
+        (FileSeekerDir(), "auto", "stat"),
+        (FileSeekerDir(), "hash", "hash"),
+        (FileSeekerZip(), "auto", "hash"),
+        (FileSeekerZip(), "stat", "hash"),
+    ],
+)
+def test_use_result_cache_fingerprint(
+    application,
+    evidence,
+    tmp_path,
+    seeker,
+    fingerprint,
+    expected,
+):
+    application.input_path = evidence
+    application.temp_folder = tmp_path / "temp"
+    application.seeker = seeker
+    application.extraction_type = "fs"
+
+    application.use_result_cache(tmp_path / "cache", fingerprint)
+
+    assert application.result_cache.fingerprint == expected
+
+
+def test_cache_skips_exported_files(application, evidence, test_artifact, tmp_path):
+    cache = ResultCache(tmp_path / "cache", roots=[evidence])
+    artifact = test_artifact()
+    artifact.found = {evidence / "Accounts3.sqlite"}
+
+    def process(artifact):
+        artifact.data_save_folder.mkdir(parents=True)
+        artifact.data.append(("2020-04-01 12:30:00",))
+
+    cache.process(artifact, process)
+
+    assert not cache.load(test_artifact(), cache.key(artifact))
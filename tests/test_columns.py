@@ -0,0 +1,71 @@
+import pytest
+
+from xleapp.artifact import ColumnStore
+
+
+@pytest.fixture
+def rows():
+    return [
+        (f"2020-01-01 00:00:{idx:02d}", f"app{idx % 3}", 1577836800 + idx, idx / 2)
+        for idx in range(50)
+    ]
+
+
+def test_column_store_round_trip(rows):
+    store = ColumnStore(("Timestamp", "Bundle ID", "Epoch", "Value"))
+    store.extend(rows)
+
+    assert len(store) == 50
+    assert store == rows
+    assert store[0] == rows[0]
+    assert store[-1] == rows[-1]
+    assert store[10:12] == rows[10:12]
+    with pytest.raises(IndexError):
+        store[50]
+
+
+def test_column_store_kinds(rows):
+    store = ColumnStore(("Timestamp", "Bundle ID", "Epoch", "Value"))
+    store.extend(rows)
+
+    assert {header: column.kind for header, column in store.columns.items()} == {
+        "Timestamp": "dictionary",
+        "Bundle ID": "dictionary",
+        "Epoch": "int",
+        "Value": "float",
+    }
+
+
+def test_column_store_mixed_values():
+    rows = [(None, 1), (None,), (2, 1.0, True), (3, True), (1, "x", None, b"")]
+    store = ColumnStore(("A", "B"))
+    store.extend(rows)
+
+    assert list(store) == rows
+    assert store.columns["A"].kind == "int"
+    assert [type(value) for _, value, *_ in store[2:4]] == [float, bool]
+
+
+@pytest.mark.parametrize(
+    "rows",
+    [
+        [(None,), (1,), ("a",)],
+        [(None,), (1.5,), ("a",), (None,), (2.5,)],
+        [("a", 1), (), (2,), (None, 3, "b")],
+    ],
+)
+def test_column_store_nulls_then_mixed_values(rows):
+    store = ColumnStore(("A",))
+    store.extend(rows)
+
+    assert list(store) == rows
+    assert store.columns["A"].kind == "dictionary"
+
+
+def test_column_store_without_headers():
+    store = ColumnStore(())
+    store.extend([(), ()])
+
+    assert len(store) == 2
+    assert list(store) == [(), ()]
+    assert store[1] == ()
@@ -0,0 +1,68 @@
+import logging
+import threading
+
+from xleapp.gui import log as gui_log
+
+
+class Window:
+    """Records updates and events like a PySimpleGUI window"""
+
+    def __init__(self):
+        self.text = ""
+        self.updates = 0
+        self.event = threading.Event()
+
+    def __getitem__(self, key):
+        return self
+
+    def update(self, value, append=False):
+        self.text = self.text + value if append else value
+        self.updates += 1
+
+    def write_event_value(self, key, value):
+        assert key == gui_log.LOG_EVENT
+        self.event.set()
+
+
+def test_log_buffer_appends():
+    buffer = gui_log.LogBuffer(max_lines=5)
+    buffer.append("one")
+    buffer.append("two")
+
+    assert buffer.flush() == ("one\ntwo", True)
+    assert buffer.flush() == ("", True)
+
+    buffer.append("three")
+    assert buffer.flush() == ("\nthree", True)
+
+
+def test_log_buffer_caps_lines():
+    buffer = gui_log.LogBuffer(max_lines=3)
+    for number in range(5):
+        buffer.append(str(number))
+
+    assert buffer.flush() == ("2\n3\n4", False)
+
+    buffer.append("5")
+    assert buffer.flush() == ("3\n4\n5", False)
+
+
+def test_handler_batches_updates():
+    window = Window()
+    handler = gui_log.Handler(window, max_lines=100, interval=0.01)
+    logger = logging.getLogger("xleapp.test_gui_log")
+    logger.propagate = False
+    logger.addHandler(handler)
+
+    for number in range(50):
+        logger.warning(f"Record {number}")
+
+    assert window.event.wait(5)
+    handler.update()
+    handler.close()
+    logger.removeHandler(handler)
+
+    lines = window.text.splitlines()
+    assert window.updates == 1
+    assert len(lines) == 50
+    assert lines[-1] == "xleapp.test_gui_log, [WARNING], Record 49"
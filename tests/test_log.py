@@ -0,0 +1,62 @@
+import io
+import logging
+
+import pytest
+
+from xleapp import log
+
+
+@pytest.fixture
+def stream_logger():
+    logger = logging.getLogger("xleapp.test_log")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    stream = io.StringIO()
+    handler = log.StreamHandler(stream)
+    handler.setFormatter(log.IndentFormatter("%(levelname)s %(message)s"))
+    logger.handlers = [handler]
+    yield logger, handler, stream
+    log.shutdown()
+    logger.handlers = []
+
+
+def test_indent_formatter_keeps_record():
+    formatter = log.IndentFormatter("%(message)s")
+    record = logging.LogRecord("xleapp", logging.INFO, "", 1, "-> Done", (), None)
+
+    assert formatter.format(record) == f"{log.INDENT}-> Done"
+    assert record.msg == "-> Done"
+
+
+def test_queue_loggers(stream_logger):
+    logger, handler, stream = stream_logger
+
+    listener = log.queue_loggers([logger.name], batch_size=10)
+    assert isinstance(logger.handlers[0], log.QueueHandler)
+
+    for number in range(25):
+        logger.info(f"Record {number}")
+    logger.info("-> Nested")
+    logger.debug("Not written")
+    log.shutdown()
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "INFO Record 0"
+    assert lines[-1] == f"INFO {log.INDENT}-> Nested"
+    assert len(lines) == 26
+    assert logger.handlers == [handler]
+    assert log.listener is None
+    assert listener.routes == {logger.name: [handler]}
+
+
+def test_batch_flushes_once(stream_logger):
+    logger, handler, stream = stream_logger
+    flushes = []
+    stream.flush = lambda: flushes.append(True)
+
+    with handler.batch():
+        for number in range(10):
+            record = logger.makeRecord(logger.name, logging.INFO, "", 1, number, (), None)
+            handler.handle(record)
+
+    assert len(flushes) == 1
@@ -0,0 +1,51 @@
+import pytest
+
+from xleapp.artifact.manifest import LazyArtifact, Manifest, ManifestEntry, fingerprint
+
+
+@pytest.fixture
+def entry():
+    return ManifestEntry(
+        name="Test Artifact",
+        cls_name="TestArtifact",
+        category="Test",
+        device_type="test",
+        module="xleapp_test.test.missing",
+        regex=(("**/Accounts3.sqlite", False, True),),
+        core=True,
+    )
+
+
+def test_manifest_round_trip(tmp_path, entry):
+    manifest_file = tmp_path / "manifest.json"
+    Manifest(manifest_file, "fingerprint", [entry]).save()
+
+    manifest = Manifest.load(manifest_file, "fingerprint")
+
+    assert list(manifest) == [entry]
+    assert Manifest.load(manifest_file, "changed") is None
+    assert Manifest.load(tmp_path / "missing.json", "fingerprint") is None
+
+
+def test_fingerprint_changes_with_modules(tmp_path):
+    module = tmp_path / "artifact.py"
+    module.write_text("")
+    before = fingerprint([module])
+    module.write_text("# changed")
+
+    assert fingerprint([module]) != before
+
+
+def test_lazy_artifact_metadata(entry):
+    artifact = LazyArtifact(entry)
+    artifact.select = True
+
+    assert artifact == "Test Artifact"
+    assert artifact.core
+    assert artifact.select
+    assert not artifact.processed
+    assert {str(regex) for regex in artifact.regex} == {"**/Accounts3.sqlite"}
+    assert not artifact.loaded
+
+    with pytest.raises(ImportError):
+        artifact.process
@@ -0,0 +1,78 @@
+import csv
+import json
+import time
+
+from types import SimpleNamespace
+
+import pytest
+
+from xleapp.artifact.metrics import (
+    ArtifactMetrics,
+    current_rss,
+    metrics_table,
+    save_metrics,
+)
+
+
+def test_timer_adds_to_phase():
+    metrics = ArtifactMetrics()
+    with metrics.timer("search"):
+        pass
+    searched = metrics.search_time
+    with metrics.timer("search"):
+        pass
+
+    assert 0 < searched < metrics.search_time
+    assert metrics.total_time == metrics.search_time
+
+    with pytest.raises(ValueError):
+        with metrics.timer("unknown"):
+            pass
+
+
+@pytest.mark.skipif(current_rss() is None, reason="RSS cannot be measured")
+def test_track_peak_rss_after_larger_peak():
+    # Raise the peak RSS of the process above what the block allocates
+    memory = b"\x01" * 256 * 1024**2
+    del memory
+    metrics = ArtifactMetrics()
+
+    with metrics.track_peak_rss():
+        memory = b"\x01" * 64 * 1024**2
+        time.sleep(0.2)
+        del memory
+
+    assert metrics.peak_rss_delta > 32 * 1024**2
+
+
+def test_count_files(tmp_path):
+    found_file = tmp_path / "found.db"
+    found_file.write_bytes(b"\x00" * 100)
+    metrics = ArtifactMetrics()
+
+    metrics.count_files([SimpleNamespace(path=found_file), tmp_path])
+
+    assert metrics.files_matched == 2
+    assert metrics.bytes_read == 100
+
+
+def test_save_metrics(tmp_path):
+    artifacts = [
+        SimpleNamespace(
+            category="Test",
+            name=f"Artifact {idx}",
+            cls_name=f"Artifact{idx}",
+            processed=True,
+            metrics=ArtifactMetrics(parse_time=float(idx), rows=idx),
+        )
+        for idx in range(3)
+    ]
+
+    rows = save_metrics(artifacts, tmp_path)
+
+    assert [row["name"] for row in rows] == ["Artifact 2", "Artifact 1", "Artifact 0"]
+    assert rows == metrics_table(artifacts)
+    assert json.loads((tmp_path / "run_metrics.json").read_text())["artifacts"] == rows
+    with (tmp_path / "run_metrics.csv").open(newline="") as fp:
+        saved = list(csv.DictReader(fp))
+    assert [row["rows"] for row in saved] == ["2", "1", "0"]
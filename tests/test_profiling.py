@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+import pytest
+import xleapp.globals
+
+from xleapp.artifact import profiling
+from xleapp.artifact.profiling import ProfileOptions
+
+
+@pytest.fixture
+def artifact():
+    return SimpleNamespace(name="Test Artifact", cls_name="TestArtifact", category="Test")
+
+
+@pytest.fixture
+def profiles_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        xleapp.globals,
+        "app",
+        SimpleNamespace(log_folder=tmp_path, profile_options=ProfileOptions()),
+    )
+    return tmp_path / profiling.PROFILES_FOLDER
+
+
+def run(artifact, options):
+    xleapp.globals.app.profile_options = options
+    with profiling.profile(artifact):
+        sum(range(1_000))
+
+
+def test_profile_selected_artifact(artifact, profiles_folder):
+    run(artifact, ProfileOptions(artifacts=frozenset({"testartifact"}), memory=True))
+
+    assert (profiles_folder / "TestArtifact.prof").stat().st_size > 0
+    assert (profiles_folder / "TestArtifact_allocations.txt").exists()
+
+
+def test_profile_not_selected(artifact, profiles_folder):
+    run(artifact, ProfileOptions(artifacts=frozenset({"Other Artifact"})))
+    run(artifact, ProfileOptions(over=60.0))
+
+    assert not profiles_folder.exists()
+
+
+def test_profile_all_over(artifact, profiles_folder):
+    run(artifact, ProfileOptions(over=0.0))
+
+    assert [path.name for path in profiles_folder.iterdir()] == ["TestArtifact.prof"]
@@ -0,0 +1,61 @@
+import pytest
+import xleapp.globals as g
+
+from xleapp import rebuild
+from xleapp.app import Application
+from xleapp.helpers.search import Handle, search_providers
+
+
+@pytest.fixture
+def report_folder(tmp_path, test_artifact):
+    evidence = tmp_path / "evidence"
+    evidence.mkdir()
+    (evidence / "Accounts3.sqlite").write_bytes(b"accounts")
+
+    application = Application()
+    application.create_output_folder(tmp_path)
+    with g.use_app(application):
+        application(tmp_path, evidence)
+        artifact = test_artifact()
+        application.artifacts[artifact.name] = artifact
+        try:
+            artifact.select = True
+            artifact.processed = True
+            found_file = evidence / "Accounts3.sqlite"
+            artifact.found = {Handle(str(found_file), found_file)}
+            artifact.data.append(("2020-04-01 12:30:00", "iCloud"))
+            application.checkpoint_artifact(artifact)
+            application.processing_time = 1.0
+            application.generate_reports()
+
+            yield application.report_folder
+        finally:
+            artifact.select = False
+            del application.artifacts[artifact.name]
+            search_providers.reset()
+
+
+def test_rebuild_reports_without_evidence(report_folder, tmp_path):
+    (tmp_path / "evidence" / "Accounts3.sqlite").unlink()
+    page = report_folder / "Accounts - Accounts.html"
+    tsv_file = report_folder / "_TSV Exports" / "Accounts.tsv"
+    page.unlink()
+
+    application = rebuild.open_report(report_folder)
+    with g.use_app(application):
+        rebuild.rebuild(application, names=["Accounts"], formats=("html", "tsv"))
+
+    assert application.processing_time == 1.0
+    assert "Accounts3.sqlite" in page.read_text(encoding="utf-8")
+    assert tsv_file.read_text(encoding="utf-8-sig").splitlines()[1:] == [
+        "2020-04-01 12:30:00\tiCloud",
+    ]
+
+
+def test_rebuild_rejects_missing_artifacts(report_folder, tmp_path):
+    application = rebuild.open_report(report_folder)
+    with g.use_app(application), pytest.raises(ValueError, match="not in the report"):
+        rebuild.rebuild(application, names=["Missing"])
+
+    with pytest.raises(FileNotFoundError):
+        rebuild.open_report(tmp_path)
@@ -0,0 +1,107 @@
+import pytest
+
+from xleapp.artifact.manifest import LazyArtifact, ManifestEntry
+from xleapp.artifact.service import Artifacts
+
+
+def lazy_artifact(name, category="Test", device_type="test", core=False):
+    return LazyArtifact(
+        ManifestEntry(
+            name=name,
+            cls_name=name.replace(" ", ""),
+            category=category,
+            device_type=device_type,
+            module=f"xleapp_test.{device_type}.missing",
+            core=core,
+        ),
+    )
+
+
+@pytest.fixture
+def artifacts():
+    service = Artifacts()
+    for artifact in (
+        lazy_artifact("Artifact One"),
+        lazy_artifact("Artifact Two", category="Other"),
+        lazy_artifact("Artifact Three", device_type="other", core=True),
+    ):
+        service[artifact.name] = artifact
+    return service
+
+
+def test_lookup_by_name_and_class_name(artifacts):
+    assert artifacts["Artifact Two"] is artifacts["artifacttwo"]
+    assert "ArtifactOne" in artifacts
+    assert "Artifact Four" not in artifacts
+
+    with pytest.raises(ValueError):
+        artifacts["Artifact Four"]
+
+    with pytest.raises(ValueError):
+        artifacts["Artifact One"] = lazy_artifact("Artifact One")
+
+
+def test_indexes(artifacts):
+    assert [artifact.name for artifact in artifacts.by_category("Test")] == [
+        "Artifact One",
+        "Artifact Three",
+    ]
+    assert [artifact.name for artifact in artifacts.by_device_type("other")] == [
+        "Artifact Three",
+    ]
+
+    del artifacts["Artifact Three"]
+
+    assert len(artifacts) == 2
+    assert artifacts.by_device_type("other") == []
+
+
+def test_selection_is_tracked(artifacts):
+    artifacts["Artifact Two"].select = True
+    artifacts["Artifact One"].select = True
+
+    assert [artifact.name for artifact in artifacts.selected()] == [
+        "Artifact One",
+        "Artifact Two",
+    ]
+    assert artifacts.selected_categories() == ["Other", "Test"]
+
+    artifacts["Artifact One"].select = False
+    artifacts.processing_device_type = "other"
+
+    assert [artifact.name for artifact in artifacts.selected()] == ["Artifact Three"]
+    assert not artifacts["Artifact Two"].select
+
+
+def test_renew_replaces_loaded_artifacts(artifacts, test_artifact):
+    artifact = test_artifact()
+    artifacts[artifact.name] = artifact
+    artifact.select = True
+    artifact.data.append(("2020-01-01",))
+    artifact.processed = True
+    artifacts["Artifact One"].select = True
+    with pytest.raises(ValueError, match="already registered"):
+        artifacts[artifact.name] = test_artifact()
+
+    artifacts.renew()
+
+    renewed = artifacts[artifact.name]
+    assert renewed is not artifact
+    assert not renewed.processed
+    assert len(renewed.data) == 0
+    assert artifacts.selected() == []
+    assert isinstance(artifacts["Artifact One"], LazyArtifact)
+
+
+@pytest.mark.parametrize("restored", [True, False])
+def test_queue_skips_restored_artifacts(artifacts, test_artifact, restored):
+    artifact = test_artifact()
+    artifacts[artifact.name] = artifact
+    artifact.select = True
+    completed = []
+
+    artifacts.create_queue(restore=lambda queued: restored)
+    artifacts.run_queue(completed=completed.append)
+
+    assert completed == ([] if restored else [artifact])
+    assert artifact.processed is not restored
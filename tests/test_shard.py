@@ -0,0 +1,98 @@
+import types
+
+import pytest
+
+from xleapp import batch, shard
+
+
+def make_artifact(name, long_running_process=False):
+    return types.SimpleNamespace(
+        name=name,
+        cls_name=name.replace(" ", ""),
+        long_running_process=long_running_process,
+    )
+
+
+@pytest.fixture
+def queue(tmp_path):
+    job = batch.Job("ios", tmp_path / "evidence", tmp_path)
+    return shard.ShardQueue.create(
+        tmp_path / "shards",
+        job,
+        batch.BatchOptions(tsv_compression="gzip"),
+        [["A", "B"], ["C"]],
+        {"A": 1.0, "B": 2.0, "C": 4.0},
+    )
+
+
+def test_estimate_costs():
+    artifacts = [
+        make_artifact("Art 1"),
+        make_artifact("Art 2", long_running_process=True),
+        make_artifact("Art 3"),
+    ]
+    history = [{"cls_name": "art3", "total_time": 42.5}]
+
+    assert shard.estimate_costs(artifacts, history) == {
+        "Art 1": shard.DEFAULT_COST,
+        "Art 2": shard.LONG_RUNNING_COST,
+        "Art 3": 42.5,
+    }
+
+
+def test_partition_balances_costs():
+    costs = {"A": 8, "B": 7, "C": 6, "D": 5, "E": 4}
+
+    shards = shard.partition(costs, 2)
+
+    assert shards == [["A", "D", "E"], ["B", "C"]]
+    assert shard.partition({"A": 1}, 3) == [["A"]]
+
+
+def test_queue_claims_each_shard_once(queue, tmp_path):
+    job, options = queue.job()
+    assert job == batch.Job("ios", tmp_path / "evidence", tmp_path)
+    assert options.tsv_compression == "gzip"
+
+    first, second = queue.claim("worker-1"), queue.claim("worker-2")
+    assert (first.id, first.artifacts, first.cost) == (2, ["C"], 4.0)
+    assert (second.id, second.worker) == (1, "worker-2")
+    assert queue.claim("worker-1") is None
+    assert not queue.finished()
+
+    queue.complete(first.id, batch.JobResult(job, report_folder=tmp_path / "report"))
+    queue.fail_worker("worker-2", "MemoryError")
+
+    done, failed = sorted(queue.shards(), key=lambda item: item.status)
+    assert (done.status, done.report_folder) == ("done", tmp_path / "report")
+    assert (failed.status, failed.error) == ("failed", "MemoryError")
+    assert queue.finished()
+
+
+def test_queue_expires_shards_without_heartbeat(queue, tmp_path):
+    job, _ = queue.job()
+    first = queue.claim("worker-1")
+    queue.heartbeat(first.id, "worker-1")
+    assert queue.expire(lease_timeout=60) == []
+
+    assert queue.expire(lease_timeout=-1) == [first.id]
+    again = queue.claim("worker-2")
+    assert again.id == first.id
+
+    # The first worker finishing late does not overwrite the second
+    queue.complete(first.id, batch.JobResult(job, error="late"), "worker-1")
+    assert queue.expire(lease_timeout=-1) == [first.id]
+
+    expired = next(item for item in queue.shards() if item.id == first.id)
+    assert expired.status == "failed"
+    assert expired.error == "Worker worker-2 stopped sending heartbeats"
+
+
+def test_queue_wait_times_out(queue):
+    queue.claim("worker-1")
+
+    queue.wait(poll_interval=0.01, timeout=0.05)
+
+    assert queue.finished()
+    assert {item.status for item in queue.shards()} == {"failed"}
+    assert all(item.error.startswith("Timed out") for item in queue.shards())
@@ -0,0 +1,63 @@
+import sqlite3
+
+import pytest
+
+from xleapp.artifact import RowSink
+
+
+@pytest.fixture
+def rows():
+    return [(idx, f"row {idx}", b"\x00" * idx) for idx in range(25)]
+
+
+def test_sink_in_memory(rows):
+    sink = RowSink(threshold=0)
+    sink.extend(rows)
+
+    assert not sink.spilled
+    assert len(sink) == 25
+    assert list(sink) == rows
+
+
+def test_sink_spills_in_order(rows):
+    sink = RowSink(threshold=10)
+    for row in rows[:12]:
+        sink.append(row)
+    sink.extend(rows[12:])
+
+    assert sink.spilled
+    assert len(sink) == 25
+    assert list(sink) == rows
+    # Iterating again streams the same rows
+    assert sink == rows
+
+
+def test_sink_clear(rows):
+    sink = RowSink(threshold=10)
+    sink.extend(rows)
+    sink.clear()
+
+    assert not sink
+    assert list(sink) == []
+
+
+def test_sink_spills_sqlite_rows(rows):
+    db = sqlite3.connect(":memory:")
+    db.row_factory = sqlite3.Row
+    db.execute("CREATE TABLE data (idx, name, blob)")
+    db.executemany("INSERT INTO data VALUES (?, ?, ?)", rows)
+
+    sink = RowSink(threshold=10)
+    sink.extend(db.execute("SELECT * FROM data ORDER BY idx"))
+
+    assert sink.spilled
+    assert list(sink) == rows
+
+
+def test_sink_keeps_unpicklable_rows(rows):
+    unpicklable = [(idx, lambda: idx) for idx in range(25)]
+    sink = RowSink(threshold=10)
+    sink.extend(unpicklable)
+
+    assert not sink.spilled
+    assert list(sink) == unpicklable
@@ -0,0 +1,45 @@
+import subprocess
+import sys
+
+from xleapp.helpers import importtime
+
+
+# Cold import of the CLI in milliseconds. Raise with care, see `--import-profile`.
+STARTUP_BUDGET_MS = 1_000
+DEFERRED_MODULES = ("jinja2", "magic", "PIL", "simplekml")
+
+
+def test_parse_importtime():
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     xleapp._version\n"
+        "import time:      1729 |       2000 |   xleapp\n"
+    )
+
+    assert importtime.parse_importtime(output) == [
+        importtime.ImportTime("xleapp._version", 120, 120, 2),
+        importtime.ImportTime("xleapp", 1729, 2000, 1),
+    ]
+
+
+def test_cli_defers_heavy_imports():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, xleapp.cli; "
+            f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == ""
+
+
+def test_cli_startup_budget():
+    import_times = importtime.profile_imports("xleapp.cli")
+    cli = next(it for it in import_times if it.module == "xleapp.cli")
+
+    assert cli.cumulative_us / 1000 < STARTUP_BUDGET_MS, importtime.slowest(import_times)
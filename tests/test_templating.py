@@ -0,0 +1,68 @@
+import pytest
+import xleapp.globals as g
+
+from xleapp import WebIcon, templating
+from xleapp.app import Application
+from xleapp.report.timeline import TimelineEvent
+
+
+@pytest.fixture
+def application(tmp_path):
+    application = Application()
+    application.create_output_folder(tmp_path)
+    with g.use_app(application):
+        yield application
+
+
+def test_navigation_script(application, test_artifact):
+    artifact = test_artifact()
+    item = templating.NavigationItem("Accounts", "Accounts - Accounts.html", WebIcon.USER)
+    nav = {"Accounts": {item}}
+
+    nav_file = templating.generate_nav_script(
+        report_folder=application.report_folder,
+        log_folder=application.log_folder,
+        navigation=nav,
+    )
+    html_report = templating.ArtifactHtmlReport(
+        report_folder=application.report_folder,
+        log_folder=application.log_folder,
+    )
+    html_report(artifact).report
+
+    assert nav_file == application.report_folder / "_static" / "nav_artifacts.js"
+    assert "Accounts - Accounts.html" in nav_file.read_text(encoding="UTF-8")
+    page = application.report_folder / "Accounts - Accounts.html"
+    text = page.read_text(encoding="UTF-8")
+    assert '<script src="_static/nav_artifacts.js"></script>' in text
+    assert 'href="Accounts - Accounts.html"' not in text
+
+
+def test_timeline_pages(application):
+    events = [TimelineEvent(epoch, str(epoch), "Test Artifact", []) for epoch in range(3)]
+    report_folder = application.report_folder
+
+    item = templating.generate_timeline(
+        report_folder,
+        application.log_folder,
+        events,
+        num_of_events=3,
+        page_size=2,
+    )
+
+    pages_folder = report_folder / "_Timeline" / "pages"
+    assert item.href == str(pages_folder / "Timeline - Page 1.html")
+    assert not list(report_folder.glob("Timeline - Page *.html"))
+    text = (pages_folder / "Timeline - Page 1.html").read_text(encoding="UTF-8")
+    assert '<base href="../../">' in text
+    assert 'href="_Timeline/pages/Timeline - Page 2.html"' in text
+
+    templating.generate_timeline(
+        report_folder,
+        application.log_folder,
+        events[:1],
+        num_of_events=1,
+        page_size=2,
+    )
+
+    assert [page.name for page in pages_folder.iterdir()] == ["Timeline - Page 1.html"]